@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_archive_hkfile.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Append raw csv-format (local or remote) house keeping files to the per-detector house keeping archive [archive_dir]/[DDD]_hk_[YYYY].fits. Rows already in the archive (same Unixtime) are skipped.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_csv', type=str, nargs='+',
+		help='input raw csv-format house keeping files.')
+	parser.add_argument('--archive_dir', '-o', type=str, default='archive',
+		help='archive directory.')
+	parser.add_argument('--config_file', '-c', type=str, default=None, 
+		help='configure file (for the local house keeping files).')
+	parser.add_argument('--partition', type=str, default='year', choices=['year','none'],
+		help='one archive file per JST year (default) or a single file.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	for input_csv in args.input_csv:
+		hkfile = cogamo.fopen(input_csv)
+		archive = cogamo.HousekeepingArchive(args.archive_dir,hkfile.detid_str,
+			partition=args.partition if args.partition != 'none' else None)
+		archive.append(hkfile,config_file=args.config_file)
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.03'
+# v0.01 : 2026-10-18 : original version
+# v0.02 : 2026-10-18 : --profile option
+# v0.03 : 2026-10-18 : --catalog option
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_batch_convert.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Convert all the raw csv-format event (data/) and house keeping (log/) files of a CoGaMo detector directory to fits-format files in parallel. The detector directory has "config.csv", "data", and "log". Files whose fits-format output is newer than the input are skipped.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('detector_dir', type=str,
+		help='input detector directory (e.g., 011) including config.csv, data, and log.')
+	parser.add_argument('--outdir', '-o', type=str, default='out',
+		help='output directory. The fits files are written in [outdir]/[det_id]/{evt,hk}.')
+	parser.add_argument('--nworkers', '-n', type=int, default=None,
+		help='number of worker processes (default: the number of CPUs).')
+	parser.add_argument('--profile', type=str, default='standard', choices=['standard','compact'],
+		help='event file profile: standard or compact (see cgm_convert_rawcsv_evtfile_to_fitsfile.py).')
+	parser.add_argument('--catalog', type=str, default=None,
+		help='SQLite catalog file updated with the fits files of [outdir]/[det_id] (see cgm_catalog.py).')
+	return parser
+
+def get_output_fitsfile(csvfile_path,outdir):
+	basename = os.path.splitext(os.path.basename(csvfile_path))[0]
+	if re.fullmatch(r'\d{3}_\d{8}_\d{2}', basename):
+		return '%s/evt/%s.evt' % (outdir,basename)
+	elif re.fullmatch(r'\d{3}_\d{8}', basename):
+		return '%s/hk/%s_hk.fits' % (outdir,basename)
+	else:
+		return None
+
+def convert_file(csvfile_path,output_fitsfile,config_file,profile='standard'):
+	"""
+	Runs in a worker process. Returns (csvfile_path, status, nrows, elapsed sec, message).
+	"""
+	start = time.time()
+	try:
+		file = cogamo.fopen(csvfile_path)
+		if isinstance(file,cogamo.EventFile):
+			file.write_to_fitsfile(output_fitsfile=output_fitsfile,config_file=config_file,profile=profile)
+		else:
+			file.write_to_fitsfile(output_fitsfile=output_fitsfile,config_file=config_file)
+	except Exception as e:
+		return csvfile_path, 'error', 0, time.time() - start, str(e)
+	if isinstance(file,cogamo.EventFile):
+		nrows = file.nevents
+	else:
+		nrows = file.nlines
+	return csvfile_path, 'done', nrows, time.time() - start, ''
+
+def batch_convert(detector_dir,outdir='out',nworkers=None,profile='standard',catalog_file=None):
+	sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+	det_id = os.path.basename(os.path.normpath(detector_dir))
+	outdir_sub = '%s/%s' % (outdir,det_id)
+	for subdir in ['evt','hk']:
+		os.makedirs('%s/%s' % (outdir_sub,subdir), exist_ok=True)
+
+	config_file = '%s/config.csv' % detector_dir
+	if not os.path.exists(config_file):
+		print("no config file: %s" % config_file)
+		config_file = None
+
+	tasks = []
+	skipped = []
+	csvfile_list = sorted(glob.glob('%s/data/*.csv' % detector_dir)) + sorted(glob.glob('%s/log/*.csv' % detector_dir))
+	for csvfile_path in csvfile_list:
+		output_fitsfile = get_output_fitsfile(csvfile_path,outdir_sub)
+		if output_fitsfile == None:
+			print("skip (unknown file name): %s" % csvfile_path)
+			continue
+		if os.path.exists(output_fitsfile):
+			if os.path.getmtime(output_fitsfile) > os.path.getmtime(csvfile_path):
+				skipped.append(csvfile_path)
+				continue
+			os.remove(output_fitsfile)
+		tasks.append((csvfile_path,output_fitsfile))
+
+	print("%d files to be converted, %d files up-to-date." % (len(tasks),len(skipped)))
+
+	start = time.time()
+	results = []
+	with ProcessPoolExecutor(max_workers=nworkers) as executor:
+		futures = [executor.submit(convert_file,csvfile_path,output_fitsfile,config_file,profile)
+			for csvfile_path, output_fitsfile in tasks]
+		for future in futures:
+			results.append(future.result())
+	elapsed = time.time() - start
+
+	print("================================")
+	print("%-32s %-8s %10s %8s %12s" % ('file','status','rows','sec','rows/s'))
+	nrows_total = 0
+	for csvfile_path, status, nrows, sec, message in results:
+		nrows_total += nrows
+		print("%-32s %-8s %10d %8.2f %12.1f" % (os.path.basename(csvfile_path),
+			status, nrows, sec, nrows/sec if sec > 0 else 0.0))
+		if status != 'done':
+			print("    %s" % message.splitlines()[0])
+	print("--------------------------------")
+	nfailed = len([result for result in results if result[1] != 'done'])
+	print("converted: %d files, failed: %d files, skipped: %d files" % (len(results)-nfailed,nfailed,len(skipped)))
+	print("total: %d rows in %.2f sec (%.1f rows/s)" % (nrows_total, elapsed,
+		nrows_total/elapsed if elapsed > 0 else 0.0))
+	print("================================")
+
+	if catalog_file != None:
+		catalog = cogamo.FileCatalog(catalog_file)
+		catalog.scan(outdir_sub)
+		catalog.close()
+	return results
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	batch_convert(args.detector_dir,outdir=args.outdir,nworkers=args.nworkers,profile=args.profile,
+		catalog_file=args.catalog)
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_bayesian_blocks.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+segment an event fitsfile into Bayesian blocks (Scargle et al. 2013). The block edges and rates are written in a fits file (BLOCKS extension).
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_evtfits', type=str, 
+		help='input fits-format event file.')
+	parser.add_argument('--pha_min', type=int, default=None,
+		help='pha_min')	
+	parser.add_argument('--pha_max', type=int, default=None,
+		help='pha_max')	
+	parser.add_argument('--p0', type=float, default=0.05,
+		help='false-alarm probability of a change point')
+	parser.add_argument('--tbin', type=float, default=None,
+		help='pre-binning time bin (sec). If the blank, unbinned up to --max_cells events.')
+	parser.add_argument('--max_cells', type=int, default=10000,
+		help='maximum number of cells without pre-binning')
+	parser.add_argument('--output_fitsfile', '-o', type=str, default=None, 
+		help='output fits file of the blocks.')	
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	file = cogamo.fopen(args.input_evtfits)
+	file.get_bayesian_blocks(pha_min=args.pha_min,pha_max=args.pha_max,
+		p0=args.p0,tbin=args.tbin,max_cells=args.max_cells,output_fitsfile=args.output_fitsfile)
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_catalog.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Update (--scan) and query the SQLite catalog of the fits-format event and house keeping files (detector ID, JST date and hour, TSTART, TSTOP, numbers of rows, config keywords, checksum, and mtime). A rescan reads only the new or modified files. The query (e.g., --det_id 19 --date_min 20200301 --date_max 20200331 --nevents_min 100000) does not open the fits files.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('catalog_file', type=str,
+		help='SQLite catalog file (created if not exists).')
+	parser.add_argument('--scan', type=str, nargs='+', default=None,
+		help='directories to be scanned (recursively).')
+	parser.add_argument('--kind', type=str, default=None, choices=['events','hk'],
+		help='events or hk.')
+	parser.add_argument('--det_id', type=int, default=None, help='detector ID.')
+	parser.add_argument('--date_min', type=str, default=None, help='first JST date (YYYYMMDD).')
+	parser.add_argument('--date_max', type=str, default=None, help='last JST date (YYYYMMDD).')
+	parser.add_argument('--tstart', type=float, default=None, help='start time (unixtime).')
+	parser.add_argument('--tstop', type=float, default=None, help='stop time (unixtime).')
+	parser.add_argument('--nevents_min', type=int, default=None, help='minimum number of events.')
+	parser.add_argument('--nevents_max', type=int, default=None, help='maximum number of events.')
+	parser.add_argument('--output', '-o', type=str, default=None, 
+		help='output csv file of the query.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	catalog = cogamo.FileCatalog(args.catalog_file)
+	if args.scan != None:
+		for data_dir in args.scan:
+			catalog.scan(data_dir)
+
+	df = catalog.query(det_id=args.det_id,kind=args.kind,
+		date_min=args.date_min,date_max=args.date_max,tstart=args.tstart,tstop=args.tstop,
+		nevents_min=args.nevents_min,nevents_max=args.nevents_max)
+	catalog.close()
+	print(df[['path','det_id','kind','yyyymmdd','hour','tstart','tstop','nevents','nhk']].to_string())
+	if args.output != None:
+		df.to_csv(args.output,index=False)
+
+if __name__=="__main__":
+	main()
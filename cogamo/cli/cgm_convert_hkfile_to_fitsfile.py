@@ -5,8 +5,10 @@ import argparse
 import cogamo.cogamo as cogamo
 
 __author__ = 'Teruaki Enoto'
-__version__ = '0.01'
+__version__ = '0.03'
 # v0.01 : 2020-08-13 : original version
+# v0.02 : 2026-10-18 : --backend option (csv parser)
+# v0.03 : 2026-10-18 : --time_mode option (numeric JST to UTC conversion by default)
 
 def get_parser():
 	"""
@@ -27,14 +29,19 @@ Convert a raw csv-format CoGaMo house keeping data file to a fits-format event f
 		help='output fits-format event file. If the blank, the output file basename is the same as its input.')	
 	parser.add_argument('--config_file', '-c', type=str, default=None, 
 		help='configure file.')		
+	parser.add_argument('--backend', type=str, default='auto', choices=cogamo.csv_backends,
+		help='csv parser: pyarrow, numpy, pandas, or auto (pyarrow if installed, otherwise numpy).')
+	parser.add_argument('--time_mode', type=str, default='numeric', choices=['numeric','string'],
+		help='Unixtime from the JST date and time columns: numeric (default) or string (astropy isot parser, slow reference).')
 	return parser
 
 def main(args=None):
 	parser = get_parser()
 	args = parser.parse_args(args)
 
-	file = cogamo.fopen(args.input_csv)
-	file.write_to_fitsfile(output_fitsfile=args.output_fitsfile,config_file=args.config_file)
+	file = cogamo.HousekeepingRawcsvFile(args.input_csv,backend=args.backend)
+	file.write_to_fitsfile(output_fitsfile=args.output_fitsfile,config_file=args.config_file,
+		time_mode=args.time_mode)
 
 if __name__=="__main__":
 	main()
\ No newline at end of file
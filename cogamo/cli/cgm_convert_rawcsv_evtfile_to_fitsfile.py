@@ -5,8 +5,14 @@ import argparse
 import cogamo.cogamo as cogamo
 
 __author__ = 'Teruaki Enoto'
-__version__ = '0.01'
+__version__ = '0.07'
 # v0.01 : 2020-08-13 : original version
+# v0.02 : 2026-10-18 : --time_mode option (numeric time stamps by default)
+# v0.03 : 2026-10-18 : --chunksize option (streaming conversion)
+# v0.04 : 2026-10-18 : --curve_pyramid and --kev_per_channel options
+# v0.05 : 2026-10-18 : --spectrum_tbin option (SPECTRUM extension)
+# v0.06 : 2026-10-18 : --profile and --compress options
+# v0.07 : 2026-10-18 : --backend option (csv parser)
 
 def get_parser():
 	"""
@@ -27,14 +33,33 @@ Convert a raw csv-format CoGaMo event file to a fits-format event file.
 		help='output fits-format event file. If the blank, the output file basename is the same as its input.')	
 	parser.add_argument('--config_file', '-c', type=str, default=None, 
 		help='configure file.')		
+	parser.add_argument('--time_mode', type=str, default='numeric', choices=['numeric','string'],
+		help='time stamp conversion: numeric (fast, default) or string (astropy isot parsing, reference).')
+	parser.add_argument('--chunksize', type=int, default=None,
+		help='number of lines read at once. If given, the csv file is streamed into the fits file with a bounded memory.')
+	parser.add_argument('--curve_pyramid', action='store_true', 
+		help='write multi-resolution light curves (0.01 s to 1 hr) in [basename]_lc.fits next to the output.')
+	parser.add_argument('--kev_per_channel', type=float, default=None, 
+		help='keV per pha channel to convert the AREABD thresholds into the pha bands of the light curves.')
+	parser.add_argument('--spectrum_tbin', type=float, default=60.0, 
+		help='slice width (sec) of the pha spectra in the SPECTRUM extension, 0 for no extension.')
+	parser.add_argument('--profile', type=str, default='standard', choices=['standard','compact'],
+		help='standard (TIME, unixtime, minute, sec, decisec, pha) or compact (TIME as 32-bit ticks of 100 microsec, pha as uint16).')
+	parser.add_argument('--compress', action='store_true', 
+		help='gzip-compress the whole output file (.evt.gz), since astropy cannot tile-compress binary tables. The .evt.gz file cannot be memory-mapped, and is decompressed into memory when read.')
+	parser.add_argument('--backend', type=str, default='auto', choices=cogamo.csv_backends,
+		help='csv parser: pyarrow, numpy, pandas, or auto (pyarrow if installed, otherwise numpy).')
 	return parser
 
 def main(args=None):
 	parser = get_parser()
 	args = parser.parse_args(args)
 
-	file = cogamo.fopen(args.input_csv)
-	file.write_to_fitsfile(output_fitsfile=args.output_fitsfile,config_file=args.config_file)
+	file = cogamo.EventRawcsvFile(args.input_csv,chunksize=args.chunksize,backend=args.backend)
+	file.write_to_fitsfile(output_fitsfile=args.output_fitsfile,config_file=args.config_file,
+		time_mode=args.time_mode,curve_pyramid=args.curve_pyramid,kev_per_channel=args.kev_per_channel,
+		spectrum_tbin=args.spectrum_tbin if args.spectrum_tbin > 0 else None,
+		profile=args.profile,compress=args.compress)
 
 if __name__=="__main__":
 	main()
\ No newline at end of file
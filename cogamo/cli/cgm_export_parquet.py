@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_export_parquet.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Export raw csv-format event and house keeping files (local or remote) to parquet files partitioned by detector ID and JST date: [root_dir]/{events,hk}/det_id=[DDD]/date=[YYYYMMDD]/. Requires pyarrow.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_csv', type=str, nargs='+',
+		help='input raw csv-format event or house keeping files.')
+	parser.add_argument('--root_dir', '-o', type=str, default='parquet',
+		help='root directory of the parquet dataset.')
+	parser.add_argument('--config_file', '-c', type=str, default=None, 
+		help='configure file.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	for input_csv in args.input_csv:
+		file = cogamo.fopen(input_csv)
+		if isinstance(file,cogamo.HousekeepingRemoteFile):
+			output_files = file.write_to_parquet(args.root_dir)
+		else:
+			output_files = file.write_to_parquet(args.root_dir,config_file=args.config_file)
+		for output_file in output_files:
+			print("%s --> %s" % (input_csv,output_file))
+
+if __name__=="__main__":
+	main()
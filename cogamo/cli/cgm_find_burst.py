@@ -5,17 +5,19 @@ import argparse
 import cogamo.cogamo as cogamo
 
 __author__ = 'Teruaki Enoto'
-__version__ = '0.01'
+__version__ = '0.03'
 # v0.01 : 2020-08-14 : original version
+# v0.02 : 2026-10-18 : running-background trigger with Li-Ma/Poisson significance
+# v0.03 : 2026-10-18 : --timescales option (multi-timescale search)
 
 def get_parser():
 	"""
 	Creates a new argument parser.
 	"""
-	parser = argparse.ArgumentParser('cgm_plot_pha.py',
+	parser = argparse.ArgumentParser('cgm_find_burst.py',
 		formatter_class=argparse.RawDescriptionHelpFormatter,
 		description="""
-plot pha spectrum from an event fitsfile.
+search for bursts in the light curve of an event fitsfile. The burst intervals are written in a fits file (BURSTS extension).
 		"""
 		)
 	version = '%(prog)s ' + __version__
@@ -27,19 +29,35 @@ plot pha spectrum from an event fitsfile.
 		help='pha_min')	
 	parser.add_argument('--pha_max', type=int, default=None,
 		help='pha_max')	
-	parser.add_argument('--tbin', type=float, default=None,
-		help='tbin')
-	parser.add_argument('--threshold', type=float, default=None,
-		help='threshold')						
+	parser.add_argument('--tbin', type=float, default=1.0,
+		help='tbin (sec)')
+	parser.add_argument('--threshold', type=float, default=3.0,
+		help='threshold (sigma)')						
+	parser.add_argument('--bkg_window', type=float, default=60.0,
+		help='width of the running background window on each side (sec)')
+	parser.add_argument('--bkg_gap', type=float, default=10.0,
+		help='width excluded from the background on each side of a bin (sec)')
+	parser.add_argument('--method', type=str, default='lima', choices=['lima','poisson'],
+		help='significance: lima (Li & Ma 1983 Eq. 17) or poisson ((N-B)/sqrt(B))')
+	parser.add_argument('--timescales', type=str, default=None,
+		help='comma-separated timescales (sec) searched at once from the tbin light curve (e.g., 0.1,1,10,60,600)')
+	parser.add_argument('--output_fitsfile', '-o', type=str, default=None, 
+		help='output fits file of the burst intervals.')	
 	return parser
 
 def main(args=None):
 	parser = get_parser()
 	args = parser.parse_args(args)
 
+	if args.timescales != None:
+		timescales = [float(timescale) for timescale in args.timescales.split(',')]
+	else:
+		timescales = None
+
 	file = cogamo.fopen(args.input_evtfits)
 	file.find_burst(pha_min=args.pha_min,pha_max=args.pha_max,
-		tbin=args.tbin,threshold=args.threshold)
+		tbin=args.tbin,threshold=args.threshold,bkg_window=args.bkg_window,bkg_gap=args.bkg_gap,
+		method=args.method,timescales=timescales,output_fitsfile=args.output_fitsfile)
 
 if __name__=="__main__":
 	main()
\ No newline at end of file
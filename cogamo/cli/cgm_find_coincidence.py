@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+import argparse
+
+import numpy as np
+from astropy.io import fits
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_find_coincidence.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Find bursts seen by several detectors of the CoGaMo network within a time window. The inputs are burst files (BURSTS extension written by cgm_find_burst.py) or event files, which are searched for bursts first. The positions of the detectors are taken from house keeping fits files (--hk). The coincidences are written in a fits file (COINCIDENCES extension).
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_files', type=str, nargs='+',
+		help='input burst fits files or fits-format event files.')
+	parser.add_argument('--hk', type=str, nargs='+', default=[],
+		help='house keeping fits files for the positions of the detectors.')
+	parser.add_argument('--window', type=float, default=1.0,
+		help='maximum gap (sec) between coincident bursts.')
+	parser.add_argument('--min_detectors', type=int, default=2,
+		help='minimum number of detectors.')
+	parser.add_argument('--max_distance', type=float, default=None,
+		help='maximum distance (km) between the detectors of a coincidence.')
+	parser.add_argument('--pha_min', type=int, default=None,
+		help='pha_min (event files)')	
+	parser.add_argument('--pha_max', type=int, default=None,
+		help='pha_max (event files)')	
+	parser.add_argument('--tbin', type=float, default=1.0,
+		help='tbin (sec) (event files)')
+	parser.add_argument('--threshold', type=float, default=5.0,
+		help='threshold (sigma) (event files)')
+	parser.add_argument('--output_fitsfile', '-o', type=str, default='coincidences.fits', 
+		help='output fits file of the coincidences.')	
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	candidates = []
+	burst_files = []
+	for input_file in args.input_files:
+		if input_file.endswith('.evt') or input_file.endswith('.evt.gz'):
+			evtfile = cogamo.EventFitsFile(input_file)
+			bursts = evtfile.find_burst(pha_min=args.pha_min,pha_max=args.pha_max,
+				tbin=args.tbin,threshold=args.threshold,plot=False)
+			candidates.append(cogamo.get_candidates(bursts,evtfile.hdu['EVENTS'].header['DET_ID']))
+		else:
+			burst_files.append(input_file)
+	candidates.append(cogamo.read_candidates(burst_files))
+	candidates = np.concatenate(candidates)
+
+	positions = cogamo.get_detector_positions(args.hk)
+	for det_id in sorted(positions.keys()):
+		print("DET_ID=%s: longitude %.4f deg, latitude %.4f deg" % (det_id,positions[det_id][0],positions[det_id][1]))
+
+	coincidences = cogamo.find_coincidences(candidates,window=args.window,
+		min_detectors=args.min_detectors,positions=positions,max_distance=args.max_distance)
+	for coincidence in coincidences:
+		print("%.3f-%.3f peak %.3f (spread %.3f sec) %.1f sigma, %d detectors (%s), max distance %.2f km" % (
+			coincidence['TSTART'],coincidence['TSTOP'],coincidence['PEAK_TIME'],coincidence['SPREAD'],
+			coincidence['SIGNIFICANCE'],coincidence['NDET'],coincidence['DET_IDS'],coincidence['MAX_DIST']))
+
+	dict_keywords = {'WINDOW':args.window,'MINDET':args.min_detectors}
+	if args.max_distance != None:
+		dict_keywords['MAXDIST'] = args.max_distance
+	fits.HDUList([fits.PrimaryHDU(),
+		cogamo.get_coincidence_hdu(coincidences,dict_keywords)]).writeto(args.output_fitsfile,overwrite=True)
+
+if __name__=="__main__":
+	main()
@@ -2,41 +2,74 @@
 
 import argparse
 
+import numpy as np
+
 import cogamo.cogamo as cogamo
 
 __author__ = 'Teruaki Enoto'
-__version__ = '0.01'
+__version__ = '0.02'
+# v0.02 : 2026-10-18 : fit several lines of several files in parallel, optional minos and plot
 # v0.01 : 2020-09-27 : original version
 
 def get_parser():
 	"""
 	Creates a new argument parser.
 	"""
-	parser = argparse.ArgumentParser('cgm_fit_phaline.py.py',
+	parser = argparse.ArgumentParser('cgm_fit_phaline.py',
 		formatter_class=argparse.RawDescriptionHelpFormatter,
 		description="""
-fit a line of a spectrum (pha) file.
+fit a line of a spectrum (pha) file. Several files and lines (--lines 35:65,100:140) are fitted in parallel, and the result table is written to --output.
 		"""
 		)
 	version = '%(prog)s ' + __version__
 	parser.add_argument('--version', '-v', action='version', version=version,
 		help='show version of this command.')
-	parser.add_argument('input_evtfits', type=str, 
-		help='input fits-format event file.')
-	parser.add_argument('--xmin', type=float, help='xmin.')	
-	parser.add_argument('--xmax', type=float, help='xmax.')		
+	parser.add_argument('input_evtfits', type=str, nargs='+',
+		help='input fits-format event file(s).')
+	parser.add_argument('--xmin', type=float, help='xmin.')
+	parser.add_argument('--xmax', type=float, help='xmax.')
+	parser.add_argument('--lines', type=str, default=None,
+		help='comma-separated xmin:xmax of the lines (e.g., 35:65,100:140), instead of --xmin and --xmax.')
+	parser.add_argument('--minos', action='store_true',
+		help='run minos for the asymmetric error of mu.')
+	parser.add_argument('--plot', action='store_true',
+		help='plot the fit of each file and line (single process).')
+	parser.add_argument('--nworkers', '-n', type=int, default=None,
+		help='number of worker processes (default: the number of CPUs).')
+	parser.add_argument('--output', '-o', type=str, default=None,
+		help='output fits file of the result table (LINEFIT extension).')
 	return parser
 
 def main(args=None):
 	parser = get_parser()
 	args = parser.parse_args(args)
 
-	#file = cogamo.fopen(args.input_evtfits)
-	#file.plot_pha_example()
-	srcevt = cogamo.EventFitsFile(args.input_evtfits)
-	srcevt.plot_curve(tbin=30,pha_min=30)
-	srcevt.plot_pha_example()
-	srcevt.fit_line(xmin=args.xmin,xmax=args.xmax)	
+	if args.lines != None:
+		lines = [tuple(float(x) for x in line.split(':')) for line in args.lines.split(',')]
+	else:
+		lines = [(args.xmin,args.xmax)]
+
+	if args.plot:
+		results = []
+		for input_evtfits in args.input_evtfits:
+			srcevt = cogamo.EventFitsFile(input_evtfits)
+			for xmin, xmax in lines:
+				pdfname = '%s_fit_pha_%d_%d.pdf' % (input_evtfits.replace('.evt',''),xmin,xmax)
+				results.append(srcevt.fit_line(pdfname=pdfname,xmin=xmin,xmax=xmax,
+					minos=args.minos,plot=True))
+		results = np.array(results)
+	else:
+		results = cogamo.fit_lines(args.input_evtfits,lines,minos=args.minos,nworkers=args.nworkers)
+
+	print("%-32s %6s %6s %9s %7s %7s %7s %10s %8s %5s" % ('file','xmin','xmax',
+		'mu','mu_err','sigma','sig_err','area','chi2','ndof'))
+	for result in results:
+		print("%-32s %6g %6g %9.3f %7.3f %7.3f %7.3f %10.1f %8.2f %5d" % (
+			result['FILE'].split('/')[-1],result['XMIN'],result['XMAX'],
+			result['MU'],result['MU_ERR'],result['SIGMA'],result['SIGMA_ERR'],
+			result['AREA'],result['CHI2'],result['NDOF']))
+	if args.output != None:
+		cogamo.get_line_fit_hdu(results).writeto(args.output,overwrite=True)
 
 if __name__=="__main__":
-	main()
\ No newline at end of file
+	main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+import argparse
+
+from astropy.io import fits
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_hk_trend.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Update the hourly, daily, and weekly rollups (min, mean, max, and std of Rate1-6, Temperature, Pressure, Humidity, Illumination, and the fraction of valid GPS) of house keeping fits files (daily, remote, or archive files) in [trend_dir]/[DDD]_hk_trend.fits. Only the rows since the last bins of the trend file are read.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_hkfits', type=str, nargs='+',
+		help='input fits-format house keeping files.')
+	parser.add_argument('--trend_dir', '-o', type=str, default='trend',
+		help='directory of the trend files.')
+	parser.add_argument('--rebuild', action='store_true',
+		help='recompute the rollups from all the rows (e.g., after older rows are added).')
+	parser.add_argument('--plot', type=str, default=None, choices=['hourly','daily','weekly'],
+		help='plot the trend of a level.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	dict_file_paths = {}
+	for input_hkfits in args.input_hkfits:
+		det_id = '%03d' % int(fits.getval(input_hkfits,'DET_ID',extname='HK'))
+		dict_file_paths.setdefault(det_id,[]).append(input_hkfits)
+
+	for det_id in sorted(dict_file_paths.keys()):
+		trend = cogamo.HousekeepingTrend(cogamo.HousekeepingTrend.get_file_path(args.trend_dir,det_id))
+		trend.update_from_files(dict_file_paths[det_id],rebuild=args.rebuild)
+		trend.writeto()
+		if args.plot != None:
+			trend.plot(args.plot.upper())
+
+if __name__=="__main__":
+	main()
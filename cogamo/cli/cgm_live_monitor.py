@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+import os
+import time
+import argparse
+
+from astropy.io import fits
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_live_monitor.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Follow the growing raw csv-format event files ([DDD]_[YYYYMMDD]_[HH].csv) of a detector in near real time. The data directory is polled, only the newly appended lines are parsed, and the running light curve and the burst trigger are updated, rolling over to the next hour file. The bursts are printed (and appended to --alert_file) as soon as they start, and written in a fits file (BURSTS extension) at the end (Ctrl-C or --max_polls).
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('data_dir', type=str,
+		help='directory of the raw csv-format event files (e.g., 011/data).')
+	parser.add_argument('det_id', type=str,
+		help='detector ID (e.g., 011).')
+	parser.add_argument('--pha_min', type=int, default=None,
+		help='pha_min')	
+	parser.add_argument('--pha_max', type=int, default=None,
+		help='pha_max')	
+	parser.add_argument('--tbin', type=float, default=1.0,
+		help='tbin (sec)')
+	parser.add_argument('--threshold', type=float, default=5.0,
+		help='threshold (sigma)')						
+	parser.add_argument('--bkg_window', type=float, default=60.0,
+		help='width of the past background window (sec)')
+	parser.add_argument('--bkg_gap', type=float, default=10.0,
+		help='width between a bin and its background window (sec)')
+	parser.add_argument('--method', type=str, default='lima', choices=['lima','poisson'],
+		help='significance: lima (Li & Ma 1983 Eq. 17) or poisson ((N-B)/sqrt(B))')
+	parser.add_argument('--poll_interval', type=float, default=1.0,
+		help='polling interval (sec)')
+	parser.add_argument('--max_polls', type=int, default=None,
+		help='stop after this number of polls (default: run until Ctrl-C)')
+	parser.add_argument('--alert_file', type=str, default=None,
+		help='csv file to which the burst start and end alerts are appended.')
+	parser.add_argument('--output_fitsfile', '-o', type=str, default=None, 
+		help='output fits file of the bursts (default: [det_id]_live_burst.fits).')	
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	def write_alert(kind, burst):
+		if args.alert_file == None:
+			return
+		is_new = not os.path.exists(args.alert_file)
+		with open(args.alert_file,'a') as fout:
+			if is_new:
+				fout.write('alert,det_id,tstart,tstop,peak_time,peak_rate,bkg_rate,significance\n')
+			fout.write('%s,%s,%.4f,%.4f,%.4f,%.3f,%.3f,%.2f\n' % (kind,monitor.det_id,
+				burst['TSTART'],burst['TSTOP'],burst['PEAK_TIME'],burst['PEAK_RATE'],
+				burst['BKG_RATE'],burst['SIGNIFICANCE']))
+
+	monitor = cogamo.LiveMonitor(args.data_dir,args.det_id,tbin=args.tbin,
+		pha_min=args.pha_min,pha_max=args.pha_max,threshold=args.threshold,
+		bkg_window=args.bkg_window,bkg_gap=args.bkg_gap,method=args.method,callback=write_alert)
+
+	npolls = 0
+	try:
+		while args.max_polls == None or npolls < args.max_polls:
+			monitor.poll()
+			npolls += 1
+			time.sleep(args.poll_interval)
+	except KeyboardInterrupt:
+		pass
+
+	output_fitsfile = args.output_fitsfile
+	if output_fitsfile == None:
+		output_fitsfile = '%s_live_burst.fits' % monitor.det_id
+	dict_keywords = {'DET_ID':monitor.det_id,'TBIN':args.tbin,'THRESH':args.threshold,
+		'BKGWIN':args.bkg_window,'BKGGAP':args.bkg_gap,'METHOD':args.method,'PHASEL':str(monitor.selection)}
+	fits.HDUList([fits.PrimaryHDU(),cogamo.get_burst_hdu(monitor.get_bursts(),dict_keywords)]).writeto(output_fitsfile,overwrite=True)
+	print("%d bursts in %d polls: %s" % (len(monitor.bursts),npolls,output_fitsfile))
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_make_curve_pyramid.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Make multi-resolution light curves (0.01 s to 1 hr) of an event fitsfile, which are written in [basename]_lc.fits and then used by plot_curve and find_burst at these bin widths.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_evtfits', type=str, 
+		help='input fits-format event file.')
+	parser.add_argument('--output_fitsfile', '-o', type=str, default=None, 
+		help='output fits file. If the blank, [basename]_lc.fits next to the input.')	
+	parser.add_argument('--kev_per_channel', type=float, default=None, 
+		help='keV per pha channel to convert the AREABD thresholds into the pha bands.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	file = cogamo.fopen(args.input_evtfits)
+	file.write_curve_pyramid(output_fitsfile=args.output_fitsfile,kev_per_channel=args.kev_per_channel)
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+import os
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_merge_evtfiles.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Merge fits-format event files (e.g., the hour files of a day or a week) into a single time-sorted event file with a GTI extension. 
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_evtfits', type=str, nargs='+',
+		help='input fits-format event files.')
+	parser.add_argument('--output_fitsfile', '-o', type=str, default=None,
+		help='output fits-format event file. If the blank, [DDD]_[YYYYMMDD]_[HH]_[YYYYMMDD]_[HH].evt of the first and last input files.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	output_fitsfile = args.output_fitsfile
+	if output_fitsfile == None:
+		basenames = sorted([os.path.splitext(os.path.basename(path))[0] for path in args.input_evtfits])
+		output_fitsfile = '%s_%s.evt' % (basenames[0],basenames[-1][4:])
+	nevents = cogamo.merge_event_files(args.input_evtfits,output_fitsfile)
+	print("%d files, %d events --> %s" % (len(args.input_evtfits),nevents,output_fitsfile))
+
+if __name__=="__main__":
+	main()
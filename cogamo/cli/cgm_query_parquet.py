@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+import time
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_query_parquet.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Query the parquet dataset written by cgm_export_parquet.py by detector, time, and pha ranges (e.g., detector 011, pha >= 300, last 7 days). Only the partitions and row groups matching the query are read. Requires pyarrow.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('root_dir', type=str,
+		help='root directory of the parquet dataset.')
+	parser.add_argument('--kind', type=str, default='events', choices=['events','hk'],
+		help='events or hk.')
+	parser.add_argument('--det_id', type=int, default=None, help='detector ID.')
+	parser.add_argument('--tstart', type=float, default=None, help='start time (unixtime).')
+	parser.add_argument('--tstop', type=float, default=None, help='stop time (unixtime).')
+	parser.add_argument('--last_days', type=float, default=None, 
+		help='query the last days from now, instead of --tstart.')
+	parser.add_argument('--pha_min', type=int, default=None, help='minimum pha (events).')
+	parser.add_argument('--pha_max', type=int, default=None, help='maximum pha (events).')
+	parser.add_argument('--output', '-o', type=str, default=None, 
+		help='output csv file of the selected rows.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	tstart = args.tstart
+	if args.last_days != None:
+		tstart = time.time() - args.last_days * 86400.0
+	df = cogamo.read_parquet(args.root_dir,kind=args.kind,det_id=args.det_id,
+		tstart=tstart,tstop=args.tstop,pha_min=args.pha_min,pha_max=args.pha_max)
+	print(df)
+	if args.output != None:
+		df.to_csv(args.output,index=False)
+
+if __name__=="__main__":
+	main()
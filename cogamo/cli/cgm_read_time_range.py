@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+import os
+import time
+import argparse
+
+from astropy.io import fits
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_read_time_range.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Read the events (or house keeping rows) of a time range (e.g., +-5 min around a lightning) from the fits-format files of all the detectors under a directory. The files are picked from the time index [data_dir]/cogamo_time_index.fits (created at the first run), and only the matching rows are read by binary searches on the sorted time column.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('data_dir', type=str,
+		help='directory of the fits-format event and house keeping files (searched recursively).')
+	parser.add_argument('--kind', type=str, default='events', choices=['events','hk'],
+		help='events or hk.')
+	parser.add_argument('--det_id', type=int, nargs='+', default=None, help='detector IDs (default: all).')
+	parser.add_argument('--tstart', type=float, default=None, help='start time (unixtime, default: no lower bound).')
+	parser.add_argument('--tstop', type=float, default=None, help='stop time (unixtime, default: no upper bound).')
+	parser.add_argument('--time', type=float, default=None, 
+		help='center time (unixtime), instead of --tstart and --tstop.')
+	parser.add_argument('--window', type=float, default=300.0, 
+		help='half width (sec) of the time range around --time.')
+	parser.add_argument('--index', type=str, default=None, 
+		help='time index file (default: [data_dir]/cogamo_time_index.fits).')
+	parser.add_argument('--rescan', action='store_true',
+		help='rescan the directory and rewrite the time index.')
+	parser.add_argument('--output', '-o', type=str, default=None, 
+		help='output fits file with an extension per detector (e.g., EVENTS_011).')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	if args.time != None:
+		tstart = args.time - args.window
+		tstop = args.time + args.window
+	else:
+		tstart = args.tstart
+		tstop = args.tstop
+
+	index_file = args.index
+	if index_file == None:
+		index_file = '%s/cogamo_time_index.fits' % args.data_dir
+	if args.rescan or not os.path.exists(index_file):
+		index = cogamo.TimeIndex.scan(args.data_dir)
+		index.writeto(index_file)
+	else:
+		index = cogamo.TimeIndex.read(index_file)
+
+	start = time.time()
+	selected = index.read_time_range(tstart,tstop,kind=args.kind,det_ids=args.det_id)
+	elapsed = time.time() - start
+
+	print("%-8s %10s" % ('det_id','rows'))
+	for det_id in sorted(selected.keys()):
+		print("%-8s %10d" % (det_id,len(selected[det_id])))
+	print("%d detectors, %d rows in %.3f sec" % (len(selected),
+		sum([len(records) for records in selected.values()]),elapsed))
+
+	if args.output != None:
+		hdus = [fits.PrimaryHDU()]
+		for det_id in sorted(selected.keys()):
+			hdu = fits.BinTableHDU(data=selected[det_id],name='%s_%s' % (args.kind.upper(),det_id))
+			hdu.header['DET_ID'] = det_id
+			if tstart != None:
+				hdu.header['TSTART'] = tstart
+			if tstop != None:
+				hdu.header['TSTOP'] = tstop
+			hdus.append(hdu)
+		fits.HDUList(hdus).writeto(args.output,overwrite=True)
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+import argparse
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_stack_spectra.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Stack the pha spectra (SPECTRUM extension) of event files or stacked spectrum files, e.g., hour files to a daily spectrum, within a time window. 
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_fitsfiles', type=str, nargs='+',
+		help='input fits-format event files or spectrum files.')
+	parser.add_argument('--tstart', type=float, default=None,
+		help='start of the time window (unixtime).')
+	parser.add_argument('--tstop', type=float, default=None,
+		help='stop of the time window (unixtime).')
+	parser.add_argument('--output', '-o', type=str, default='stacked_spectrum.fits',
+		help='output fits file of the stacked spectrum.')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	spectrum = cogamo.stack_spectra(args.input_fitsfiles,tstart=args.tstart,tstop=args.tstop)
+	if spectrum == None:
+		print("no spectrum in the time window.")
+		return
+	print("%d files, %.1f sec (%.1f - %.1f), %d counts" % (len(args.input_fitsfiles),
+		spectrum.exposure,spectrum.tstart,spectrum.tstop,spectrum.counts.sum()))
+	spectrum.writeto(args.output,dict_keywords={'NFILES':len(args.input_fitsfiles)},overwrite=True)
+
+if __name__=="__main__":
+	main()
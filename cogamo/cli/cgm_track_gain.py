@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+import argparse
+
+import numpy as np
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('cgm_track_gain.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Track the gain drift of a background line (e.g., 40K or 208Tl) over many event files. The line peak is fitted in time slices, joined to the house keeping temperature, and modeled as a polynomial of the temperature. With --write_pi, the gain-corrected PI column is written into the event files.
+		"""
+		)
+	version = '%(prog)s ' + __version__
+	parser.add_argument('--version', '-v', action='version', version=version,
+		help='show version of this command.')
+	parser.add_argument('input_evtfits', type=str, nargs='+',
+		help='input fits-format event files.')
+	parser.add_argument('--hkfits', type=str, nargs='+', required=True,
+		help='fits-format house keeping files covering the event files.')
+	parser.add_argument('--xmin', type=float, required=True, help='xmin of the line (pha).')
+	parser.add_argument('--xmax', type=float, required=True, help='xmax of the line (pha).')
+	parser.add_argument('--tbin', type=float, default=600.0,
+		help='time slice (sec) of the line fits.')
+	parser.add_argument('--deg', type=int, default=1,
+		help='degree of the gain-temperature polynomial.')
+	parser.add_argument('--t_ref', type=float, default=None,
+		help='reference temperature (degC) of the PI, the median temperature by default.')
+	parser.add_argument('--write_pi', action='store_true',
+		help='write the gain-corrected PI column into the event files.')
+	parser.add_argument('--nworkers', '-n', type=int, default=None,
+		help='number of worker processes (default: the number of CPUs).')
+	parser.add_argument('--output', '-o', type=str, default='gain.fits',
+		help='output fits file of the line peaks and the gain model (GAIN extension).')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	results = cogamo.track_gain(args.input_evtfits,args.xmin,args.xmax,tbin=args.tbin,nworkers=args.nworkers)
+	hk_unixtime, hk_temperature = cogamo.read_hk_column(args.hkfits,colname='Temperature')
+	center = 0.5 * (results['TSTART'] + results['TSTOP'])
+	results['TEMPERATURE'] = cogamo.get_hk_values(center,hk_unixtime,hk_temperature)
+
+	good = results['VALID']
+	model = cogamo.GainModel.fit(results['TEMPERATURE'][good],results['MU'][good],results['MU_ERR'][good],
+		deg=args.deg,t_ref=args.t_ref)
+	print("%d slices (%d valid), t_ref = %.2f degC" % (len(results),np.count_nonzero(good),model.t_ref))
+	for i, coeff in enumerate(model.coeffs):
+		print("c%d = %.5g" % (i,coeff))
+	cogamo.get_gain_hdu(results,model=model).writeto(args.output,overwrite=True)
+
+	if args.write_pi:
+		for file_path, nevents, nmissing in cogamo.correct_gain(args.input_evtfits,model,
+				hk_unixtime,hk_temperature,nworkers=args.nworkers):
+			print("%s: %d events (%d without temperature)" % (file_path,nevents,nmissing))
+
+if __name__=="__main__":
+	main()
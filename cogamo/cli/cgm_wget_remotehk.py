@@ -1,14 +1,18 @@
 #!/usr/bin/env python
 
+import io
 import os 
 import sys
+import time
 import datetime
 import argparse
-import subprocess
+
+import cogamo.cogamo as cogamo
 
 __author__ = 'Teruaki Enoto'
-__version__ = '0.01'
+__version__ = '0.02'
 # v0.01 : 2021-05-30 : original version
+# v0.02 : 2026-10-18 : asynchronous download of several detectors and days (no wget), --fits option
 
 dict_cogamoid_to_servernum = {
 	'37':'22', '38':'23'}
@@ -21,12 +25,12 @@ def get_parser():
 	parser = argparse.ArgumentParser('cgm_wget_remotehk.py',
 		formatter_class=argparse.RawDescriptionHelpFormatter,
 		description="""
-This script downloads a remote csv-format CoGaMo house keeping data from a server. The Cogamo ID must be specified. When the -d (--date) option is specified, all data for that date will be downloaded. When the -s (--start) and -e (--end) options are specified as the start and end time, data within that time period will be downloaded. If no option is specified, the data for the last day will be downloaded.
+This script downloads a remote csv-format CoGaMo house keeping data from a server. The Cogamo IDs must be specified. When the -d (--date) option is specified, all data for that date will be downloaded. When the -s (--start) and -e (--end) options are specified as the start and end time, data within that time period will be downloaded. If no option is specified, the data for the last day will be downloaded. The detectors and days are downloaded concurrently, and failed requests are retried.
 		"""
 		)
 	version = '%(prog)s ' + __version__
-	parser.add_argument('cgm_id', type=str, 
-		help='Cogamo ID (e.g., 37)')	
+	parser.add_argument('cgm_id', type=str, nargs='+',
+		help='Cogamo IDs (e.g., 37 38)')	
 	parser.add_argument('--version', '-v', action='version', version=version,
 		help='show version of this command.')
 	parser.add_argument('--start', '-s', type=str, default=None, 
@@ -35,61 +39,56 @@ This script downloads a remote csv-format CoGaMo house keeping data from a serve
 		help='end time (e.g. 2021-05-26T00:00:00)')	
 	parser.add_argument('--date', '-d', type=str, default=None, 
 		help='download date (e.g. 2021-05-27')
-		
+	parser.add_argument('--fits', action='store_true',
+		help='write the fits-format file (cgmDDD_rhk_*.fits) instead of the csv file.')
+	parser.add_argument('--outdir', '-o', type=str, default='.',
+		help='output directory.')
+	parser.add_argument('--server_url', type=str, default=cogamo.remotehk_server_url,
+		help='url of the server api.')
+	parser.add_argument('--max_connections', '-n', type=int, default=4,
+		help='maximum number of concurrent requests.')
+	parser.add_argument('--retries', type=int, default=3,
+		help='maximum number of retries of a request.')
+	parser.add_argument('--backoff', type=float, default=1.0,
+		help='wait (sec) before the first retry, doubled at each retry.')
 	return parser
 
-def wget_cgm_remotehk(cgm_id,start,end):
+def wget_cgm_remotehk(cgm_ids,start,end,outdir='.',flag_fits=False,
+		server_url=cogamo.remotehk_server_url,max_connections=4,retries=3,backoff=1.0):
 	print("%s" % sys._getframe().f_code.co_name)
 
-	# Set output filename 
 	if os.getenv('COGAMO_SERVER_PASSCODE') is None:
 		print("please set the environmental value COGAMO_SERVER_PASSCODE.")
 		exit()
 	passcode = os.getenv('COGAMO_SERVER_PASSCODE')
-	output_csvfname = 'cgm%03d_rhk_' % int(cgm_id)
-	output_csvfname += '%s_' % start.replace('-','').replace(':','')[2:15]
-	output_csvfname += '%s' % end.replace('-','').replace(':','')[2:15]
-	output_csvfname += '.csv'
-
-	if os.path.exists(output_csvfname):
-		cmd = 'rm -f %s'
-		print(cmd);os.system(cmd)
-
-	# Main routine for wget 
-	cmd = 'wget "http://demo1.tacinc.jp/api/sensor/csv/'
-#	cmd += '?id=%s&' % dict_cogamoid_to_servernum[cgm_id]
-	cmd += '?sname=%s&' % cgm_id
-	cmd += 'start_datetime=%s&' % start.replace('T',' ')
-	cmd += 'end_datetime=%s&' % end.replace('T',' ')
-	cmd += 'k=%s" ' % passcode
-	cmd += '-O "%s"' % output_csvfname
-	print(cmd);#os.system(cmd)
-	proc = subprocess.call(cmd,shell=True)
-
-	if not os.path.exists(output_csvfname):
-		print("wget error...")
-		exit()
-
-	# Check file size.
-	filesize_bytes = os.path.getsize(output_csvfname)
-	if filesize_bytes/1e+3 <= 1.0:
-		filesize_str = '%.1f bytes' % filesize_bytes
-	elif filesize_bytes/1e+6 > 1.0:
-		filesize_str = '%.1f MB' % (filesize_bytes/1e+6)
-	else:
-		filesize_str = '%.1f kB' % (filesize_bytes/1e+3)
 
-	line_count = int(subprocess.check_output(['wc', output_csvfname]).decode().split('   ')[1])
+	downloader = cogamo.RemoteHousekeepingDownloader(server_url=server_url,passcode=passcode,
+		max_connections=max_connections,retries=retries,backoff=backoff)
+	time_start = time.time()
+	contents = downloader.download(cgm_ids,start,end)
+	elapsed = time.time() - time_start
 
-	# output the result
+	os.makedirs(outdir,exist_ok=True)
 	print("================================")
-	print("Cogamo ID: %s" % cgm_id)
-	print("Cogamo server ID: %s" % dict_cogamoid_to_servernum[cgm_id])	
 	print("start: %s" % start)
 	print("end  : %s" % end)	
-	print("output_csvfname: %s" % output_csvfname)
-	print("file size: %s" % filesize_str)
-	print("line count: %d" % line_count)
+	for cgm_id in cgm_ids:
+		output_csvfname = '%s/%s' % (outdir,cogamo.get_remotehk_filename(cgm_id,start,end))
+		content = contents[cgm_id]
+		line_count = content.count(b'\n')
+		if flag_fits:
+			output_fname = output_csvfname.replace('.csv','.fits')
+			if os.path.exists(output_fname):
+				os.remove(output_fname)
+			hkfile = cogamo.HousekeepingRemoteFile(output_csvfname,buffer=io.BytesIO(content))
+			hkfile.write_to_fitsfile(output_fitsfile=output_fname)
+		else:
+			output_fname = output_csvfname
+			with open(output_fname,'wb') as fout:
+				fout.write(content)
+		print("Cogamo ID: %s, output: %s (%.1f kB, %d lines)" % (cgm_id,output_fname,
+			len(content)/1e+3,line_count))
+	print("%d requests in %.2f sec" % (downloader.nrequests,elapsed))
 	print("================================")
 
 def main(args=None):
@@ -99,15 +98,17 @@ def main(args=None):
 	if args.date != None:
 		start = '%sT00:00:00' % args.date 
 		end = '%sT23:59:59' % args.date
-		wget_cgm_remotehk(args.cgm_id,start,end)
 	elif args.start != None and args.end != None:
-		wget_cgm_remotehk(args.cgm_id,args.start,args.end)
+		start = args.start
+		end = args.end
 	else:
 		dt_now = datetime.datetime.now() 
 		end = dt_now.strftime('%Y-%m-%dT%H:%M:%S')
 		dt_start = dt_now - datetime.timedelta(hours=24)		
 		start = dt_start.strftime('%Y-%m-%dT%H:%M:%S')
-		wget_cgm_remotehk(args.cgm_id,start,end)
+	wget_cgm_remotehk(args.cgm_id,start,end,outdir=args.outdir,flag_fits=args.fits,
+		server_url=args.server_url,max_connections=args.max_connections,
+		retries=args.retries,backoff=args.backoff)
 
 if __name__=="__main__":
 	main()
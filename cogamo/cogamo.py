@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import io
 import os
 import re
 import sys
 import numpy as np
+import numpy.lib.recfunctions
 import pandas as pd
 
 import astropy.units as u
@@ -20,7 +22,6 @@ from astropy.visualization import time_support
 import matplotlib
 
 from iminuit import Minuit
-from probfit import BinnedChi2, UnbinnedLH, Extended, gaussian
 
 
 ##########################
@@ -28,28 +29,1760 @@ from probfit import BinnedChi2, UnbinnedLH, Extended, gaussian
 ##########################
 
 def gauss_continuum(x, mu, sigma, area, c0=0.0, c1=0.0):
-    return area * np.exp(-0.5*(x-mu)**2/sigma**2)/(np.sqrt(2*np.pi)*sigma) + c0 + c1 * x 
+    return area * np.exp(-0.5*(x-mu)**2/sigma**2)/(np.sqrt(2*np.pi)*sigma) + c0 + c1 * x
 
-class Hist1D(object):
+def get_fixed_width_fields(strings, pattern, name):
+	"""
+	Returns the integer fields of fixed-width strings (list of int64 arrays). 
+	Each run of 'D' in the pattern is a field of digits, and the other 
+	characters must match the pattern (e.g., 'DDDD-DD-DD'). The characters
+	(bytes or UCS4 code points) are compared column by column, without a
+	per-string loop.
+	"""
+	width = len(pattern)
+	raw = np.atleast_1d(np.asarray(strings))
+	if raw.dtype.kind == 'S':
+		raw = raw.astype('S%d' % (width + 1))
+		codes = raw.view(np.uint8).reshape(len(raw), width + 1)
+	else:
+		raw = raw.astype('U%d' % (width + 1))
+		codes = raw.view(np.uint32).reshape(len(raw), width + 1)
+	invalid = codes[:,width] != 0
+	for position, char in enumerate(pattern):
+		if char == 'D':
+			invalid |= (codes[:,position] - np.uint32(ord('0'))) > 9
+		else:
+			invalid |= codes[:,position] != ord(char)
+	if np.any(invalid):
+		index = np.flatnonzero(invalid)[0]
+		raise ValueError("invalid {} at row {}: {} (expected {})".format(name, index, raw[index], pattern))
+	fields = []
+	for match in re.finditer('D+', pattern):
+		field = np.zeros(len(raw), dtype=np.int64)
+		for position in range(match.start(), match.end()):
+			field = field * 10 + (codes[:,position] - ord('0'))
+		fields.append(field)
+	return fields
+
+def get_unixtime_jst(yyyymmdd, hhmmss):
+	"""
+	Returns the unix time (int64 sec, UTC) of JST dates ('YYYY-MM-DD') and
+	times ('HH:MM:SS') with datetime64 arithmetic and the fixed +9 h offset of
+	JST, instead of parsing isot strings with astropy.
+	:param yyyymmdd: JST date string(s)
+	:param hhmmss: JST time string(s), same shape as yyyymmdd
+	"""
+	year, month, day = get_fixed_width_fields(yyyymmdd, 'DDDD-DD-DD', 'JST date')
+	hour, minute, sec = get_fixed_width_fields(hhmmss, 'DD:DD:DD', 'JST time')
+	month_start = (year - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month - 1)
+	ndays = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype(np.int64)
+	invalid = (month < 1) | (month > 12) | (day < 1) | (day > ndays) | (hour > 23) | (minute > 59) | (sec > 59)
+	if np.any(invalid):
+		index = np.flatnonzero(invalid)[0]
+		raise ValueError("invalid JST date and time at row {}: {:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
+			index, year[index], month[index], day[index], hour[index], minute[index], sec[index]))
+	days = month_start.astype('datetime64[D]').astype(np.int64) + (day - 1)
+	unixtime = days * 86400 + hour * 3600 + minute * 60 + sec - 9 * 3600
+	return unixtime.reshape(np.shape(yyyymmdd))
 
-	def __init__(self, nbins, xlow, xhigh):
+class Hist1D(object):
+	"""Histogram with uniform bins between xlow and xhigh.
+	:param method: binning of unsorted input, 'histogram' (default) uses 
+		np.histogram, and 'bincount' counts integer bin indices with np.bincount
+		(slower than np.histogram with numpy >= 2, kept for comparison). Sorted 
+		input (fill(arr, is_sorted=True)) is binned by a binary search on the 
+		edges with either method.
+	The counts are accumulated in place, so fill() can be called repeatedly, 
+	e.g., for chunks of events.
+	"""
+	def __init__(self, nbins, xlow, xhigh, method='histogram'):
 		self.nbins = nbins
 		self.xlow  = xlow
 		self.xhigh = xhigh
+		self.method = method
 		#print(self.nbins,self.xlow,self.xhigh)
-		self.hist, edges = np.histogram([], bins=nbins, range=(xlow, xhigh))
-		self.bins = (edges[:-1] + edges[1:]) / 2.
+		self.edges = np.linspace(xlow, xhigh, nbins + 1)
+		self.norm = nbins / (xhigh - xlow)
+		self.hist = np.zeros(nbins, dtype=np.int64)
+		self.bins = (self.edges[:-1] + self.edges[1:]) / 2.
 		#print(self.hist,edges,self.bins)
 
-	def fill(self, arr):
+	def fill(self, arr, is_sorted=False):
 		#print(arr)
-		hist, edges = np.histogram(arr, bins=self.nbins, range=(self.xlow, self.xhigh))
-		self.hist += hist
+		if is_sorted and len(arr) >= self.nbins:
+			# O(nbins log N) wins only when there are more events than bins
+			self.fill_sorted(arr)
+		elif self.method == 'bincount':
+			self.fill_bincount(arr)
+		else:
+			hist, edges = np.histogram(arr, bins=self.nbins, range=(self.xlow, self.xhigh))
+			self.hist += hist
+
+	def fill_sorted(self, arr):
+		"""
+		For a sorted array, the counts are differences of the positions of the
+		bin edges in the array (the last bin includes xhigh as np.histogram).
+		"""
+		pos = np.searchsorted(arr, self.edges, side='left')
+		pos[-1] = np.searchsorted(arr, self.xhigh, side='right')
+		self.hist += np.diff(pos)
+
+	def fill_bincount(self, arr):
+		"""
+		Bin indices are computed in one temporary array; the values outside the
+		range go to two overflow bins of np.bincount, which are dropped. The 
+		floored index can be off by one bin only for the values within rounding
+		errors of a bin edge, which are binned again by a binary search on the 
+		edges, so that all the values fall in the same bins as np.histogram 
+		(the last bin includes xhigh).
+		"""
+		arr = np.asarray(arr)
+		position = np.subtract(arr, self.xlow, dtype=np.float64)
+		position *= self.norm
+		index = np.floor(position)
+		np.clip(index, -1, self.nbins, out=index)
+		position -= np.rint(position)
+		near_edge = np.flatnonzero(~(np.abs(position) >= 1e-6)) # including NaN
+		with np.errstate(invalid='ignore'):
+			index = index.astype(np.intp)
+		if len(near_edge) > 0:
+			values = arr[near_edge]
+			index_edge = np.searchsorted(self.edges, values, side='right') - 1
+			index_edge[values == self.xhigh] = self.nbins - 1
+			index_edge[values > self.xhigh] = self.nbins
+			index[near_edge] = index_edge
+		counts = np.bincount(index + 1, minlength=self.nbins + 2)
+		self.hist += counts[1:self.nbins + 1]
 
 	@property
 	def data(self):
 		return self.bins, self.hist
 
+class CurvePyramid(object):
+	"""Multi-resolution light curves (counts per bin) in pha bands.
+	The finest level is binned once from the events, and each coarser level is 
+	the sum of the finer one, so that the bin widths must be integer multiples 
+	of each other. Each level is a (nbands+1, nbins) count image: row 0 is the 
+	all-pha curve and row k is the band k (pha_edges[k-2] <= pha < pha_edges[k-1]).
+	:param tstart: start time of the first bin (sec)
+	:param tstop: stop time of the last bin (sec)
+	:param pha_edges: channel boundaries between the pha bands (e.g., the 
+		AREABD thresholds converted to channels), [] for the all-pha curve only
+	"""
+	tbins = [0.01, 0.1, 1.0, 10.0, 60.0, 600.0, 3600.0]
+	tick = 1e-4 # time resolution of the events (decisec)
+
+	def __init__(self, tstart, tstop, pha_edges=[]):
+		self.tstart = tstart
+		self.tstop = tstop
+		self.pha_edges = np.array(pha_edges, dtype=np.int64)
+		self.nbands = len(self.pha_edges) + 1
+		self.ticks_per_bin = int(round(self.tbins[0] / self.tick))
+		self.nbins = int(np.ceil(round((tstop - tstart) / self.tbins[0], 6)))
+		self.counts = np.zeros((self.nbands, self.nbins), dtype=np.int64)
+		# events filled, written to identify the event file (see is_sidecar_of)
+		self.nevents = 0
+		self.time_first = None
+		self.time_last = None
+
+	@staticmethod
+	def is_tick_multiple(tbin):
+		return round(tbin / CurvePyramid.tick) >= 1 and abs(tbin / CurvePyramid.tick - round(tbin / CurvePyramid.tick)) < 1e-6
+
+	@staticmethod
+	def get_bin_index(time, tstart, tbin):
+		"""
+		Returns the indices of the bins of width tbin from tstart. Time is 
+		converted to integer ticks of 100 microsec, so that the bin edges are
+		exact (tbin must be an integer multiple of the tick).
+		"""
+		ticks = np.rint((np.asarray(time, dtype=np.float64) - tstart) / CurvePyramid.tick).astype(np.int64)
+		return ticks // int(round(tbin / CurvePyramid.tick))
+
+	def fill(self, time, pha):
+		"""
+		Adds events, which can be called for chunks of events (in time order).
+		"""
+		if len(time) > 0:
+			self.nevents += len(time)
+			if self.time_first == None:
+				self.time_first = float(time[0])
+			self.time_last = float(time[len(time) - 1])
+		index = self.get_bin_index(time, self.tstart, self.tbins[0])
+		band = np.searchsorted(self.pha_edges, pha, side='right')
+		inside = (index >= 0) & (index < self.nbins)
+		flat_index = band[inside] * self.nbins + index[inside]
+		self.counts += np.bincount(flat_index, minlength=self.nbands * self.nbins).reshape(self.nbands, self.nbins)
+
+	def get_levels(self):
+		"""
+		Returns a list of (tbin, counts) from the finest to the coarsest level. 
+		"""
+		counts = np.vstack([self.counts.sum(axis=0), self.counts])
+		levels = [(self.tbins[0], counts)]
+		for tbin in self.tbins[1:]:
+			factor = int(round(tbin / levels[-1][0]))
+			nbins = counts.shape[1]
+			npad = (-nbins) % factor
+			if npad > 0:
+				counts = np.hstack([counts, np.zeros((counts.shape[0], npad), dtype=counts.dtype)])
+			counts = counts.reshape(counts.shape[0], -1, factor).sum(axis=2)
+			levels.append((tbin, counts))
+		return levels
+
+	def writeto(self, output_fitsfile, dict_keywords={}):
+		hdus = [fits.PrimaryHDU()]
+		for tbin, counts in self.get_levels():
+			hdu = fits.CompImageHDU(data=counts.astype(np.int32), compression_type='RICE_1',
+				name=CurvePyramid.get_extname(tbin))
+			hdu.header['TBIN'] = (tbin, 'bin width (sec)')
+			hdu.header['TSTART'] = (self.tstart, 'start time of the first bin (sec)')
+			hdu.header['TSTOP'] = (self.tstart + tbin * counts.shape[1], 'stop time of the last bin (sec)')
+			hdu.header['NBANDS'] = (self.nbands, 'number of pha bands (row 0 is all pha)')
+			hdu.header['NEVENTS'] = (self.nevents, 'number of events of the event file')
+			if self.nevents > 0:
+				hdu.header['EVTFIRST'] = (self.time_first, 'TIME of the first event (sec)')
+				hdu.header['EVTLAST'] = (self.time_last, 'TIME of the last event (sec)')
+			for i, edge in enumerate(self.pha_edges):
+				hdu.header['PHAEDGE%d' % (i+1)] = (int(edge), 'pha boundary between bands %d and %d' % (i+1,i+2))
+			for keyword in dict_keywords.keys():
+				hdu.header[keyword] = dict_keywords[keyword]
+			hdus.append(hdu)
+		hdus[-1].header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+		fits.HDUList(hdus).writeto(output_fitsfile)
+
+	@staticmethod
+	def is_sidecar_of(header, nevents, time_first, time_last):
+		"""
+		Returns True if a pyramid header was made from the events of an event 
+		file (the same number of events and TIME of the first and last events
+		within a tick), i.e., the sidecar file is not stale.
+		"""
+		if header.get('NEVENTS') != nevents or nevents == 0 or 'EVTFIRST' not in header:
+			return False
+		return (abs(header['EVTFIRST'] - time_first) < 0.5 * CurvePyramid.tick 
+			and abs(header['EVTLAST'] - time_last) < 0.5 * CurvePyramid.tick)
+
+	@staticmethod
+	def get_extname(tbin):
+		return 'LC_%gS' % tbin
+
+	@staticmethod
+	def get_pha_edges(dict_keywords, kev_per_channel=None):
+		"""
+		Converts the AREABD1-5 thresholds (keV) of the config file to pha 
+		channels. Without kev_per_channel (no calibration), no band is defined.
+		"""
+		if kev_per_channel == None:
+			return []
+		pha_edges = []
+		for i in range(1,6):
+			keyword = 'AREABD%d' % i
+			if keyword in dict_keywords and dict_keywords[keyword] > 0:
+				pha_edges.append(int(round(dict_keywords[keyword] / kev_per_channel)))
+		return pha_edges
+
+	@staticmethod
+	def get_band_row(pha_edges, pha_min=None, pha_max=None):
+		"""
+		Returns the row of a pha selection in the count images, or None if the 
+		selection is not one of the bands.
+		"""
+		if pha_min == None and pha_max == None:
+			return 0
+		for k in range(1, len(pha_edges) + 2):
+			band_min = pha_edges[k-2] if k > 1 else None
+			band_max = pha_edges[k-1] - 1 if k <= len(pha_edges) else None
+			if (pha_min, pha_max) == (band_min, band_max):
+				return k
+		return None
+
+	@staticmethod
+	def get_sidecar_file(evtfile_path):
+		return '%s_lc.fits' % os.path.splitext(re.sub(r'\.gz$', '', evtfile_path))[0]
+
+class PhaSpectrum(object):
+	"""Pha spectra (counts per channel) in consecutive time slices.
+	Each slice is a row of nchannels counts with its TSTART, TSTOP, and 
+	EXPOSURE, so that the spectrum of a time window or of many files is a sum 
+	of rows instead of a new histogram of the events. The slices are stored 
+	as the SPECTRUM extension of the event file.
+	:param tstart: start time of the first slice (sec)
+	:param tstop: stop time of the last slice (sec)
+	:param tbin: slice width (sec), None for a single slice
+	:param nchannels: number of pha channels
+	"""
+	def __init__(self, tstart, tstop, tbin=None, nchannels=1024):
+		self.tbin = tbin
+		self.nchannels = nchannels
+		if tbin == None:
+			edges = np.array([tstart, tstop], dtype=np.float64)
+		else:
+			nslices = int(np.ceil(round((tstop - tstart) / tbin, 6)))
+			edges = tstart + tbin * np.arange(nslices + 1)
+		self.tstarts = edges[:-1]
+		self.tstops = edges[1:]
+		self.exposures = self.tstops - self.tstarts
+		self.slices = np.zeros((len(self.tstarts), nchannels), dtype=np.int64)
+
+	def fill(self, time, pha):
+		"""
+		Adds events, which can be called for chunks of events.
+		"""
+		time = np.asarray(time, dtype=np.float64)
+		pha = np.asarray(pha, dtype=np.int64)
+		index = np.searchsorted(self.tstarts, time, side='right') - 1
+		inside = (index >= 0) & (time <= self.tstops[-1]) & (pha >= 0) & (pha < self.nchannels)
+		flat_index = index[inside] * self.nchannels + pha[inside]
+		self.slices += np.bincount(flat_index, 
+			minlength=self.slices.size).reshape(self.slices.shape)
+
+	@property
+	def counts(self):
+		return self.slices.sum(axis=0)
+
+	@property
+	def exposure(self):
+		return self.exposures.sum()
+
+	@property
+	def tstart(self):
+		return self.tstarts[0]
+
+	@property
+	def tstop(self):
+		return self.tstops[-1]
+
+	def select(self, tstart=None, tstop=None):
+		"""
+		Returns the slices within the time window [tstart, tstop]. The window is 
+		rounded to the slices: a slice is included if its center is in the window.
+		"""
+		center = 0.5 * (self.tstarts + self.tstops)
+		inside = np.ones(len(center), dtype=bool)
+		if tstart != None:
+			inside &= (center >= tstart)
+		if tstop != None:
+			inside &= (center <= tstop)
+		return PhaSpectrum.from_slices(self.tstarts[inside], self.tstops[inside], 
+			self.exposures[inside], self.slices[inside], tbin=self.tbin)
+
+	def rebin(self, tbin):
+		"""
+		Returns the spectra summed into coarser slices aligned to multiples of 
+		tbin (e.g., 60 s slices to 600 s slices).
+		"""
+		group = np.floor(self.tstarts / tbin + 1e-9).astype(np.int64)
+		starts = np.flatnonzero(np.concatenate([[True], group[1:] != group[:-1]]))
+		stops = np.concatenate([starts[1:], [len(group)]]) - 1
+		return PhaSpectrum.from_slices(self.tstarts[starts], self.tstops[stops], 
+			np.add.reduceat(self.exposures, starts), 
+			np.add.reduceat(self.slices, starts, axis=0), tbin=tbin)
+
+	def __add__(self, other):
+		"""
+		Stacks two spectra into a single slice (counts and exposures are added).
+		"""
+		if len(self.tstarts) == 0:
+			return other.stack()
+		if len(other.tstarts) == 0:
+			return self.stack()
+		spectrum = PhaSpectrum(min(self.tstart, other.tstart), max(self.tstop, other.tstop), 
+			nchannels=self.nchannels)
+		spectrum.slices[0] = self.counts + other.counts
+		spectrum.exposures[0] = self.exposure + other.exposure
+		return spectrum
+
+	def stack(self):
+		"""
+		Returns the sum of the slices as a single slice.
+		"""
+		spectrum = PhaSpectrum(self.tstart, self.tstop, nchannels=self.nchannels)
+		spectrum.slices[0] = self.counts
+		spectrum.exposures[0] = self.exposure
+		return spectrum
+
+	def get_hdu(self, dict_keywords={}):
+		count_format = 'J' if self.slices.max(initial=0) < 2**31 else 'K'
+		column_defs = fits.ColDefs([
+			fits.Column(name='TSTART',format='D', unit='sec', array=self.tstarts),
+			fits.Column(name='TSTOP',format='D', unit='sec', array=self.tstops),
+			fits.Column(name='EXPOSURE',format='D', unit='sec', array=self.exposures),
+			fits.Column(name='COUNTS',format='%d%s' % (self.nchannels,count_format), 
+				unit='count', array=self.slices)])
+		hdu = fits.BinTableHDU.from_columns(column_defs,name='SPECTRUM')
+		hdu.header['NCHAN'] = (self.nchannels, 'number of pha channels')
+		if self.tbin != None:
+			hdu.header['TBIN'] = (self.tbin, 'slice width (sec)')
+		for keyword in dict_keywords.keys():
+			hdu.header[keyword] = dict_keywords[keyword]
+		hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+		return hdu
+
+	def writeto(self, output_fitsfile, dict_keywords={}, overwrite=False):
+		fits.HDUList([fits.PrimaryHDU(),self.get_hdu(dict_keywords)]).writeto(output_fitsfile,overwrite=overwrite)
+
+	@staticmethod
+	def from_slices(tstarts, tstops, exposures, slices, tbin=None):
+		spectrum = PhaSpectrum.__new__(PhaSpectrum)
+		spectrum.tbin = tbin
+		spectrum.nchannels = slices.shape[1]
+		spectrum.tstarts = np.asarray(tstarts, dtype=np.float64)
+		spectrum.tstops = np.asarray(tstops, dtype=np.float64)
+		spectrum.exposures = np.asarray(exposures, dtype=np.float64)
+		spectrum.slices = slices
+		return spectrum
+
+	@staticmethod
+	def from_hdu(hdu):
+		data = hdu.data
+		nchannels = hdu.header['NCHAN']
+		return PhaSpectrum.from_slices(data['TSTART'], data['TSTOP'], data['EXPOSURE'],
+			np.array(data['COUNTS'], dtype=np.int64).reshape(len(data), nchannels), 
+			tbin=hdu.header.get('TBIN'))
+
+	@staticmethod
+	def read(file_path):
+		"""
+		Reads the SPECTRUM extension of a fits file (an event file or a 
+		stacked spectrum). For an event file without it, the spectrum is 
+		computed from the events.
+		"""
+		with fits.open(file_path) as hdul:
+			if 'SPECTRUM' in hdul:
+				return PhaSpectrum.from_hdu(hdul['SPECTRUM'])
+		return EventFitsFile(file_path).get_spectrum()
+
+def stack_spectra(file_paths, tstart=None, tstop=None):
+	"""
+	Stacks the spectra of many files (e.g., hour files to a daily spectrum, or
+	daily spectra to a monthly spectrum) within a time window.
+	:returns: PhaSpectrum with a single slice
+	"""
+	stacked = None
+	for file_path in file_paths:
+		spectrum = PhaSpectrum.read(file_path).select(tstart=tstart, tstop=tstop)
+		if len(spectrum.tstarts) == 0:
+			continue
+		stacked = spectrum.stack() if stacked == None else stacked + spectrum
+	return stacked
+
+class EventSelection(object):
+	"""Represents an event selection by a pha range and time windows (GTIs).
+	:param pha_min: lower limit of pha (inclusive), None for no limit
+	:param pha_max: upper limit of pha (inclusive), None for no limit
+	:param gtis: list of (tstart, tstop) in the TIME column (inclusive), None for all times
+	Selections are combined with "&" (intersection of the pha ranges and GTIs).
+	"""
+	def __init__(self, pha_min=None, pha_max=None, gtis=None):
+		self.pha_min = pha_min
+		self.pha_max = pha_max
+		if gtis != None:
+			gtis = tuple(sorted((float(tstart),float(tstop)) for tstart, tstop in gtis))
+		self.gtis = gtis
+
+	@property
+	def key(self):
+		return (self.pha_min, self.pha_max, self.gtis)
+
+	def __eq__(self, other):
+		return isinstance(other,EventSelection) and self.key == other.key
+
+	def __hash__(self):
+		return hash(self.key)
+
+	def __and__(self, other):
+		pha_min = max([x for x in [self.pha_min,other.pha_min] if x != None], default=None)
+		pha_max = min([x for x in [self.pha_max,other.pha_max] if x != None], default=None)
+		if self.gtis == None or other.gtis == None:
+			gtis = self.gtis if other.gtis == None else other.gtis
+		else:
+			gtis = [(max(t0,u0),min(t1,u1)) for t0, t1 in self.gtis for u0, u1 in other.gtis 
+				if max(t0,u0) <= min(t1,u1)]
+		return EventSelection(pha_min=pha_min,pha_max=pha_max,gtis=gtis)
+
+	def __str__(self):
+		if self.pha_min == None and self.pha_max == None:
+			dump = "no pha selection."
+		elif self.pha_min != None and self.pha_max == None:
+			dump = "%d <= pha" % self.pha_min
+		elif self.pha_min == None and self.pha_max != None:
+			dump = "pha <= %d" % self.pha_max
+		else:
+			dump = "%d <= pha <= %d" % (self.pha_min,self.pha_max)
+		if self.gtis != None:
+			dump += " (%d GTIs)" % len(self.gtis)
+		return dump
+
+	@property
+	def suffix(self):
+		if self.pha_min == None and self.pha_max == None:
+			suffix = 'pha_all' 
+		elif self.pha_min != None and self.pha_max == None:
+			suffix = 'pha_%d_xx' % (self.pha_min)
+		elif self.pha_min == None and self.pha_max != None:
+			suffix = 'pha_xx_%d' % (self.pha_max)
+		else:
+			suffix = 'pha_%d_%d' % (self.pha_min,self.pha_max)
+		if self.gtis != None:
+			suffix += '_gti%d' % len(self.gtis)
+		return suffix
+
+	def get_mask(self, time, pha):
+		"""
+		Returns a boolean mask of the selected events. The time column must be 
+		sorted, so that each GTI is a slice found by a binary search.
+		"""
+		mask = np.full(len(pha), True)
+		if self.pha_min != None:
+			mask &= (pha >= self.pha_min)
+		if self.pha_max != None:
+			mask &= (pha <= self.pha_max)
+		if self.gtis != None:
+			gti_mask = np.full(len(time), False)
+			for tstart, tstop in self.gtis:
+				i0 = np.searchsorted(time, tstart, side='left')
+				i1 = np.searchsorted(time, tstop, side='right')
+				gti_mask[i0:i1] = True
+			mask &= gti_mask
+		return mask
+
+##########################
+# Burst search
+##########################
+
+burst_dtype = np.dtype([('TSTART',np.float64),('TSTOP',np.float64),('PEAK_TIME',np.float64),
+	('PEAK_RATE',np.float64),('BKG_RATE',np.float64),('SIGNIFICANCE',np.float64),('TBIN',np.float64)])
+
+def get_running_background(cumsum, width, nwin, ngap=0):
+	"""
+	For each window of width bins starting at each bin, returns the counts in
+	the window, and the sum of counts and the number of bins of its background:
+	nwin bins on each side, separated from the window by ngap bins (truncated 
+	at the edges). cumsum is the cumulative sum of the counts with a leading 0,
+	so that each window costs O(1) for any width.
+	"""
+	nbins = len(cumsum) - 1
+	index = np.arange(nbins - width + 1)
+	n_on = cumsum[index + width] - cumsum[index]
+	left_low = np.clip(index - ngap - nwin, 0, nbins)
+	left_high = np.clip(index - ngap, 0, nbins)
+	right_low = np.clip(index + width + ngap, 0, nbins)
+	right_high = np.clip(index + width + ngap + nwin, 0, nbins)
+	n_off = (cumsum[left_high] - cumsum[left_low]) + (cumsum[right_high] - cumsum[right_low])
+	nbins_off = ((left_high - left_low) + (right_high - right_low)).astype(np.float64)
+	return n_on, n_off, nbins_off
+
+def get_significance(n_on, n_off, alpha, method='lima'):
+	"""
+	Significance of n_on counts in a bin over n_off background counts 
+	accumulated over 1/alpha bins.
+	'lima': Li & Ma (1983) Eq. 17, signed by the excess.
+	'poisson': (n_on - alpha n_off) / sqrt(alpha n_off).
+	"""
+	n_on = np.asarray(n_on, dtype=np.float64)
+	n_off = np.asarray(n_off, dtype=np.float64)
+	excess = n_on - alpha * n_off
+	if method == 'poisson':
+		bkg = alpha * n_off
+		return np.divide(excess, np.sqrt(bkg), out=np.zeros_like(excess), where=bkg > 0)
+	elif method == 'lima':
+		n_total = n_on + n_off
+		with np.errstate(divide='ignore', invalid='ignore'):
+			term_on = np.where(n_on > 0, 
+				n_on * np.log((1.0 + alpha) / alpha * n_on / n_total), 0.0)
+			term_off = np.where(n_off > 0, 
+				n_off * np.log((1.0 + alpha) * n_off / n_total), 0.0)
+		return np.sign(excess) * np.sqrt(np.clip(2.0 * (term_on + term_off), 0.0, None))
+	else:
+		raise ValueError("method must be 'lima' or 'poisson': {}".format(method))
+
+def get_burst_intervals(flag):
+	"""
+	Returns (starts, stops) bin indices of the runs of True in a boolean array.
+	"""
+	edges = np.flatnonzero(np.diff(np.concatenate([[0], flag.astype(np.int8), [0]])))
+	return edges[0::2], edges[1::2]
+
+def get_run_maxima(values, flag):
+	"""
+	Returns (starts, stops, peaks, maxima) of the runs of True in flag, where
+	peaks are the indices of the maximum values in each run (reduceat over 
+	the flagged bins, without a loop over the runs).
+	"""
+	starts, stops = get_burst_intervals(flag)
+	if len(starts) == 0:
+		return starts, stops, starts, np.array([])
+	inside = np.flatnonzero(flag)
+	offsets = np.concatenate([[0], np.cumsum(stops - starts)[:-1]])
+	run = np.repeat(np.arange(len(starts)), stops - starts)
+	maxima = np.maximum.reduceat(values[inside], offsets)
+	is_peak = values[inside] == maxima[run]
+	first = np.unique(run[is_peak], return_index=True)[1]
+	return starts, stops, inside[is_peak][first], maxima
+
+def search_bursts(counts, tstart, tbin, threshold=5.0, bkg_window=60.0, bkg_gap=10.0, method='lima'):
+	"""
+	Searches a light curve for bins exceeding the running background. 
+	Consecutive bins above the threshold are merged into one burst interval.
+	:param counts: counts per bin 
+	:param tstart: start time of the first bin (sec)
+	:param tbin: bin width (sec)
+	:param threshold: significance threshold (sigma)
+	:param bkg_window: width (sec) of the running background window on each side
+	:param bkg_gap: width (sec) excluded from the background on each side of 
+		the bin, so that an extended burst does not raise its own background
+	:returns: structured array (burst_dtype) of the burst intervals
+	"""
+	counts = np.asarray(counts, dtype=np.float64)
+	cumsum = np.concatenate([[0.0], np.cumsum(counts)])
+	nwin = max(int(round(bkg_window / tbin)), 1)
+	ngap = int(round(bkg_gap / tbin))
+	n_on, n_off, nbins_off = get_running_background(cumsum, 1, nwin, ngap=ngap)
+	alpha = np.divide(1.0, nbins_off, out=np.zeros_like(nbins_off), where=nbins_off > 0)
+	significance = get_significance(counts, n_off, alpha, method=method)
+
+	flag = significance >= threshold
+	starts, stops, peak, peak_counts = get_run_maxima(counts, flag)
+	bursts = np.zeros(len(starts), dtype=burst_dtype)
+	if len(starts) == 0:
+		return bursts
+
+	bursts['TSTART'] = tstart + starts * tbin
+	bursts['TSTOP'] = tstart + stops * tbin
+	bursts['PEAK_TIME'] = tstart + (peak + 0.5) * tbin
+	bursts['PEAK_RATE'] = counts[peak] / tbin
+	bursts['BKG_RATE'] = alpha[peak] * n_off[peak] / tbin
+	bursts['SIGNIFICANCE'] = get_run_maxima(significance, flag)[3]
+	bursts['TBIN'] = tbin
+	return bursts
+
+def search_bursts_multiscale(counts, tstart, tbin, timescales, threshold=5.0, 
+	bkg_window=60.0, bkg_gap=10.0, method='lima'):
+	"""
+	Searches a light curve at several timescales in one pass. The counts in 
+	sliding windows of each timescale are differences of one cumulative sum 
+	of the finest light curve, so that no rebinning is needed. The background
+	window and gap grow with the timescale (at least 4 and 1 times the window).
+	Detections overlapping in time are merged across the timescales, keeping 
+	the peak of the most significant one (its timescale is in TBIN).
+	:param counts: counts per bin of the finest light curve
+	:param timescales: window widths (sec), rounded to multiples of tbin
+	"""
+	counts = np.asarray(counts, dtype=np.float64)
+	cumsum = np.concatenate([[0.0], np.cumsum(counts)])
+	widths = np.unique(np.maximum(np.rint(np.asarray(timescales) / tbin).astype(np.int64), 1))
+	widths = widths[widths <= len(counts)]
+
+	candidates = []
+	for width in widths:
+		nwin = max(int(round(bkg_window / tbin)), 4 * width)
+		ngap = max(int(round(bkg_gap / tbin)), width)
+		n_on, n_off, nbins_off = get_running_background(cumsum, width, nwin, ngap=ngap)
+		alpha = np.divide(width, nbins_off, out=np.zeros_like(nbins_off), where=nbins_off > 0)
+		significance = get_significance(n_on, n_off, alpha, method=method)
+
+		starts, stops, peak, maxima = get_run_maxima(significance, significance >= threshold)
+		bursts = np.zeros(len(starts), dtype=burst_dtype)
+		bursts['TSTART'] = tstart + starts * tbin
+		bursts['TSTOP'] = tstart + (stops - 1 + width) * tbin
+		bursts['PEAK_TIME'] = tstart + (peak + 0.5 * width) * tbin
+		bursts['PEAK_RATE'] = n_on[peak] / (width * tbin)
+		bursts['BKG_RATE'] = alpha[peak] * n_off[peak] / (width * tbin)
+		bursts['SIGNIFICANCE'] = maxima
+		bursts['TBIN'] = width * tbin
+		candidates.append(bursts)
+	if len(candidates) == 0:
+		return np.zeros(0, dtype=burst_dtype)
+	return merge_bursts(np.concatenate(candidates))
+
+def merge_bursts(bursts):
+	"""
+	Merges burst intervals overlapping in time. Each merged interval covers all
+	of them and keeps the other columns of its most significant member.
+	"""
+	if len(bursts) == 0:
+		return bursts
+	bursts = bursts[np.argsort(bursts['TSTART'], kind='stable')]
+	stop_max = np.maximum.accumulate(bursts['TSTOP'])
+	is_first = np.concatenate([[True], bursts['TSTART'][1:] > stop_max[:-1]])
+	group = np.cumsum(is_first) - 1
+	first = np.flatnonzero(is_first)
+
+	order = np.lexsort((-bursts['SIGNIFICANCE'], group))
+	best = order[np.searchsorted(group[order], np.arange(len(first)))]
+	merged = bursts[best].copy()
+	merged['TSTART'] = bursts['TSTART'][first]
+	merged['TSTOP'] = np.maximum.reduceat(bursts['TSTOP'], first)
+	return merged
+
+def get_burst_hdu(bursts, dict_keywords={}):
+	"""
+	Returns the BURSTS binary table extension of a burst search result.
+	"""
+	column_defs = fits.ColDefs([
+		fits.Column(name='TSTART',format='D', unit='sec', array=bursts['TSTART']),
+		fits.Column(name='TSTOP',format='D', unit='sec', array=bursts['TSTOP']),
+		fits.Column(name='PEAK_TIME',format='D', unit='sec', array=bursts['PEAK_TIME']),
+		fits.Column(name='PEAK_RATE',format='D', unit='count/s', array=bursts['PEAK_RATE']),
+		fits.Column(name='BKG_RATE',format='D', unit='count/s', array=bursts['BKG_RATE']),
+		fits.Column(name='SIGNIFICANCE',format='D', unit='sigma', array=bursts['SIGNIFICANCE']),
+		fits.Column(name='TBIN',format='D', unit='sec', array=bursts['TBIN'])])
+	hdu = fits.BinTableHDU.from_columns(column_defs,name='BURSTS')
+	for keyword in dict_keywords.keys():
+		hdu.header[keyword] = dict_keywords[keyword]
+	hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	return hdu
+
+##########################
+# Network coincidence
+##########################
+
+candidate_dtype = np.dtype([('DET_ID','U8')] + [(name, burst_dtype[name]) for name in burst_dtype.names])
+
+coincidence_dtype = np.dtype([('TSTART',np.float64),('TSTOP',np.float64),('PEAK_TIME',np.float64),
+	('SPREAD',np.float64),('NDET',np.int32),('DET_IDS','U256'),('SIGNIFICANCE',np.float64),
+	('MAX_DIST',np.float64),('LONGITUDE',np.float64),('LATITUDE',np.float64)])
+
+def get_candidates(bursts, det_id):
+	"""
+	Returns the burst intervals (burst_dtype) of a detector as candidates.
+	"""
+	candidates = np.zeros(len(bursts), dtype=candidate_dtype)
+	candidates['DET_ID'] = '%03d' % int(det_id)
+	for name in burst_dtype.names:
+		candidates[name] = bursts[name]
+	return candidates
+
+def read_candidates(file_paths):
+	"""
+	Returns the candidates of the BURSTS extensions of burst files (written 
+	by EventFitsFile.find_burst), with DET_ID from their headers.
+	"""
+	candidates = []
+	for file_path in file_paths:
+		with fits.open(file_path) as hdul:
+			candidates.append(get_candidates(hdul['BURSTS'].data, hdul['BURSTS'].header['DET_ID']))
+	if len(candidates) == 0:
+		return np.zeros(0, dtype=candidate_dtype)
+	return np.concatenate(candidates)
+
+def get_detector_positions(hk_file_paths):
+	"""
+	Returns {detector ID: (longitude, latitude)} averaged over the rows with
+	valid GPS (Gps_status > 0) of house keeping fits files.
+	"""
+	sums = {}
+	for file_path in hk_file_paths:
+		with fits.open(file_path) as hdul:
+			det_id = '%03d' % int(hdul['HK'].header['DET_ID'])
+			data = hdul['HK'].data
+			valid = data['Gps_status'] > 0
+			lon_sum, lat_sum, nrows = sums.get(det_id, (0.0, 0.0, 0))
+			sums[det_id] = (lon_sum + np.sum(data['Longitude'][valid]), 
+				lat_sum + np.sum(data['Latitude'][valid]), nrows + np.count_nonzero(valid))
+	positions = {}
+	for det_id in sums.keys():
+		lon_sum, lat_sum, nrows = sums[det_id]
+		if nrows > 0:
+			positions[det_id] = (lon_sum / nrows, lat_sum / nrows)
+	return positions
+
+def get_distance_km(lon1, lat1, lon2, lat2):
+	"""
+	Great-circle distance (km, haversine) between positions in degrees.
+	"""
+	lon1, lat1, lon2, lat2 = [np.radians(value) for value in (lon1, lat1, lon2, lat2)]
+	a = np.sin((lat2 - lat1) / 2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0)**2
+	return 2.0 * 6371.0 * np.arcsin(np.sqrt(a))
+
+def find_coincidences(candidates, window=1.0, min_detectors=2, positions={}, max_distance=None):
+	"""
+	Finds the candidates of different detectors coincident in time. The 
+	candidates are sorted by TSTART once, and a sweep with the running maximum
+	of TSTOP groups the intervals separated by gaps <= window (as in 
+	merge_bursts), so that the cost is O(N log N) instead of all pairs.
+	:param candidates: structured array of candidate_dtype from all detectors
+	:param window: maximum gap (sec) between coincident intervals
+	:param min_detectors: minimum number of detectors in a coincidence
+	:param positions: {detector ID: (longitude, latitude)} for the distances 
+		between the detectors and the centroid of a coincidence
+	:param max_distance: maximum distance (km) between the detectors of a 
+		coincidence (None: no limit), requires the positions
+	:returns: structured array (coincidence_dtype) of the coincidences
+	"""
+	sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+	candidates = candidates[np.argsort(candidates['TSTART'], kind='stable')]
+	if len(candidates) == 0:
+		return np.zeros(0, dtype=coincidence_dtype)
+	stop_max = np.maximum.accumulate(candidates['TSTOP'])
+	is_first = np.concatenate([[True], candidates['TSTART'][1:] > stop_max[:-1] + window])
+	group = np.cumsum(is_first) - 1
+
+	# (group, detector) members, sorted by group
+	det_ids, det_index = np.unique(candidates['DET_ID'], return_inverse=True)
+	members = np.unique(group * len(det_ids) + det_index)
+	member_group = members // len(det_ids)
+	member_det = members % len(det_ids)
+	ndet = np.bincount(member_group, minlength=group[-1] + 1)
+	coincident = np.flatnonzero(ndet >= min_detectors)
+	is_coincident = ndet[member_group] >= min_detectors
+	member_group = member_group[is_coincident]
+	member_det = member_det[is_coincident]
+
+	first = np.flatnonzero(is_first)
+	order = np.lexsort((-candidates['SIGNIFICANCE'], group))
+	best = order[np.searchsorted(group[order], np.arange(len(first)))]
+	tstop = np.maximum.reduceat(candidates['TSTOP'], first)
+	peak_min = np.minimum.reduceat(candidates['PEAK_TIME'], first)
+	peak_max = np.maximum.reduceat(candidates['PEAK_TIME'], first)
+
+	coincidences = np.zeros(len(coincident), dtype=coincidence_dtype)
+	coincidences['TSTART'] = candidates['TSTART'][first[coincident]]
+	coincidences['TSTOP'] = tstop[coincident]
+	coincidences['PEAK_TIME'] = candidates['PEAK_TIME'][best[coincident]]
+	coincidences['SPREAD'] = (peak_max - peak_min)[coincident]
+	coincidences['NDET'] = ndet[coincident]
+	coincidences['SIGNIFICANCE'] = candidates['SIGNIFICANCE'][best[coincident]]
+	if len(coincident) > 0:
+		member_first = np.concatenate([[0], np.cumsum(ndet[coincident])[:-1]])
+		det_names = det_ids.tolist()
+		coincidences['DET_IDS'] = [','.join(det_names[j] for j in dets) 
+			for dets in np.split(member_det, member_first[1:])]
+
+		# positions: centroid and the maximum distance over the pairs of members
+		lon = np.array([positions[det_id][0] if det_id in positions else np.nan for det_id in det_names])[member_det]
+		lat = np.array([positions[det_id][1] if det_id in positions else np.nan for det_id in det_names])[member_det]
+		located = np.isfinite(lon)
+		nlocated = np.add.reduceat(located.astype(np.int64), member_first)
+		with np.errstate(invalid='ignore', divide='ignore'):
+			coincidences['LONGITUDE'] = np.add.reduceat(np.where(located, lon, 0.0), member_first) / nlocated
+			coincidences['LATITUDE'] = np.add.reduceat(np.where(located, lat, 0.0), member_first) / nlocated
+		sizes = np.repeat(ndet[coincident], ndet[coincident])
+		index_a = np.repeat(np.arange(len(member_det)), sizes)
+		index_b = np.repeat(np.repeat(member_first, ndet[coincident]), sizes) + (
+			np.arange(len(index_a)) - np.repeat(np.cumsum(sizes) - sizes, sizes))
+		distance = get_distance_km(lon[index_a], lat[index_a], lon[index_b], lat[index_b])
+		pair_first = np.concatenate([[0], np.cumsum(ndet[coincident]**2)[:-1]])
+		coincidences['MAX_DIST'] = np.fmax.reduceat(distance, pair_first)
+	if max_distance != None:
+		coincidences = coincidences[coincidences['MAX_DIST'] <= max_distance]
+	print("%d candidates of %d detectors --> %d coincidences (>= %d detectors, window %g sec)" % (
+		len(candidates), len(det_ids), len(coincidences), min_detectors, window))
+	return coincidences
+
+def get_coincidence_hdu(coincidences, dict_keywords={}):
+	"""
+	Returns the COINCIDENCES binary table extension.
+	"""
+	column_defs = fits.ColDefs([
+		fits.Column(name='TSTART',format='D', unit='sec', array=coincidences['TSTART']),
+		fits.Column(name='TSTOP',format='D', unit='sec', array=coincidences['TSTOP']),
+		fits.Column(name='PEAK_TIME',format='D', unit='sec', array=coincidences['PEAK_TIME']),
+		fits.Column(name='SPREAD',format='D', unit='sec', array=coincidences['SPREAD']),
+		fits.Column(name='NDET',format='J', array=coincidences['NDET']),
+		fits.Column(name='DET_IDS',format='256A', array=coincidences['DET_IDS']),
+		fits.Column(name='SIGNIFICANCE',format='D', unit='sigma', array=coincidences['SIGNIFICANCE']),
+		fits.Column(name='MAX_DIST',format='D', unit='km', array=coincidences['MAX_DIST']),
+		fits.Column(name='LONGITUDE',format='D', unit='deg', array=coincidences['LONGITUDE']),
+		fits.Column(name='LATITUDE',format='D', unit='deg', array=coincidences['LATITUDE'])])
+	hdu = fits.BinTableHDU.from_columns(column_defs,name='COINCIDENCES')
+	for keyword in dict_keywords.keys():
+		hdu.header[keyword] = dict_keywords[keyword]
+	hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	return hdu
+
+##########################
+# Bayesian blocks
+##########################
+
+block_dtype = np.dtype([('TSTART',np.float64),('TSTOP',np.float64),('COUNTS',np.int64),
+	('RATE',np.float64),('RATE_ERR',np.float64)])
+
+def bayesian_blocks(cell_edges, cell_counts, p0=0.05):
+	"""
+	Bayesian Blocks (Scargle et al. 2013) of event data with the O(N^2) 
+	dynamic program, where the inner loop over the start of the last block is
+	vectorized. The cells are single events (unbinned) or time bins 
+	(pre-binned data, cells with zero counts are allowed).
+	:param cell_edges: N+1 edges of the cells (sec)
+	:param cell_counts: N counts in the cells
+	:param p0: false-alarm probability of a change point (Eq. 21)
+	:returns: indices of the cell edges bounding the blocks
+	"""
+	cell_edges = np.asarray(cell_edges, dtype=np.float64)
+	ncells = len(cell_edges) - 1
+	cumsum = np.concatenate([[0.0], np.cumsum(cell_counts, dtype=np.float64)])
+	ncp_prior = 4.0 - np.log(73.53 * p0 * ncells**-0.478)
+
+	best = np.zeros(ncells)
+	last = np.zeros(ncells, dtype=np.int64)
+	for r in range(ncells):
+		# blocks from cell k to r (k = 0 ... r)
+		n_k = cumsum[r+1] - cumsum[:r+1]
+		t_k = cell_edges[r+1] - cell_edges[:r+1]
+		# n_k log(n_k/t_k), which is 0 for empty blocks of pre-binned data
+		fitness = n_k * np.log(np.maximum(n_k, 1e-300) / t_k) - ncp_prior
+		fitness[1:] += best[:r]
+		last[r] = np.argmax(fitness)
+		best[r] = fitness[last[r]]
+
+	change_points = [ncells]
+	index = ncells
+	while index > 0:
+		index = last[index - 1]
+		change_points.append(index)
+	return np.array(change_points[::-1])
+
+def get_blocks(cell_edges, cell_counts, change_points):
+	"""
+	Returns the blocks (block_dtype) bounded by the change points.
+	"""
+	cumsum = np.concatenate([[0], np.cumsum(cell_counts)])
+	blocks = np.zeros(len(change_points) - 1, dtype=block_dtype)
+	blocks['TSTART'] = cell_edges[change_points[:-1]]
+	blocks['TSTOP'] = cell_edges[change_points[1:]]
+	blocks['COUNTS'] = np.diff(cumsum[change_points])
+	exposure = blocks['TSTOP'] - blocks['TSTART']
+	blocks['RATE'] = blocks['COUNTS'] / exposure
+	blocks['RATE_ERR'] = np.sqrt(blocks['COUNTS']) / exposure
+	return blocks
+
+def get_event_cells(time, tbin=None):
+	"""
+	Returns (cell_edges, cell_counts) of sorted event times. Without tbin, 
+	each event is a cell bounded by the midpoints to its neighbours (events
+	with the same time are one cell). With tbin, the events are pre-binned.
+	"""
+	time = np.asarray(time, dtype=np.float64)
+	if tbin == None:
+		unique_time, cell_counts = np.unique(time, return_counts=True)
+		cell_edges = np.concatenate([unique_time[:1], 
+			0.5 * (unique_time[1:] + unique_time[:-1]), unique_time[-1:]])
+		return cell_edges, cell_counts
+	nbins = max(int(np.ceil((time[-1] - time[0]) / tbin)), 1)
+	hist = Hist1D(nbins, time[0], time[0] + nbins * tbin)
+	hist.fill(time, is_sorted=True)
+	return hist.edges, hist.hist
+
+def get_block_hdu(blocks, dict_keywords={}):
+	"""
+	Returns the BLOCKS binary table extension of Bayesian blocks.
+	"""
+	column_defs = fits.ColDefs([
+		fits.Column(name='TSTART',format='D', unit='sec', array=blocks['TSTART']),
+		fits.Column(name='TSTOP',format='D', unit='sec', array=blocks['TSTOP']),
+		fits.Column(name='COUNTS',format='K', unit='count', array=blocks['COUNTS']),
+		fits.Column(name='RATE',format='D', unit='count/s', array=blocks['RATE']),
+		fits.Column(name='RATE_ERR',format='D', unit='count/s', array=blocks['RATE_ERR'])])
+	hdu = fits.BinTableHDU.from_columns(column_defs,name='BLOCKS')
+	for keyword in dict_keywords.keys():
+		hdu.header[keyword] = dict_keywords[keyword]
+	hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	return hdu
+
+##########################
+# Spectral line fitting
+##########################
+
+line_fit_dtype = np.dtype([('FILE','U256'),('XMIN',np.float64),('XMAX',np.float64),
+	('MU',np.float64),('MU_ERR',np.float64),('SIGMA',np.float64),('SIGMA_ERR',np.float64),
+	('AREA',np.float64),('AREA_ERR',np.float64),('C0',np.float64),('C0_ERR',np.float64),
+	('C1',np.float64),('C1_ERR',np.float64),('MU_ERR_LOW',np.float64),('MU_ERR_UP',np.float64),
+	('CHI2',np.float64),('NDOF',np.int64),('VALID',np.bool_)])
+
+def get_pha_spectrum(pha, nchannels=1024):
+	"""
+	Returns the counts of the integer pha channels 0 ... nchannels-1 
+	(one np.bincount over the events).
+	"""
+	pha = np.asarray(pha)
+	pha = pha[(pha >= 0) & (pha < nchannels)]
+	return np.bincount(pha.astype(np.int64), minlength=nchannels)
+
+class LineChi2(object):
+	"""Chi-square of a Gaussian line on a linear continuum (gauss_continuum) 
+	for the counts of the channels x, with the analytic gradient for Minuit.
+	The variance of a channel is its counts (1 for empty channels).
+	"""
+	errordef = Minuit.LEAST_SQUARES
+
+	def __init__(self, x, y):
+		self.x = np.asarray(x, dtype=np.float64)
+		self.y = np.asarray(y, dtype=np.float64)
+		self.weight = 1.0 / np.maximum(self.y, 1.0)
+
+	def get_residual(self, mu, sigma, area, c0, c1):
+		z = (self.x - mu) / sigma
+		gauss = np.exp(-0.5 * z**2) / (np.sqrt(2 * np.pi) * sigma)
+		residual = self.y - (area * gauss + c0 + c1 * self.x)
+		return z, gauss, residual
+
+	def __call__(self, mu, sigma, area, c0, c1):
+		residual = self.get_residual(mu, sigma, area, c0, c1)[2]
+		return np.sum(self.weight * residual**2)
+
+	def grad(self, mu, sigma, area, c0, c1):
+		z, gauss, residual = self.get_residual(mu, sigma, area, c0, c1)
+		# d(chi2)/dp = -2 sum w (y - model) d(model)/dp
+		wr = -2.0 * self.weight * residual
+		return np.array([
+			np.sum(wr * area * gauss * z / sigma),
+			np.sum(wr * area * gauss * (z**2 - 1.0) / sigma),
+			np.sum(wr * gauss),
+			np.sum(wr),
+			np.sum(wr * self.x)])
+
+def get_line_init(x, y, nedge=3):
+	"""
+	Returns starting values (mu, sigma, area, c0, c1) estimated from the 
+	spectrum: the continuum is the line through the means of the nedge 
+	channels at both ends, and the line is the moments of the excess.
+	"""
+	x = np.asarray(x, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+	nedge = max(min(nedge, len(x) // 4), 1)
+	x_low, y_low = np.mean(x[:nedge]), np.mean(y[:nedge])
+	x_high, y_high = np.mean(x[-nedge:]), np.mean(y[-nedge:])
+	c1 = (y_high - y_low) / (x_high - x_low)
+	c0 = y_low - c1 * x_low
+	excess = np.clip(y - (c0 + c1 * x), 0.0, None)
+	area = np.sum(excess)
+	if area > 0:
+		mu = np.sum(excess * x) / area
+		sigma = np.sqrt(np.sum(excess * (x - mu)**2) / area)
+	else:
+		mu = 0.5 * (x[0] + x[-1])
+		sigma = 0.0
+	sigma = max(sigma, 1.0)
+	return mu, sigma, max(area, 1.0), c0, c1
+
+def get_line_fit_channels(spectrum, xmin, xmax):
+	"""
+	Returns the channels xmin ... xmax (inclusive) clipped to the channels of 
+	a pha spectrum. ValueError is raised if fewer channels than the free 
+	parameters of the line fit plus one remain.
+	"""
+	x = np.arange(max(int(np.ceil(xmin)), 0), min(int(np.floor(xmax)), len(spectrum) - 1) + 1)
+	if len(x) < 6:
+		raise ValueError("fit range {}-{} has {} channels within the {} channels of the spectrum (at least 6 needed)".format(
+			xmin, xmax, len(x), len(spectrum)))
+	return x
+
+def fit_line_spectrum(spectrum, xmin, xmax, minos=False):
+	"""
+	Fits a Gaussian line with a linear continuum to the channels xmin ... xmax
+	(inclusive) of a pha spectrum (see get_pha_spectrum). The range is clipped
+	to the channels of the spectrum (see get_line_fit_channels).
+	:returns: (result, minuit) where result is a line_fit_dtype record
+	"""
+	x = get_line_fit_channels(spectrum, xmin, xmax)
+	y = spectrum[x]
+	chi2 = LineChi2(x, y)
+	mu, sigma, area, c0, c1 = get_line_init(x, y)
+
+	m = Minuit(chi2, mu=mu, sigma=sigma, area=area, c0=c0, c1=c1, grad=chi2.grad)
+	m.limits['mu'] = (x[0], x[-1])
+	m.limits['sigma'] = (0.1, x[-1] - x[0])
+	m.limits['area'] = (0.0, None)
+	m.migrad()
+
+	result = np.zeros((), dtype=line_fit_dtype)
+	result['XMIN'] = xmin
+	result['XMAX'] = xmax
+	for name in ['mu','sigma','area','c0','c1']:
+		result[name.upper()] = m.values[name]
+		result[name.upper() + '_ERR'] = m.errors[name]
+	result['MU_ERR_LOW'] = np.nan
+	result['MU_ERR_UP'] = np.nan
+	if minos and m.valid:
+		m.minos('mu')
+		result['MU_ERR_LOW'] = m.merrors['mu'].lower
+		result['MU_ERR_UP'] = m.merrors['mu'].upper
+	result['CHI2'] = m.fval
+	result['NDOF'] = len(x) - m.nfit
+	result['VALID'] = m.valid
+	return result, m
+
+def fit_lines_in_file(file_path, lines, minos=False):
+	"""
+	Fits the lines [(xmin,xmax), ...] of an event fits file from one spectrum.
+	"""
+	spectrum = PhaSpectrum.read(file_path).counts
+	results = np.zeros(len(lines), dtype=line_fit_dtype)
+	for i, (xmin, xmax) in enumerate(lines):
+		results[i] = fit_line_spectrum(spectrum, xmin, xmax, minos=minos)[0]
+	results['FILE'] = file_path
+	return results
+
+def fit_lines(file_paths, lines, minos=False, nworkers=None):
+	"""
+	Fits the lines [(xmin,xmax), ...] of many event fits files in parallel 
+	(one worker process per file).
+	:returns: line_fit_dtype table (file by file, line by line)
+	"""
+	from concurrent.futures import ProcessPoolExecutor
+	if len(file_paths) == 1:
+		return fit_lines_in_file(file_paths[0], lines, minos=minos)
+	with ProcessPoolExecutor(max_workers=nworkers) as executor:
+		futures = [executor.submit(fit_lines_in_file, file_path, lines, minos)
+			for file_path in file_paths]
+		results = [future.result() for future in futures]
+	return np.concatenate(results)
+
+def get_line_fit_hdu(results, dict_keywords={}):
+	"""
+	Returns the LINEFIT binary table extension of line fit results.
+	"""
+	columns = [fits.Column(name='FILE',format='256A', array=results['FILE'])]
+	for name in line_fit_dtype.names[1:]:
+		if name == 'NDOF':
+			columns.append(fits.Column(name=name,format='K', array=results[name]))
+		elif name == 'VALID':
+			columns.append(fits.Column(name=name,format='L', array=results[name]))
+		elif name == 'CHI2':
+			columns.append(fits.Column(name=name,format='D', array=results[name]))
+		elif name in ['AREA','AREA_ERR']:
+			columns.append(fits.Column(name=name,format='D', unit='count', array=results[name]))
+		elif name in ['C0','C0_ERR','C1','C1_ERR']:
+			columns.append(fits.Column(name=name,format='D', array=results[name]))
+		else:
+			columns.append(fits.Column(name=name,format='D', unit='chan', array=results[name]))
+	hdu = fits.BinTableHDU.from_columns(fits.ColDefs(columns),name='LINEFIT')
+	for keyword in dict_keywords.keys():
+		hdu.header[keyword] = dict_keywords[keyword]
+	hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	return hdu
+
+##########################
+# Gain tracking
+##########################
+
+gain_dtype = np.dtype([('FILE','U256'),('TSTART',np.float64),('TSTOP',np.float64),
+	('EXPOSURE',np.float64),('MU',np.float64),('MU_ERR',np.float64),
+	('SIGMA',np.float64),('SIGMA_ERR',np.float64),('AREA',np.float64),('AREA_ERR',np.float64),
+	('CHI2',np.float64),('NDOF',np.int64),('VALID',np.bool_),('TEMPERATURE',np.float64)])
+
+def track_gain_in_file(file_path, xmin, xmax, tbin=600.0):
+	"""
+	Fits the line peak in time slices of an event file. The slices are sums 
+	of the rows of the SPECTRUM extension, so that the events are not read.
+	"""
+	spectrum = PhaSpectrum.read(file_path).rebin(tbin)
+	results = np.zeros(len(spectrum.tstarts), dtype=gain_dtype)
+	results['FILE'] = file_path
+	results['TSTART'] = spectrum.tstarts
+	results['TSTOP'] = spectrum.tstops
+	results['EXPOSURE'] = spectrum.exposures
+	results['TEMPERATURE'] = np.nan
+	for i, counts in enumerate(spectrum.slices):
+		result = fit_line_spectrum(counts, xmin, xmax)[0]
+		for name in ['MU','MU_ERR','SIGMA','SIGMA_ERR','AREA','AREA_ERR','CHI2','NDOF','VALID']:
+			results[i][name] = result[name]
+	return results
+
+def track_gain(file_paths, xmin, xmax, tbin=600.0, nworkers=None):
+	"""
+	Fits the line peak in time slices of many event files in parallel (one 
+	worker process per file).
+	:returns: gain_dtype table sorted by time
+	"""
+	from concurrent.futures import ProcessPoolExecutor
+	with ProcessPoolExecutor(max_workers=nworkers) as executor:
+		futures = [executor.submit(track_gain_in_file, file_path, xmin, xmax, tbin)
+			for file_path in file_paths]
+		results = np.concatenate([future.result() for future in futures])
+	return results[np.argsort(results['TSTART'], kind='stable')]
+
+def read_hk_column(hk_file_paths, colname='Temperature'):
+	"""
+	Returns (unixtime, values) of a column of house keeping fits files, 
+	concatenated and sorted by Unixtime.
+	"""
+	unixtime = []
+	values = []
+	for hk_file_path in hk_file_paths:
+		with fits.open(hk_file_path) as hdul:
+			unixtime.append(np.array(hdul['HK'].data['Unixtime'], dtype=np.float64))
+			values.append(np.array(hdul['HK'].data[colname], dtype=np.float64))
+	unixtime = np.concatenate(unixtime)
+	values = np.concatenate(values)
+	order = np.argsort(unixtime, kind='stable')
+	return unixtime[order], values[order]
+
+def get_hk_values(time, hk_unixtime, hk_values, max_gap=600.0):
+	"""
+	Returns the house keeping values at the times, linearly interpolated 
+	between the neighbouring HK rows found with np.searchsorted. The value is 
+	NaN where the nearest HK row is more than max_gap (sec) away.
+	:param hk_unixtime: sorted Unixtime of the HK rows
+	"""
+	time = np.asarray(time, dtype=np.float64)
+	index = np.clip(np.searchsorted(hk_unixtime, time, side='right'), 1, len(hk_unixtime) - 1)
+	t0 = hk_unixtime[index - 1]
+	t1 = hk_unixtime[index]
+	weight = np.clip((time - t0) / np.where(t1 > t0, t1 - t0, 1.0), 0.0, 1.0)
+	values = hk_values[index - 1] + weight * (hk_values[index] - hk_values[index - 1])
+	distance = np.minimum(np.abs(time - t0), np.abs(time - t1))
+	values[distance > max_gap] = np.nan
+	return values
+
+class GainModel(object):
+	"""Line peak (channel) as a polynomial of the temperature, 
+	mu(T) = c0 + c1 (T - t_ref) + ..., and the relative gain mu(T)/mu(t_ref).
+	The PI (pulse invariant) is the pha corrected to the gain at t_ref.
+	:param coeffs: polynomial coefficients c0, c1, ... (lowest order first)
+	:param t_ref: reference temperature (degC)
+	"""
+	def __init__(self, coeffs, t_ref):
+		self.coeffs = np.asarray(coeffs, dtype=np.float64)
+		self.t_ref = t_ref
+
+	@staticmethod
+	def fit(temperature, mu, mu_err, deg=1, t_ref=None):
+		"""
+		Weighted least-squares fit of the line peaks. Rows with NaN are ignored,
+		and ValueError is raised if no more than deg rows remain.
+		"""
+		good = np.isfinite(temperature) & np.isfinite(mu) & np.isfinite(mu_err) & (mu_err > 0)
+		if np.count_nonzero(good) <= deg:
+			raise ValueError("gain fit of degree {} needs more than {} rows with finite temperature, mu, and mu_err > 0: "
+				"{} of {} rows ({} with finite temperature, {} with valid line fits)".format(deg, deg, 
+				np.count_nonzero(good), len(good), np.count_nonzero(np.isfinite(temperature)),
+				np.count_nonzero(np.isfinite(mu) & np.isfinite(mu_err) & (mu_err > 0))))
+		if t_ref == None:
+			t_ref = float(np.median(temperature[good]))
+		coeffs = np.polynomial.polynomial.polyfit(temperature[good] - t_ref, mu[good], deg,
+			w=1.0/mu_err[good])
+		return GainModel(coeffs, t_ref)
+
+	def get_peak(self, temperature):
+		return np.polynomial.polynomial.polyval(np.asarray(temperature) - self.t_ref, self.coeffs)
+
+	def get_gain(self, temperature):
+		return self.get_peak(temperature) / self.coeffs[0]
+
+	def get_pi(self, pha, temperature):
+		return np.asarray(pha, dtype=np.float64) / self.get_gain(temperature)
+
+	def get_keywords(self):
+		dict_keywords = {'GAINTREF':(self.t_ref, 'reference temperature of the gain (degC)'),
+			'GAINDEG':(len(self.coeffs) - 1, 'degree of the gain polynomial')}
+		for i, coeff in enumerate(self.coeffs):
+			dict_keywords['GAINC%d' % i] = (coeff, 'line peak polynomial coefficient %d' % i)
+		return dict_keywords
+
+	@staticmethod
+	def from_keywords(header):
+		coeffs = [header['GAINC%d' % i] for i in range(header['GAINDEG'] + 1)]
+		return GainModel(coeffs, header['GAINTREF'])
+
+def get_gain_hdu(results, model=None, dict_keywords={}):
+	"""
+	Returns the GAIN binary table extension of the line peaks in time slices.
+	"""
+	columns = [fits.Column(name='FILE',format='256A', array=results['FILE'])]
+	for name in gain_dtype.names[1:]:
+		if name in ['TSTART','TSTOP','EXPOSURE']:
+			columns.append(fits.Column(name=name,format='D', unit='sec', array=results[name]))
+		elif name in ['MU','MU_ERR','SIGMA','SIGMA_ERR']:
+			columns.append(fits.Column(name=name,format='D', unit='chan', array=results[name]))
+		elif name == 'NDOF':
+			columns.append(fits.Column(name=name,format='K', array=results[name]))
+		elif name == 'VALID':
+			columns.append(fits.Column(name=name,format='L', array=results[name]))
+		elif name == 'TEMPERATURE':
+			columns.append(fits.Column(name=name,format='D', unit='degC', array=results[name]))
+		else:
+			columns.append(fits.Column(name=name,format='D', array=results[name]))
+	hdu = fits.BinTableHDU.from_columns(fits.ColDefs(columns),name='GAIN')
+	if model != None:
+		for keyword, value in model.get_keywords().items():
+			hdu.header[keyword] = value
+	for keyword in dict_keywords.keys():
+		hdu.header[keyword] = dict_keywords[keyword]
+	hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	return hdu
+
+def write_pi_column(file_path, pi, dict_keywords={}):
+	"""
+	Adds (or replaces) the PI column of the EVENTS extension of an event file.
+	"""
+	with fits.open(file_path) as hdul:
+		events = hdul['EVENTS']
+		columns = [column for column in events.columns if column.name != 'PI']
+		columns.append(fits.Column(name='PI',format='E', unit='chan', array=pi))
+		hdu = fits.BinTableHDU.from_columns(fits.ColDefs(columns),header=events.header,name='EVENTS')
+		for keyword in dict_keywords.keys():
+			hdu.header[keyword] = dict_keywords[keyword]
+		hdu.header['history'] = 'PI column added at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+		hdus = [hdul[0]] + [hdu] + [other for other in hdul[1:] if other.name != 'EVENTS']
+		fits.HDUList(hdus).writeto(file_path + '.tmp', overwrite=True)
+	os.replace(file_path + '.tmp', file_path)
+
+def correct_gain_in_file(file_path, model, hk_unixtime, hk_temperature, max_gap=600.0):
+	"""
+	Writes the gain-corrected PI column of an event file with the temperature
+	of each event interpolated from the house keeping data.
+	:returns: (file_path, number of events, number of events without temperature)
+	"""
+	evtfile = EventFitsFile(file_path)
+	temperature = get_hk_values(evtfile.time, hk_unixtime, hk_temperature, max_gap=max_gap)
+	pi = model.get_pi(evtfile.pha, temperature).astype(np.float32)
+	evtfile.hdu.close()
+	write_pi_column(file_path, pi, dict_keywords=model.get_keywords())
+	return file_path, len(pi), int(np.count_nonzero(np.isnan(pi)))
+
+def correct_gain(file_paths, model, hk_unixtime, hk_temperature, max_gap=600.0, nworkers=None):
+	"""
+	Writes the gain-corrected PI column of many event files in parallel.
+	"""
+	from concurrent.futures import ProcessPoolExecutor
+	with ProcessPoolExecutor(max_workers=nworkers) as executor:
+		futures = [executor.submit(correct_gain_in_file, file_path, model, 
+			hk_unixtime, hk_temperature, max_gap) for file_path in file_paths]
+		return [future.result() for future in futures]
+
+##########################
+# Merged event files
+##########################
+
+def merge_gtis(gtis):
+	"""
+	Returns the union of the time intervals [(tstart, tstop), ...] as a sorted
+	list of disjoint intervals.
+	"""
+	merged = []
+	for tstart, tstop in sorted(gtis):
+		if len(merged) > 0 and tstart <= merged[-1][1]:
+			merged[-1] = (merged[-1][0], max(merged[-1][1], tstop))
+		else:
+			merged.append((tstart, tstop))
+	return merged
+
+def get_gti_hdu(gtis, dict_keywords={}):
+	"""
+	Returns the GTI binary table extension of the time intervals.
+	"""
+	gtis = np.array(gtis, dtype=np.float64).reshape(-1, 2)
+	column_defs = fits.ColDefs([
+		fits.Column(name='START',format='D', unit='sec', array=gtis[:,0]),
+		fits.Column(name='STOP',format='D', unit='sec', array=gtis[:,1])])
+	hdu = fits.BinTableHDU.from_columns(column_defs,name='GTI')
+	for keyword in dict_keywords.keys():
+		hdu.header[keyword] = dict_keywords[keyword]
+	hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	return hdu
+
+def merge_event_files(file_paths, output_fitsfile):
+	"""
+	Merges event files (e.g., hour files of a day) into a single time-sorted
+	EVENTS table with the GTI extension. The output is preallocated on disk 
+	and filled column by column through a memory map. The files are ordered 
+	by their first event; files whose times do not overlap are copied as they
+	are, and only the groups of overlapping files are merged by TIME (a 
+	stable sort of the concatenated sorted runs). TIME is written as absolute
+	time (float64) also for the compact profile, whose ticks are relative to 
+	the hour of each file. The SPECTRUM extensions, if all files have them, 
+	are concatenated. Files without events are skipped, and ValueError is 
+	raised if no file has events.
+	:returns: number of events
+	"""
+	sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+	if os.path.exists(output_fitsfile):
+		raise FileExistsError("{} has alaredy existed.".format(output_fitsfile))
+
+	evtfiles = [EventFitsFile(file_path) for file_path in file_paths]
+	evtfiles = [evtfile for evtfile in evtfiles if evtfile.nevents > 0]
+	if len(evtfiles) == 0:
+		raise ValueError("no events to merge in {} input files".format(len(file_paths)))
+	evtfiles.sort(key=lambda evtfile: evtfile.time[0])
+
+	# columns common to all the files, in the order of the first file
+	first_columns = evtfiles[0].hdu['EVENTS'].columns
+	colnames = [name for name in first_columns.names 
+		if all(name in evtfile.hdu['EVENTS'].columns.names for evtfile in evtfiles)]
+	columns = []
+	for name in colnames:
+		if name == 'TIME':
+			columns.append(fits.Column(name='TIME',format='D',unit='sec'))
+		else:
+			columns.append(fits.Column(name=name,format=first_columns[name].format,unit=first_columns[name].unit,
+				bscale=first_columns[name].bscale,bzero=first_columns[name].bzero))
+	hdu = fits.BinTableHDU.from_columns(fits.ColDefs(columns),name='EVENTS')
+	for card in evtfiles[0].hdu['EVENTS'].header.cards:
+		if card.keyword in hdu.header or re.match(r'T(TYPE|FORM|UNIT|DIM|NULL|SCAL|ZERO)\d+', card.keyword):
+			continue
+		if card.keyword == 'COMMENT' and str(card.value).startswith('compact profile'):
+			continue
+		if card.keyword not in ['HISTORY','']:
+			hdu.header[card.keyword] = (card.value, card.comment)
+	gtis = merge_gtis([gti for evtfile in evtfiles for gti in evtfile.get_gtis()])
+	nevents = sum(evtfile.nevents for evtfile in evtfiles)
+	hdu.header['NAXIS2'] = nevents
+	hdu.header['TSTART'] = (gtis[0][0], 'start time of the first GTI (sec)')
+	hdu.header['TSTOP'] = (gtis[-1][1], 'stop time of the last GTI (sec)')
+	hdu.header['NFILES'] = (len(evtfiles), 'number of merged files')
+	hdu.header['history'] = 'merged at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+	for evtfile in evtfiles:
+		hdu.header['history'] = 'merged: {}'.format(os.path.basename(evtfile.file_path))
+	record_dtype = np.dtype([(name, hdu.data.dtype[name].newbyteorder('>')) for name in hdu.data.dtype.names])
+
+	with open(output_fitsfile, 'wb') as fout:
+		fout.write(fits.PrimaryHDU().header.tostring().encode('ascii'))
+		fout.write(hdu.header.tostring().encode('ascii'))
+		data_offset = fout.tell()
+		nbytes = nevents * record_dtype.itemsize
+		fout.truncate(data_offset + nbytes + (2880 - nbytes % 2880) % 2880) # FITS block size
+	records = np.memmap(output_fitsfile, dtype=record_dtype, mode='r+', offset=data_offset, shape=(nevents,))
+
+	# groups of files overlapping in time
+	groups = [[evtfiles[0]]]
+	group_stop = evtfiles[0].time[-1]
+	for evtfile in evtfiles[1:]:
+		if evtfile.time[0] < group_stop:
+			groups[-1].append(evtfile)
+		else:
+			groups.append([evtfile])
+		group_stop = max(group_stop, evtfile.time[-1])
+
+	def get_raw(name, values):
+		# physical values to the stored values of the scaled columns (e.g., unsigned pha)
+		column = hdu.columns[name]
+		if column.bzero in [None, 0] and column.bscale in [None, 1]:
+			return values
+		bzero = column.bzero if column.bzero != None else 0
+		bscale = column.bscale if column.bscale != None else 1
+		return np.round((np.asarray(values, dtype=np.float64) - bzero) / bscale)
+
+	start = 0
+	for group in groups:
+		stop = start + sum(evtfile.nevents for evtfile in group)
+		if len(group) == 1 and np.all(np.diff(group[0].time) >= 0):
+			for name in colnames:
+				records[name][start:stop] = get_raw(name, group[0].get_column(name))
+		else:
+			print("merge %d overlapping files from %s" % (len(group),os.path.basename(group[0].file_path)))
+			order = np.argsort(np.concatenate([evtfile.time for evtfile in group]), kind='stable')
+			for name in colnames:
+				records[name][start:stop] = get_raw(name, 
+					np.concatenate([evtfile.get_column(name) for evtfile in group])[order])
+		start = stop
+	records.flush()
+	del records
+
+	extensions = [get_gti_hdu(gtis)]
+	if all('SPECTRUM' in evtfile.hdu for evtfile in evtfiles):
+		spectra = [evtfile.get_spectrum() for evtfile in evtfiles]
+		spectrum = PhaSpectrum.from_slices(np.concatenate([s.tstarts for s in spectra]),
+			np.concatenate([s.tstops for s in spectra]), np.concatenate([s.exposures for s in spectra]),
+			np.concatenate([s.slices for s in spectra]), tbin=spectra[0].tbin)
+		extensions.append(spectrum.get_hdu())
+	with fits.open(output_fitsfile, mode='append') as hdul:
+		for extension in extensions:
+			hdul.append(extension)
+	for evtfile in evtfiles:
+		evtfile.hdu.close()
+	return nevents
+
+##########################
+# Parquet format
+##########################
+
+def import_pyarrow():
+	"""
+	Imports pyarrow, which is optional and only required for the parquet format.
+	"""
+	try:
+		import pyarrow
+		import pyarrow.parquet
+		import pyarrow.dataset
+	except ImportError:
+		raise ImportError("pyarrow is required for the parquet format (pip install pyarrow)")
+	return pyarrow
+
+def get_jst_dates(unixtime):
+	"""
+	Returns the JST dates (YYYYMMDD strings) of the unix times.
+	"""
+	days = np.floor((np.asarray(unixtime, dtype=np.float64) + 9 * 3600.0) / 86400.0).astype('datetime64[D]')
+	return np.char.replace(days.astype(str), '-', '')
+
+def get_arrow_table(column_defs, header):
+	"""
+	Converts fits columns to an arrow table with the same column names and 
+	types. The units are kept as field metadata, and the header keywords as 
+	the schema metadata (json, key 'cogamo_header').
+	"""
+	import json
+	pa = import_pyarrow()
+	arrays = []
+	fields = []
+	for column in column_defs:
+		array = np.asarray(column.array).astype(column_defs.dtype[column.name].newbyteorder('='))
+		if array.dtype.kind == 'S':
+			array = np.char.decode(array, 'ascii')
+		arrays.append(pa.array(array))
+		fields.append(pa.field(column.name, arrays[-1].type, 
+			metadata={'unit':column.unit if column.unit != None else ''}))
+	dict_keywords = {card.keyword:card.value for card in header.cards 
+		if card.keyword not in ['COMMENT','HISTORY','']}
+	dict_keywords['COMMENT'] = [str(comment) for comment in header.get('COMMENT',[])]
+	metadata = {'cogamo_header':json.dumps(dict_keywords)}
+	return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+
+def get_parquet_path(root_dir, det_id, yyyymmdd, basename):
+	"""
+	Returns the path [root_dir]/det_id=[DDD]/date=[YYYYMMDD]/[basename].parquet
+	(hive partitioning by the detector ID and the JST date).
+	"""
+	return '%s/det_id=%s/date=%s/%s.parquet' % (root_dir, det_id, yyyymmdd, basename)
+
+def write_parquet(table, root_dir, det_id, time_colname, basename, row_group_size=65536):
+	"""
+	Writes an arrow table partitioned by the JST date of the time column. The
+	rows are written in row groups of row_group_size, whose min/max statistics
+	are used for the predicate pushdown of read_parquet.
+	:returns: list of the written files
+	"""
+	pa = import_pyarrow()
+	dates = get_jst_dates(table[time_colname].to_numpy())
+	output_files = []
+	for yyyymmdd in np.unique(dates):
+		output_file = get_parquet_path(root_dir, det_id, yyyymmdd, basename)
+		os.makedirs(os.path.dirname(output_file), exist_ok=True)
+		pa.parquet.write_table(table.filter(pa.array(dates == yyyymmdd)), output_file, 
+			row_group_size=row_group_size)
+		output_files.append(output_file)
+	return output_files
+
+def read_parquet(root_dir, kind='events', det_id=None, tstart=None, tstop=None, 
+	pha_min=None, pha_max=None, columns=None):
+	"""
+	Reads the events or house keeping data of the parquet files written by 
+	write_to_parquet, with the predicate pushdown: the det_id and date 
+	partitions are pruned by the directory names, and the row groups by the 
+	min/max statistics of the time and pha columns.
+	:param kind: 'events' or 'hk'
+	:param tstart, tstop: time range (unixtime), inclusive
+	:param pha_min, pha_max: pha range (events only), inclusive
+	:returns: pandas DataFrame
+	"""
+	pa = import_pyarrow()
+	dataset = pa.dataset.dataset('%s/%s' % (root_dir, kind), format='parquet',
+		partitioning=pa.dataset.partitioning(pa.schema([('det_id',pa.string()),('date',pa.string())]), flavor='hive'))
+	return dataset.to_table(columns=columns, 
+		filter=get_parquet_filter(kind, det_id, tstart, tstop, pha_min, pha_max)).to_pandas()
+
+def get_parquet_filter(kind='events', det_id=None, tstart=None, tstop=None, pha_min=None, pha_max=None):
+	pa = import_pyarrow()
+	field = pa.dataset.field
+	time_colname = 'TIME' if kind == 'events' else 'Unixtime'
+	conditions = []
+	if det_id != None:
+		conditions.append(field('det_id') == '%03d' % int(det_id))
+	if tstart != None:
+		conditions.append(field('date') >= str(get_jst_dates(tstart)))
+		conditions.append(field(time_colname) >= tstart)
+	if tstop != None:
+		conditions.append(field('date') <= str(get_jst_dates(tstop)))
+		conditions.append(field(time_colname) <= tstop)
+	if pha_min != None:
+		conditions.append(field('pha') >= pha_min)
+	if pha_max != None:
+		conditions.append(field('pha') <= pha_max)
+	if len(conditions) == 0:
+		return None
+	expression = conditions[0]
+	for condition in conditions[1:]:
+		expression = expression & condition
+	return expression
+
+def gzip_file(file_path):
+	"""
+	Compresses a file to [file_path].gz, and removes the original.
+	"""
+	import gzip
+	import shutil
+	with open(file_path, 'rb') as fin, gzip.open(file_path + '.gz', 'wb') as fout:
+		shutil.copyfileobj(fin, fout)
+	os.remove(file_path)
+
+##########################
+# Raw csv parsers
+##########################
+
+event_csv_layout = [('minute',np.uint32), ('sec',np.uint32), ('decisec',np.uint16), ('pha',np.uint16)]
+
+hk_csv_layout = [('yyyymmdd','U10'), ('hhmmss','U8'), ('interval',np.int64), 
+	('rate1',np.float64), ('rate2',np.float64), ('rate3',np.float64), ('rate4',np.float64), 
+	('rate5',np.float64), ('rate6',np.float64), ('temperature',np.float64), ('pressure',np.float64),
+	('humidity',np.float64), ('differential',np.float64), ('lux',np.float64), 
+	('gps_status',np.int8), ('longitude',np.float64), ('latitude',np.float64)]
+
+csv_backends = ['auto', 'pyarrow', 'numpy', 'pandas']
+
+def get_csv_backend(backend='auto'):
+	"""
+	Returns the csv parser backend: 'auto' is pyarrow if installed, 
+	otherwise numpy.
+	"""
+	if backend not in csv_backends:
+		raise ValueError("backend must be one of {}: {}".format(csv_backends, backend))
+	if backend == 'auto':
+		try:
+			import pyarrow.csv
+			return 'pyarrow'
+		except ImportError:
+			return 'numpy'
+	return backend
+
+def parse_int_csv(data, ncols):
+	"""
+	Parses csv bytes of non-negative integer fields into a (nlines, ncols) 
+	int64 array without a per-line loop: the digits are weighted by the powers
+	of ten of their positions in the fields and summed per field (reduceat). 
+	Blank lines are skipped. Lines with another number of fields, empty 
+	fields, or other characters raise ValueError with the line number.
+	"""
+	buffer = np.frombuffer(data, dtype=np.uint8)
+	buffer = buffer[(buffer != ord('\r')) & (buffer != ord(' '))]
+	if len(buffer) == 0 or buffer[-1] != ord('\n'):
+		buffer = np.append(buffer, np.uint8(ord('\n')))
+	is_newline = buffer == ord('\n')
+	blank = is_newline & np.concatenate([[True], is_newline[:-1]])
+	if np.any(blank):
+		buffer = buffer[~blank]
+		is_newline = is_newline[~blank]
+	if len(buffer) == 0:
+		return np.zeros((0, ncols), dtype=np.int64)
+	line_ends = np.flatnonzero(is_newline)
+	is_separator = is_newline | (buffer == ord(','))
+	is_digit = (buffer >= ord('0')) & (buffer <= ord('9'))
+
+	invalid = np.flatnonzero(~(is_digit | is_separator))
+	if len(invalid) > 0:
+		raise ValueError("line %d: invalid character %r" % (
+			np.searchsorted(line_ends, invalid[0]) + 1, chr(buffer[invalid[0]])))
+	nseparators = np.diff(np.concatenate([[0], np.cumsum(is_separator)[line_ends]]))
+	bad_lines = np.flatnonzero(nseparators != ncols)
+	if len(bad_lines) > 0:
+		raise ValueError("line %d: %d columns instead of %d" % (bad_lines[0] + 1, nseparators[bad_lines[0]], ncols))
+
+	field = np.cumsum(is_separator) - is_separator
+	field_ends = np.flatnonzero(is_separator)
+	ndigits = np.bincount(field[is_digit], minlength=len(field_ends))
+	bad_fields = np.flatnonzero((ndigits == 0) | (ndigits > 18))
+	if len(bad_fields) > 0:
+		raise ValueError("line %d: empty or too long field" % (bad_fields[0] // ncols + 1))
+	digit_index = np.flatnonzero(is_digit)
+	power = field_ends[field[digit_index]] - digit_index - 1
+	values = (buffer[digit_index] - ord('0')).astype(np.int64) * (10**np.arange(19, dtype=np.int64))[power]
+	values = np.add.reduceat(values, np.concatenate([[0], np.cumsum(ndigits)[:-1]]))
+	return values.reshape(-1, ncols)
+
+def get_layout_dataframe(columns, layout):
+	"""
+	Returns a DataFrame of the columns cast to the dtypes of a layout, where
+	the integer values out of the range of their dtypes raise ValueError.
+	"""
+	data = {}
+	for name, dtype in layout:
+		column = np.asarray(columns[name])
+		dtype = np.dtype(dtype)
+		if dtype.kind in 'iu' and len(column) > 0:
+			info = np.iinfo(dtype)
+			if column.dtype.kind not in 'iu':
+				raise ValueError("column %s: non-integer values" % name)
+			if column.min() < info.min or column.max() > info.max:
+				raise ValueError("column %s: values out of the range of %s" % (name, dtype))
+		data[name] = column.astype(dtype) if dtype.kind != 'U' else column.astype(object)
+	return pd.DataFrame(data)
+
+def read_rawcsv_block(source, layout, backend='auto'):
+	"""
+	Parses csv data without a header (a file path, bytes, or a file-like 
+	object) of a fixed layout [(name, dtype), ...] into a DataFrame.
+	:param backend: 'pyarrow' (pyarrow.csv, multi-threaded), 'numpy' 
+		(parse_int_csv for integer layouts, otherwise np.loadtxt), 'pandas' 
+		(pd.read_csv), or 'auto'
+	"""
+	backend = get_csv_backend(backend)
+	names = [name for name, dtype in layout]
+	if backend == 'pandas':
+		if isinstance(source, bytes):
+			source = io.BytesIO(source)
+		try:
+			df = pd.read_csv(source, header=None, 
+				dtype={i:object for i, (name, dtype) in enumerate(layout) if np.dtype(dtype).kind == 'U'})
+		except pd.errors.EmptyDataError:
+			return get_layout_dataframe({name:[] for name in names}, layout)
+		if df.shape[1] != len(layout):
+			raise ValueError("%d columns instead of %d" % (df.shape[1], len(layout)))
+		if df.isnull().values.any():
+			raise ValueError("line %d: missing values" % (np.flatnonzero(df.isnull().values.any(axis=1))[0] + 1))
+		return get_layout_dataframe({name:df[i].values for i, name in enumerate(names)}, layout)
+	if isinstance(source, str):
+		with open(source, 'rb') as fin:
+			data = fin.read()
+	elif isinstance(source, bytes):
+		data = source
+	else:
+		data = source.read()
+	if len(data.strip()) == 0:
+		return get_layout_dataframe({name:[] for name in names}, layout)
+	if backend == 'pyarrow':
+		import pyarrow
+		import pyarrow.csv
+		types = {'U':pyarrow.string(), 'i':pyarrow.int64(), 'u':pyarrow.int64(), 'f':pyarrow.float64()}
+		table = pyarrow.csv.read_csv(pyarrow.py_buffer(data), 
+			read_options=pyarrow.csv.ReadOptions(column_names=names),
+			convert_options=pyarrow.csv.ConvertOptions(
+				column_types={name:types[np.dtype(dtype).kind] for name, dtype in layout}))
+		for name in names:
+			if table.column(name).null_count > 0:
+				raise ValueError("column %s: missing values" % name)
+		return get_layout_dataframe({name:table.column(name).to_numpy() for name in names}, layout)
+	elif all(np.dtype(dtype).kind in 'iu' for name, dtype in layout):
+		values = parse_int_csv(data, len(layout))
+		return get_layout_dataframe({name:values[:,i] for i, name in enumerate(names)}, layout)
+	else:
+		records = np.loadtxt(io.BytesIO(data), delimiter=',', ndmin=1, 
+			dtype=[(name, np.dtype(dtype)) for name, dtype in layout])
+		return get_layout_dataframe(records, layout)
+
+def iter_line_blocks(file_path, nlines, blocksize=4194304):
+	"""
+	Yields bytes of nlines complete lines (the last block may be shorter) of 
+	a file read in blocks, so that the chunks are parsed by any backend.
+	"""
+	rest = b''
+	with open(file_path, 'rb') as fin:
+		while True:
+			block = fin.read(blocksize)
+			data = rest + block
+			line_ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+			start = 0
+			for end in line_ends[nlines-1::nlines]:
+				yield data[start:end+1]
+				start = end + 1
+			rest = data[start:]
+			if len(block) == 0:
+				break
+	if len(rest.strip()) > 0:
+		yield rest
+
+def read_rawcsv(source, layout, backend='auto', chunksize=None):
+	"""
+	Reads a raw csv-format file of a fixed layout into a DataFrame, or an 
+	iterator of DataFrames of chunksize lines (see read_rawcsv_block).
+	"""
+	if chunksize == None:
+		return read_rawcsv_block(source, layout, backend=backend)
+	return (read_rawcsv_block(data, layout, backend=backend) for data in iter_line_blocks(source, chunksize))
+
 ##########################
 # Event fits file
 ##########################
@@ -70,22 +1803,223 @@ class EventFile(object):
 
 class EventFitsFile(EventFile):
 	"""Represents EventFile in the FITS format.
-	:param file_path: path to a file to be opened
+	:param file_path: path to a file to be opened (.evt or gzip-compressed .evt.gz)
+	:param memmap: if True (default), the file is memory-mapped and the EVENTS
+		table is not read until a column is accessed. Columns are exposed as 
+		cached views (.time, .pha) without copying the record array. A 
+		gzip-compressed file cannot be memory-mapped, and is decompressed 
+		into memory at the first access (memmap is set to False).
+	Files of the compact profile store TIME as integer ticks with the TSCAL 
+	and TZERO keywords, which are scaled to the absolute time on access.
 	"""
-	def __init__(self, file_path):
+	def __init__(self, file_path, memmap=True):
 		self.file_path = file_path
+		self.memmap = memmap and not self.file_path.endswith('.gz')
 
-		self.basename = os.path.splitext(os.path.basename(self.file_path))[0]
+		self.basename = os.path.splitext(re.sub(r'\.gz$', '', os.path.basename(self.file_path)))[0]
 
 		if not os.path.exists(self.file_path):
 			raise FileNotFoundError("{} not found".format(self.file_path))
 		try:
-			self.hdu = fits.open(self.file_path)
+			self.hdu = fits.open(self.file_path, memmap=self.memmap, lazy_load_hdus=True)
 		except OSError as e:
 			raise
 
 		self.format = 'fits'
-		self.nevents = len(self.hdu['EVENTS'].data)		
+		self.nevents = self.hdu['EVENTS'].header['NAXIS2']
+		self.columns = {}
+		self.selections = {}
+		self.spectrum = None
+
+	def get_column(self,colname):
+		"""
+		Returns a view of a column of the EVENTS table, cached per column name.
+		"""
+		if colname not in self.columns:
+			self.columns[colname] = self.hdu['EVENTS'].data.field(colname)
+		return self.columns[colname]
+
+	@property
+	def time(self):
+		return self.get_column('TIME')
+
+	@property
+	def pha(self):
+		return self.get_column('pha')
+
+	def get_gtis(self):
+		"""
+		Returns the GTIs [(tstart, tstop), ...]: the GTI extension if exists, the 
+		TSTART and TSTOP keywords (the hour of the file), or the event times.
+		"""
+		if 'GTI' in self.hdu:
+			data = self.hdu['GTI'].data
+			return list(zip(data['START'].tolist(), data['STOP'].tolist()))
+		header = self.hdu['EVENTS'].header
+		if 'TSTART' in header and 'TSTOP' in header:
+			return [(header['TSTART'], header['TSTOP'])]
+		if self.nevents == 0:
+			return []
+		return [(float(self.time[0]), float(self.time[-1]))]
+
+	def read_time_range(self,tstart=None,tstop=None):
+		"""
+		Returns the events with tstart <= TIME <= tstop as a record array, 
+		read by binary searches on the sorted TIME column on the disk without
+		loading the whole EVENTS table. 
+		"""
+		return read_raw_time_range(self.file_path,'EVENTS','TIME',tstart,tstop)
+
+	def select(self,selection):
+		"""
+		Returns the index array of the events passing an EventSelection. The 
+		index array is cached per selection, so that plotting, burst search, 
+		and fitting with the same selection do not recompute the mask.
+		"""
+		if selection not in self.selections:
+			mask = selection.get_mask(self.time,self.pha)
+			nselected = np.count_nonzero(mask)
+			print(selection)
+			if self.nevents > 0:
+				print("%d --> %d (%.2f%%)" % (self.nevents,nselected,
+					float(nselected)/float(self.nevents)*100.0))
+			else:
+				print("%d --> %d" % (self.nevents,nselected))
+			self.selections[selection] = np.flatnonzero(mask)
+		return self.selections[selection]
+
+	def get_spectrum(self,tbin=60.0):
+		"""
+		Returns the pha spectrum (PhaSpectrum) of this file, read from the 
+		SPECTRUM extension if exists, otherwise computed from the events in 
+		slices of tbin aligned to the hours. The spectrum is memoized.
+		"""
+		if self.spectrum == None:
+			if 'SPECTRUM' in self.hdu:
+				self.spectrum = PhaSpectrum.from_hdu(self.hdu['SPECTRUM'])
+			else:
+				tstart = np.floor(self.time[0] / 3600.0) * 3600.0
+				tstop = np.floor(self.time[-1] / 3600.0) * 3600.0 + 3600.0
+				self.spectrum = PhaSpectrum(tstart, tstop, tbin=tbin)
+				self.spectrum.fill(self.time, self.pha)
+		return self.spectrum
+
+	def get_curve(self,tbin,selection):
+		"""
+		Returns the light curve (Hist1D, time from the first event) of a 
+		selection. The bins are aligned to the hour of the first event (as the 
+		light-curve pyramid) and cover the first to the last event of the file.
+		If a light-curve pyramid file made from this event file exists next to
+		it and has this tbin and pha band, the curve is read from it instead of
+		binning the events; both give the same counts.
+		"""
+		tstart, first_bin, nbins = self.get_curve_bins(tbin)
+		hist_lc = self.get_curve_from_pyramid(tbin,selection,tstart,first_bin,nbins)
+		if hist_lc is not None:
+			return hist_lc
+
+		index = self.select(selection)
+		xlow = tstart + first_bin * tbin - self.time[0]
+		hist_lc = Hist1D(nbins, xlow, xlow + nbins * tbin)
+		if CurvePyramid.is_tick_multiple(tbin):
+			bins = CurvePyramid.get_bin_index(self.time[index], tstart, tbin) - first_bin
+			hist_lc.hist += np.bincount(bins, minlength=nbins)
+		else:
+			hist_lc.fill(self.time[index]-self.time[0],is_sorted=True)
+		return hist_lc
+
+	def get_curve_bins(self,tbin):
+		"""
+		Returns (tstart, index of the first bin, number of bins) of the light 
+		curves, where the bins of width tbin start at tstart, the beginning of 
+		the hour of the first event.
+		"""
+		tstart = np.floor(self.time[0] / 3600.0) * 3600.0
+		if CurvePyramid.is_tick_multiple(tbin):
+			first_bin, last_bin = CurvePyramid.get_bin_index(self.time[[0, -1]], tstart, tbin)
+		else:
+			first_bin, last_bin = np.floor((self.time[[0, -1]] - tstart) / tbin).astype(np.int64)
+		return tstart, int(first_bin), int(last_bin - first_bin + 1)
+
+	def get_curve_from_pyramid(self,tbin,selection,tstart,first_bin,nbins):
+		pyramid_file = CurvePyramid.get_sidecar_file(self.file_path)
+		if selection.gtis != None or not os.path.exists(pyramid_file):
+			return None
+		extname = CurvePyramid.get_extname(tbin)
+		with fits.open(pyramid_file) as hdul:
+			if extname not in hdul:
+				return None
+			header = hdul[extname].header
+			if not CurvePyramid.is_sidecar_of(header,self.nevents,self.time[0],self.time[-1]):
+				print("%s is not made from %s (stale), binning the events" % (pyramid_file,self.file_path))
+				return None
+			offset = (tstart - header['TSTART']) / tbin
+			if abs(offset - round(offset)) > 1e-6:
+				return None
+			pha_edges = [header['PHAEDGE%d' % i] for i in range(1,header['NBANDS'])]
+			row = CurvePyramid.get_band_row(pha_edges,selection.pha_min,selection.pha_max)
+			if row == None:
+				return None
+			istart = int(round(offset)) + first_bin
+			if istart < 0 or istart + nbins > header['NAXIS1']:
+				return None
+			counts = hdul[extname].data[row][istart:istart + nbins]
+		print("read from %s[%s]" % (pyramid_file,extname))
+		xlow = tstart + first_bin * tbin - self.time[0]
+		hist_lc = Hist1D(nbins, xlow, xlow + nbins * tbin)
+		hist_lc.hist += counts
+		return hist_lc
+
+	def write_curve_pyramid(self,output_fitsfile=None,kev_per_channel=None,chunksize=1000000):
+		"""
+		Writes the light-curve pyramid (see CurvePyramid) of this event file. 
+		The bins are aligned to the hours, and the pha bands are the AREABD 
+		thresholds converted to channels with kev_per_channel.
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		if output_fitsfile == None:
+			output_fitsfile = CurvePyramid.get_sidecar_file(self.file_path)
+		header = self.hdu['EVENTS'].header
+		tstart = np.floor(self.time[0] / 3600.0) * 3600.0
+		tstop = np.floor(self.time[-1] / 3600.0) * 3600.0 + 3600.0
+		pyramid = CurvePyramid(tstart, tstop, 
+			pha_edges=CurvePyramid.get_pha_edges(header,kev_per_channel=kev_per_channel))
+		for i in range(0, self.nevents, chunksize):
+			pyramid.fill(self.time[i:i+chunksize], self.pha[i:i+chunksize])
+		pyramid.writeto(output_fitsfile, 
+			dict_keywords={keyword:header[keyword] for keyword in ['DET_ID'] if keyword in header})
+
+	def get_bayesian_blocks(self,pha_min=None,pha_max=None,selection=None,
+		p0=0.05,tbin=None,max_cells=10000,output_fitsfile=None):
+		"""
+		Segments the TIME column of a selection into Bayesian blocks (see 
+		bayesian_blocks) and returns them as a structured array, also written 
+		as a BLOCKS extension in output_fitsfile (default: [basename]_bb_[suffix].fits).
+		The events are pre-binned with tbin, or, if tbin is None and there are 
+		more than max_cells events, with a bin giving max_cells bins, because 
+		the unbinned dynamic program is O(N^2) (see tests/benchmark/bench_bayesian_blocks.py).
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		if selection == None:
+			selection = EventSelection(pha_min=pha_min,pha_max=pha_max)
+		time = self.time[self.select(selection)]
+		if tbin == None and len(time) > max_cells:
+			tbin = (time[-1] - time[0]) / max_cells
+		if tbin != None:
+			print("pre-binned with tbin=%.4f sec" % tbin)
+		cell_edges, cell_counts = get_event_cells(time,tbin=tbin)
+		change_points = bayesian_blocks(cell_edges,cell_counts,p0=p0)
+		blocks = get_blocks(cell_edges,cell_counts,change_points)
+		print("%d blocks from %d cells" % (len(blocks),len(cell_counts)))
+
+		if output_fitsfile == None:
+			output_fitsfile = '%s_bb_%s.fits' % (self.basename,selection.suffix)
+		dict_keywords = {'DET_ID':self.hdu['EVENTS'].header.get('DET_ID',''),
+			'P0':p0,'TBIN':tbin if tbin != None else 0.0,'PHASEL':str(selection)}
+		fits.HDUList([fits.PrimaryHDU(),get_block_hdu(blocks,dict_keywords)]).writeto(output_fitsfile,overwrite=True)
+		return blocks
 
 	def plot_pha_example(self):
 		"""
@@ -93,11 +2027,10 @@ class EventFitsFile(EventFile):
 		"""
 		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
 	
-		data = self.hdu['EVENTS'].data
-
 		outpdf = '%s_pha.pdf' % self.basename
 
-		y, xedges, patches = plt.hist(data['pha'],range=(0,2**10),bins=2**9,histtype='step')
+		y = self.get_spectrum().counts.reshape(2**9,2).sum(axis=1)
+		xedges = np.linspace(0,2**10,2**9+1)
 		x = 0.5*(xedges[1:] + xedges[:-1])
 
 		fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))
@@ -124,40 +2057,16 @@ class EventFitsFile(EventFile):
 
 		plt.savefig(outpdf)
 
-	def plot_curve(self,tbin=1.0,pha_min=None,pha_max=None,colname="TIME"):
+	def plot_curve(self,tbin=1.0,pha_min=None,pha_max=None,colname="TIME",selection=None):
 		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
 
-
-		data = self.hdu['EVENTS'].data
-
-		if pha_min == None and pha_max == None:
-			print("no pha selection.")
-			suffix = 'pha_all' 
-			mask = np.full(len(data), True)
-		elif pha_min != None and pha_max == None:
-			print("%d <= pha" % pha_min)	
-			suffix = 'pha_%d_xx'	% (pha_min)								
-			mask = (data['pha'] >= pha_min)
-		elif pha_min == None and pha_max != None:
-			print("pha <= %d" % pha_max)				
-			suffix = 'pha_xx_%d' % (pha_max)													
-			mask = (data['pha'] <= pha_max)
-		elif pha_min != None and pha_max != None:
-			print("%d <= pha <= %d" % (pha_min,pha_max))
-			suffix = 'pha_%d_%d'	% (pha_min,pha_max)			
-			mask = np.logical_and((data['pha'] >= pha_min),(data['pha'] <= pha_max))
+		if selection == None:
+			selection = EventSelection(pha_min=pha_min,pha_max=pha_max)
+		suffix = selection.suffix
 
 		outpdf = '%s_curve_%s.pdf' % (self.basename,suffix)
 
-		print("%d --> %d (%.2f%%)" % (len(data),len(data[mask]),
-			float(len(data[mask]))/float(len(data))*100.0))
-
-		xlow = 0.0
-		xhigh = data['TIME'][-1] - data['TIME'][0]
-		nbins = round((xhigh-xlow)/tbin)
-		hist_lc = Hist1D(nbins, xlow, xhigh)
-		print(data['TIME'][mask]-data['TIME'][0])
-		hist_lc.fill(data['TIME'][mask]-data['TIME'][0])
+		hist_lc = self.get_curve(tbin,selection)
 
 		fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))		
 		plt.step(*hist_lc.data)
@@ -186,134 +2095,283 @@ class EventFitsFile(EventFile):
 
 		plt.savefig(outpdf)	
 
-	def fit_line(self,pdfname='fit.pdf',fitout='fit.txt',xmin=None,xmax=None,fontsize=18):
+	def fit_line(self,pdfname='fit.pdf',fitout=None,xmin=None,xmax=None,fontsize=18,selection=None,
+		minos=False,plot=True):
+		"""
+		Fits a Gaussian line with a linear continuum between the pha channels 
+		xmin and xmax. The starting values are estimated from the spectrum.
+		:param fitout: output fits file of the result table (LINEFIT extension)
+		:returns: line_fit_dtype record
+		"""
 		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
 
-		flag = np.logical_and(self.hdu['EVENTS'].data['pha'] >= xmin, self.hdu['EVENTS'].data['pha'] <= xmax)
-		selected_evt = self.hdu['EVENTS'].data['pha'][flag]
-		nbins = int(xmax - xmin + 1)
-		bc2 = BinnedChi2(gauss_continuum, selected_evt, 
-			bins=nbins, bound=(xmin,xmax))
+		if selection == None:
+			spectrum = self.get_spectrum().counts
+		else:
+			spectrum = get_pha_spectrum(self.pha[self.select(selection)])
+		result, m = fit_line_spectrum(spectrum, xmin, xmax, minos=minos)
+		result['FILE'] = self.file_path
+		if fitout != None:
+			get_line_fit_hdu(np.atleast_1d(result)).writeto(fitout,overwrite=True)
 
-		fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))
-		plt.xlabel('ADC channel (pha)', fontsize=fontsize)
-		plt.ylabel('Counts', fontsize=fontsize)		
-		plt.tight_layout(pad=2)
-		plt.tick_params(labelsize=fontsize)
-		plt.rcParams["font.family"] = "serif"
-		plt.rcParams["mathtext.fontset"] = "dejavuserif"	
-		ax.minorticks_on()
-		ax.grid(True)
-		ax.grid(axis='both',which='major', linestyle='--', color='#000000')
-		ax.grid(axis='both',which='minor', linestyle='--')	
-		ax.tick_params(axis="both", which='major', direction='in', length=5)						
-
-		m = Minuit(bc2, mu=52, sigma=5, area=100, c0=0, c1=0)
-		m.migrad()
-		bc2.draw(m,errors=True)
-		m.minos() 
-		m.print_param()
-		print(m.values)
-		print(m.errors)
-		print(m.merrors)
-		plt.savefig(pdfname)	
+		if plot:
+			x = get_line_fit_channels(spectrum, xmin, xmax)
+			fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))
+			plt.xlabel('ADC channel (pha)', fontsize=fontsize)
+			plt.ylabel('Counts', fontsize=fontsize)		
+			plt.tight_layout(pad=2)
+			plt.tick_params(labelsize=fontsize)
+			plt.rcParams["font.family"] = "serif"
+			plt.rcParams["mathtext.fontset"] = "dejavuserif"	
+			ax.minorticks_on()
+			ax.grid(True)
+			ax.grid(axis='both',which='major', linestyle='--', color='#000000')
+			ax.grid(axis='both',which='minor', linestyle='--')	
+			ax.tick_params(axis="both", which='major', direction='in', length=5)						
+			plt.errorbar(x,spectrum[x],yerr=np.sqrt(np.maximum(spectrum[x],1)),
+				marker='o',ls='',color='k')
+			model_x = np.linspace(x[0],x[-1],10*len(x))
+			plt.plot(model_x,gauss_continuum(model_x,*m.values),'r-',
+				label='mu=%.2f+/-%.2f sigma=%.2f+/-%.2f' % (
+				result['MU'],result['MU_ERR'],result['SIGMA'],result['SIGMA_ERR']))
+			plt.legend(fontsize=fontsize-4)
+			plt.savefig(pdfname)	
+			plt.close(fig)
+		return result
 
 	def find_burst(self,pha_min=None,pha_max=None,
-		tbin=1.0,threshold=3.0,colname="TIME"):
+		tbin=1.0,threshold=3.0,colname="TIME",selection=None,
+		bkg_window=60.0,bkg_gap=10.0,method='lima',timescales=None,output_fitsfile=None,plot=True):
+		"""
+		Searches for bursts in the light curve of a selection (see search_bursts)
+		and returns the burst intervals as a structured array. If timescales 
+		(sec) are given, the light curve of tbin is searched at all of them 
+		(see search_bursts_multiscale). The result is
+		also written as a BURSTS extension in output_fitsfile 
+		(default: [basename]_burst_[suffix].fits).
+		"""
 		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
 
-		data = self.hdu['EVENTS'].data
+		if selection == None:
+			selection = EventSelection(pha_min=pha_min,pha_max=pha_max)
+		suffix = selection.suffix
 
-		if pha_min == None and pha_max == None:
-			print("no pha selection.")
-			suffix = 'pha_all' 
-			mask = np.full(len(data), True)
-		elif pha_min != None and pha_max == None:
-			print("%d <= pha" % pha_min)	
-			suffix = 'pha_%d_xx'	% (pha_min)								
-			mask = (data['pha'] >= pha_min)
-		elif pha_min == None and pha_max != None:
-			print("pha <= %d" % pha_max)				
-			suffix = 'pha_xx_%d' % (pha_max)													
-			mask = (data['pha'] <= pha_max)
-		elif pha_min != None and pha_max != None:
-			print("%d <= pha <= %d" % (pha_min,pha_max))
-			suffix = 'pha_%d_%d'	% (pha_min,pha_max)			
-			mask = np.logical_and((data['pha'] >= pha_min),(data['pha'] <= pha_max))
-
-		print("%d --> %d (%.2f%%)" % (len(data),len(data[mask]),
-			float(len(data[mask]))/float(len(data))*100.0))
-
-		xlow = 0.0
-		xhigh = data['TIME'][-1] - data['TIME'][0]
-		nbins = round((xhigh-xlow)/tbin)
-		hist_lc = Hist1D(nbins, xlow, xhigh)
-		#print(data['TIME'][mask]-data['TIME'][0])
-		hist_lc.fill(data['TIME'][mask]-data['TIME'][0])
-
-		outpdf = 'tmp_%s_curve_%s.pdf' % (self.basename,suffix)
-		fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))		
-		plt.step(*hist_lc.data)		
-		plt.savefig(outpdf)	
+		hist_lc = self.get_curve(tbin,selection)
+		tstart = self.time[0] + hist_lc.xlow
+		if timescales is None:
+			bursts = search_bursts(hist_lc.hist,tstart,tbin,
+				threshold=threshold,bkg_window=bkg_window,bkg_gap=bkg_gap,method=method)
+		else:
+			bursts = search_bursts_multiscale(hist_lc.hist,tstart,tbin,timescales,
+				threshold=threshold,bkg_window=bkg_window,bkg_gap=bkg_gap,method=method)
+		print("%d bursts (>= %.1f sigma, tbin=%.3f sec, %s)" % (len(bursts),threshold,tbin,method))
+		for burst in bursts:
+			print("%.4f-%.4f peak %.1f cps (bkg %.1f cps) %.1f sigma at %g sec" % (burst['TSTART'],burst['TSTOP'],
+				burst['PEAK_RATE'],burst['BKG_RATE'],burst['SIGNIFICANCE'],burst['TBIN']))
+
+		if output_fitsfile == None:
+			output_fitsfile = '%s_burst_%s.fits' % (self.basename,suffix)
+		dict_keywords = {'DET_ID':self.hdu['EVENTS'].header.get('DET_ID',''),
+			'TBIN':tbin,'THRESH':threshold,'BKGWIN':bkg_window,'BKGGAP':bkg_gap,'METHOD':method,'PHASEL':str(selection)}
+		if timescales is not None:
+			dict_keywords['TSCALES'] = ','.join(['%g' % timescale for timescale in timescales])
+		fits.HDUList([fits.PrimaryHDU(),get_burst_hdu(bursts,dict_keywords)]).writeto(output_fitsfile,overwrite=True)
 
-		xlow = 0
-		xhigh = max(hist_lc.hist) * 1.2
-		nbins = round(xhigh)
-		hist_dist = Hist1D(nbins,xlow,xhigh)
-		hist_dist.fill(hist_lc.hist)
+		if plot:
+			outpdf = 'tmp_%s_curve_%s.pdf' % (self.basename,suffix)
+			fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))		
+			plt.step(*hist_lc.data)		
+			for burst in bursts:
+				plt.axvspan(burst['TSTART']-self.time[0],burst['TSTOP']-self.time[0],color='r',alpha=0.3)
+			plt.savefig(outpdf)	
 
-		outpdf = 'tmp_%s_curve_%s_dist.pdf' % (self.basename,suffix)
-		fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))		
-		plt.step(*hist_dist.data)		
-		plt.yscale('log')
-		plt.savefig(outpdf)	
+			xlow = 0
+			xhigh = max(hist_lc.hist) * 1.2
+			nbins = round(xhigh)
+			hist_dist = Hist1D(nbins,xlow,xhigh)
+			hist_dist.fill(hist_lc.hist)
+
+			outpdf = 'tmp_%s_curve_%s_dist.pdf' % (self.basename,suffix)
+			fig, ax = plt.subplots(1,1, figsize=(11.69,8.27))		
+			plt.step(*hist_dist.data)		
+			plt.yscale('log')
+			plt.savefig(outpdf)	
+
+		return bursts
 
 class EventRawcsvFile(EventFile):
 	"""Represents EventFile in the CSV format for a CoGamo detector.
 	:param file_path: path to a file to be opened
+	:param chunksize: if given, the csv file is not loaded at the initialization, 
+		but read and written in chunks of this number of lines (streaming mode).
+	:param backend: csv parser backend (see read_rawcsv_block)
 	"""
-	def __init__(self, file_path):
+	def __init__(self, file_path, chunksize=None, backend='auto'):
 		self.file_path = file_path
+		self.chunksize = chunksize
+		self.backend = backend
 
 		self.basename = os.path.splitext(os.path.basename(self.file_path))[0]
 
 		if not os.path.exists(self.file_path):
 			raise FileNotFoundError("{} not found".format(self.file_path))
-		try:
-			self.df = pd.read_csv(self.file_path, index_col=False, 
-				names=['minute','sec','decisec','pha'],
-				dtype={'minute':np.uintc,'sec':np.uintc,'decisec':np.uint16,'pha':np.uint16})
-			self.detid, self.yyyymmdd, self.hh = self.basename.split('_')
-		except OSError as e:
-			raise
-
 		self.format = 'rawcsv'
-		self.nevents = len(self.df)
+		if self.chunksize == None:
+			try:
+				self.df = self.read_csv()
+			except OSError as e:
+				raise
+			self.nevents = len(self.df)
+		else:
+			self.df = None 
+			self.nevents = None # counted while streaming
+		self.detid, self.yyyymmdd, self.hh = self.basename.split('_')
 
 		self.set_filename_property()
 
+	def read_csv(self, chunksize=None, buffer=None):
+		return read_rawcsv(self.file_path if buffer is None else buffer, event_csv_layout,
+			backend=self.backend, chunksize=chunksize)
+
+	def read_appended(self, offset=0, final=False):
+		"""
+		Returns (events, new offset) of the lines appended to a growing file 
+		after a byte offset (events is None if no line is appended). Only the complete lines (ending with a newline)
+		are parsed, unless final (the file is closed, e.g., the next hour 
+		file has started), so that a line being written is read at the next call.
+		"""
+		with open(self.file_path, 'rb') as fin:
+			fin.seek(offset)
+			data = fin.read()
+		if not final:
+			data = data[:data.rfind(b'\n') + 1]
+		if len(data.strip()) == 0:
+			return None, offset + len(data)
+		return self.read_csv(buffer=data), offset + len(data)
+
 	def set_filename_property(self):
 		self.detid_str, self.yyyymmdd_jst, self.hour_jst = os.path.splitext(os.path.basename(self.file_path))[0].split("_")		
 
 	def set_config_file(self,config_file):
 		self.config = ConfigFile(config_file)
 
-	def set_time_series(self):
+	def set_time_series(self,time_mode='numeric'):
 		"""
 		the standard unix time does not have enough accuracy below 1 second.
 		Sub-second time stamp is handled by another column
+		:param time_mode: 'numeric' (default) adds the minute, sec, and decisec
+			columns to the UTC epoch of the file hour; 'string' parses one ISO 
+			string per event with astropy (slow, kept as a reference).
+		"""
+		self.unixtime = self.get_unixtime(self.df,time_mode=time_mode)
+
+	def get_epoch_utc(self):
+		"""
+		Returns the unix time (UTC) of the beginning of the JST hour of the file.
 		"""
+		str_date = '%s-%s-%s' % (self.yyyymmdd_jst[0:4],self.yyyymmdd_jst[4:6],self.yyyymmdd_jst[6:8])
+		return float(get_unixtime_jst(str_date, '%02d:00:00' % int(self.hour_jst)))
+
+	def get_unixtime(self,df,time_mode='numeric'):
 		year = self.yyyymmdd_jst[0:4]
 		month = self.yyyymmdd_jst[4:6]
 		day = self.yyyymmdd_jst[6:8]		
 		str_time = '%04d-%02d-%02dT%02d:' % (int(year),int(month),int(day),int(self.hour_jst))
-		self.time_series_str  = np.char.array(np.full(self.nevents, str_time)) + np.char.mod('%02d:',self.df['minute']) + np.char.mod('%02d',self.df['sec']) + np.char.mod('.%04d',self.df['decisec']) 
-		time_series_jst = Time(self.time_series_str, format='isot', scale='utc', precision=5) 
-		self.time_series_utc = time_series_jst - timedelta(hours=+9)
+		if time_mode == 'numeric':
+			return self.get_epoch_utc() + (np.array(df['minute'],dtype=np.float64) * 60.0 
+				+ np.array(df['sec'],dtype=np.float64) 
+				+ np.array(df['decisec'],dtype=np.float64) / 10000.)
+		elif time_mode == 'string':
+			time_series_str  = np.char.array(np.full(len(df), str_time)) + np.char.mod('%02d:',df['minute']) + np.char.mod('%02d',df['sec']) + np.char.mod('.%04d',df['decisec']) 
+			time_series_jst = Time(time_series_str, format='isot', scale='utc', precision=5) 
+			time_series_utc = time_series_jst - timedelta(hours=+9)
+			return np.array(time_series_utc.unix)
+		else:
+			raise ValueError("time_mode must be 'numeric' or 'string': {}".format(time_mode))
+
+	def get_event_coldefs(self,time,unixtime,df):
+		column_time = fits.Column(name='TIME',format='D', unit='sec', array=time)
+		column_unixtime = fits.Column(name='unixtime',format='D', unit='sec', array=unixtime)
+		column_minute = fits.Column(name='minute',format='B', unit='minute', array=df['minute'])
+		column_sec = fits.Column(name='sec',format='B', unit='sec', array=df['sec'])
+		column_decisec = fits.Column(name='decisec',format='I', unit='100 microsec', array=df['decisec'])						
+		column_pha = fits.Column(name='pha',format='I', unit='channel', array=df['pha'])
+
+		return fits.ColDefs([column_time,column_unixtime,column_minute,column_sec,column_decisec,column_pha])
+
+	def get_compact_event_coldefs(self):
+		"""
+		Returns the (empty) columns of the compact profile. TIME is stored as 
+		32-bit integer ticks of 100 microsec from the start of the hour, which 
+		are converted to unixtime on reading with the TSCAL and TZERO keywords 
+		(see set_compact_event_header). pha is unsigned 16-bit. The unixtime, 
+		minute, sec, and decisec columns are derived from TIME, and not stored.
+		"""
+		column_time = fits.Column(name='TIME',format='J', unit='sec', array=np.array([],dtype=np.int32))
+		column_pha = fits.Column(name='pha',format='I', unit='chan', bzero=32768, array=np.array([],dtype=np.uint16))
+		return fits.ColDefs([column_time,column_pha])
+
+	def set_compact_event_header(self,header):
+		header.insert('TUNIT1',('TSCAL1',1e-4,'TIME tick (100 microsec)'),after=True)
+		header.insert('TSCAL1',('TZERO1',self.get_epoch_utc(),'TIME of tick 0 (TSTART)'),after=True)
+		header['comment'] = 'compact profile: TIME = TZERO1 + TSCAL1 * (stored integer ticks).'
+
+	def get_event_records(self,df,unixtime,record_dtype,profile='standard'):
+		"""
+		Returns the raw (big-endian) records of a chunk of events.
+		"""
+		records = np.empty(len(df), dtype=record_dtype)
+		if profile == 'compact':
+			# integer ticks directly from the csv columns, without rounding 
+			records['TIME'] = (np.array(df['minute'],dtype=np.int32) * 600000 
+				+ np.array(df['sec'],dtype=np.int32) * 10000 + np.array(df['decisec'],dtype=np.int32))
+			records['pha'] = (np.array(df['pha'],dtype=np.int32) - 32768).astype(np.int16)
+		elif profile == 'standard':
+			records['TIME'] = unixtime
+			records['unixtime'] = unixtime
+			records['minute'] = df['minute']
+			records['sec'] = df['sec']
+			records['decisec'] = df['decisec']
+			records['pha'] = df['pha']
+		else:
+			raise ValueError("profile must be 'standard' or 'compact': {}".format(profile))
+		return records
 
-	def write_to_fitsfile(self,output_fitsfile=None,config_file=None,flag_TIME=True):
+	def set_event_header(self,header,config_file=None):
+		dict_keywords = {
+			'DET_ID':[self.detid_str,'Detector_ID'],
+			'YYYYMMDD':[self.yyyymmdd_jst,'Year, month, and day in JST of the file'],			
+			'Hour':[self.hour_jst,'Hour in JST of the file'],
+			'TSTART':[self.get_epoch_utc(),'Start of the hour of the file (unixtime)'],
+			'TSTOP':[self.get_epoch_utc() + 3600.0,'Stop of the hour of the file (unixtime)']
+			}
+		for keyword in dict_keywords.keys():
+			header[keyword] = dict_keywords[keyword][0]
+			header.comments[keyword] = dict_keywords[keyword][1]
+
+		if config_file != None:
+			self.set_config_file(config_file)
+			for keyword in self.config.dict_keywords.keys():
+				header[keyword] = self.config.dict_keywords[keyword]
+
+		header['comment'] = 'unixtime is UTC, while minute, sec, decisec columns and the file name are JST.'
+		header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+
+	def write_to_fitsfile(self,output_fitsfile=None,config_file=None,flag_TIME=True,time_mode='numeric',
+		curve_pyramid=False,kev_per_channel=None,spectrum_tbin=60.0,profile='standard',compress=False):
 		"""
 		https://docs.astropy.org/en/stable/io/fits/usage/table.html
+		:param curve_pyramid: if True, the light-curve pyramid (see CurvePyramid) 
+			is also written next to the output file ([basename]_lc.fits). 
+		:param kev_per_channel: conversion of the AREABD thresholds to pha 
+			channels for the pyramid bands.
+		:param spectrum_tbin: slice width (sec) of the pha spectra written as 
+			the SPECTRUM extension (see PhaSpectrum), None for no extension.
+		:param profile: 'standard' (TIME, unixtime, minute, sec, decisec, pha) or
+			'compact' (TIME and pha only, see get_compact_event_coldefs).
+		:param compress: if True, the whole output file is gzip-compressed 
+			([output].gz), since astropy cannot tile-compress binary tables. The
+			.gz file cannot be memory-mapped (see EventFitsFile and open_raw_table).
 		"""
 		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
 
@@ -321,40 +2379,139 @@ class EventRawcsvFile(EventFile):
 			output_fitsfile = "{}.evt".format(self.basename)
 		elif os.path.exists(output_fitsfile):
 			raise FileExistsError("{} has alaredy existed.".format(output_fitsfile))
+		if compress and os.path.exists(output_fitsfile + '.gz'):
+			raise FileExistsError("{} has alaredy existed.".format(output_fitsfile + '.gz'))
+
+		if self.chunksize != None or profile == 'compact':
+			self.write_to_fitsfile_stream(output_fitsfile,config_file=config_file,time_mode=time_mode,
+				curve_pyramid=curve_pyramid,kev_per_channel=kev_per_channel,spectrum_tbin=spectrum_tbin,
+				profile=profile)
+			if compress:
+				gzip_file(output_fitsfile)
+			return 
+
+		self.set_time_series(time_mode=time_mode)
+
+		# unixtime already includes the sub-second (decisec) part
+		self.time = self.unixtime
 
-		self.set_time_series()
+		column_defs = self.get_event_coldefs(self.time,self.unixtime,self.df)
+		hdu = fits.BinTableHDU.from_columns(column_defs,name='EVENTS')
+		self.set_event_header(hdu.header,config_file=config_file)
+		hdus = [fits.PrimaryHDU(),hdu]
+		if spectrum_tbin != None:
+			spectrum = self.get_spectrum(spectrum_tbin)
+			spectrum.fill(self.time,self.df['pha'])
+			hdus.append(spectrum.get_hdu(dict_keywords={'DET_ID':self.detid_str}))
+		fits.HDUList(hdus).writeto(output_fitsfile)
+
+		if curve_pyramid:
+			pyramid = self.get_curve_pyramid(hdu.header,kev_per_channel=kev_per_channel)
+			pyramid.fill(self.time,self.df['pha'])
+			pyramid.writeto(CurvePyramid.get_sidecar_file(output_fitsfile),
+				dict_keywords={'DET_ID':self.detid_str})
+		if compress:
+			gzip_file(output_fitsfile)
+
+	def write_to_parquet(self,root_dir,config_file=None,time_mode='numeric',row_group_size=65536):
+		"""
+		Writes the same columns and header keywords as the fits file to 
+		[root_dir]/events/det_id=[DDD]/date=[YYYYMMDD]/[basename].parquet 
+		(see write_parquet). In the streaming mode, each chunk is a row group.
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		header = fits.Header()
+		self.set_event_header(header,config_file=config_file)
+		if self.chunksize == None:
+			self.set_time_series(time_mode=time_mode)
+			table = get_arrow_table(self.get_event_coldefs(self.unixtime,self.unixtime,self.df),header)
+			return write_parquet(table,'%s/events' % root_dir,self.detid_str,'TIME',self.basename,
+				row_group_size=row_group_size)
 
-		print(type(self.time_series_utc.unix))
-		print(type(self.df['decisec']))
-		self.time = np.array(self.time_series_utc.unix) + np.array(self.df['decisec']) /10000. 
+		# an hour file is within a JST date
+		pa = import_pyarrow()
+		output_file = get_parquet_path('%s/events' % root_dir,self.detid_str,self.yyyymmdd_jst,self.basename)
+		os.makedirs(os.path.dirname(output_file), exist_ok=True)
+		writer = None
+		self.nevents = 0
+		for df in self.read_csv(chunksize=self.chunksize):
+			unixtime = self.get_unixtime(df,time_mode=time_mode)
+			table = get_arrow_table(self.get_event_coldefs(unixtime,unixtime,df),header)
+			if writer == None:
+				writer = pa.parquet.ParquetWriter(output_file,table.schema)
+			writer.write_table(table,row_group_size=row_group_size)
+			self.nevents += len(df)
+		if writer != None:
+			writer.close()
+		return [output_file]
+
+	def get_curve_pyramid(self,header,kev_per_channel=None):
+		epoch_utc = self.get_epoch_utc()
+		return CurvePyramid(epoch_utc, epoch_utc + 3600.0, 
+			pha_edges=CurvePyramid.get_pha_edges(header,kev_per_channel=kev_per_channel))
 
-		column_time = fits.Column(name='TIME',format='D', unit='sec', array=self.time)
-		column_unixtime = fits.Column(name='unixtime',format='D', unit='sec', array=self.time_series_utc.unix)
-		column_minute = fits.Column(name='minute',format='B', unit='minute', array=self.df['minute'])
-		column_sec = fits.Column(name='sec',format='B', unit='sec', array=self.df['sec'])
-		column_decisec = fits.Column(name='decisec',format='I', unit='100 microsec', array=self.df['decisec'])						
-		column_pha = fits.Column(name='pha',format='I', unit='channel', array=self.df['pha'])
+	def get_spectrum(self,tbin):
+		epoch_utc = self.get_epoch_utc()
+		return PhaSpectrum(epoch_utc, epoch_utc + 3600.0, tbin=tbin)
 
-		column_defs = fits.ColDefs([column_time,column_unixtime,column_minute,column_sec,column_decisec,column_pha])
+	def write_to_fitsfile_stream(self,output_fitsfile,config_file=None,time_mode='numeric',
+		curve_pyramid=False,kev_per_channel=None,spectrum_tbin=60.0,profile='standard'):
+		"""
+		Streams the csv file into the EVENTS extension chunk by chunk, so that
+		the memory usage does not depend on the number of events. The header is
+		written first with NAXIS2 = 0, then the rows are appended as big-endian 
+		records, and finally the header is rewritten with the final NAXIS2. 
+		Without chunksize, the loaded csv file is written as a single chunk.
+		"""
+		if os.path.exists(output_fitsfile):
+			raise FileExistsError("{} has alaredy existed.".format(output_fitsfile))
+
+		if profile == 'compact':
+			column_defs = self.get_compact_event_coldefs()
+		else:
+			empty = {'minute':np.array([],dtype=np.uint8),'sec':np.array([],dtype=np.uint8),
+				'decisec':np.array([],dtype=np.uint16),'pha':np.array([],dtype=np.uint16)}
+			column_defs = self.get_event_coldefs(np.array([]),np.array([]),empty)
 		hdu = fits.BinTableHDU.from_columns(column_defs,name='EVENTS')
+		record_dtype = np.dtype([(name, hdu.data.dtype[name].newbyteorder('>')) for name in hdu.data.dtype.names])
+		if profile == 'compact':
+			self.set_compact_event_header(hdu.header)
+		self.set_event_header(hdu.header,config_file=config_file)
+		if curve_pyramid:
+			pyramid = self.get_curve_pyramid(hdu.header,kev_per_channel=kev_per_channel)
+		if spectrum_tbin != None:
+			spectrum = self.get_spectrum(spectrum_tbin)
+
+		self.nevents = 0
+		with open(output_fitsfile, 'wb') as fout:
+			fout.write(fits.PrimaryHDU().header.tostring().encode('ascii'))
+			header_offset = fout.tell()
+			fout.write(hdu.header.tostring().encode('ascii'))
+			chunks = [self.df] if self.chunksize == None else self.read_csv(chunksize=self.chunksize)
+			for df in chunks:
+				unixtime = self.get_unixtime(df,time_mode=time_mode)
+				records = self.get_event_records(df,unixtime,record_dtype,profile=profile)
+				fout.write(records.tobytes())
+				if curve_pyramid:
+					pyramid.fill(unixtime,df['pha'])
+				if spectrum_tbin != None:
+					spectrum.fill(unixtime,df['pha'])
+				self.nevents += len(df)
+			nbytes = self.nevents * record_dtype.itemsize
+			fout.write(b'\0' * ((2880 - nbytes % 2880) % 2880)) # FITS block size
 
-		dict_keywords = {
-			'DET_ID':[self.detid_str,'Detector_ID'],
-			'YYYYMMDD':[self.yyyymmdd_jst,'Year, month, and day in JST of the file'],			
-			'Hour':[self.hour_jst,'Hour in JST of the file']
-			}
-		for keyword in dict_keywords.keys():
-			hdu.header[keyword] = dict_keywords[keyword][0]
-			hdu.header.comments[keyword] = dict_keywords[keyword][1]
+			hdu.header['NAXIS2'] = self.nevents
+			fout.seek(header_offset)
+			fout.write(hdu.header.tostring().encode('ascii'))
 
-		if config_file != None:
-			self.set_config_file(config_file)
-			for keyword in self.config.dict_keywords.keys():
-				hdu.header[keyword] = self.config.dict_keywords[keyword]
+		if spectrum_tbin != None:
+			with fits.open(output_fitsfile, mode='append') as hdul:
+				hdul.append(spectrum.get_hdu(dict_keywords={'DET_ID':self.detid_str}))
 
-		hdu.header['comment'] = 'unixtime is UTC, while minute, sec, decisec columns and the file name are JST.'
-		hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
-		hdu.writeto(output_fitsfile)
+		if curve_pyramid:
+			pyramid.writeto(CurvePyramid.get_sidecar_file(output_fitsfile),
+				dict_keywords={'DET_ID':self.detid_str})
 
 class ConfigFile():
 	def __init__(self, file_path):
@@ -382,6 +2539,22 @@ class ConfigFile():
 # House Keeping File
 ##########################
 
+def get_hk_unixtime(df,time_mode='numeric'):
+	"""
+	Returns the unix time (UTC) of the yyyymmdd and hhmmss (JST) columns of 
+	house keeping data.
+	:param time_mode: 'numeric' (default) for get_unixtime_jst (int64), or 
+		'string' for the isot strings parsed with astropy (float64)
+	"""
+	if time_mode == 'numeric':
+		return get_unixtime_jst(np.asarray(df['yyyymmdd']), np.asarray(df['hhmmss']))
+	elif time_mode == 'string':
+		time_series_str = np.char.array(np.asarray(df['yyyymmdd'] + 'T' + df['hhmmss'], dtype=str))
+		time_series_jst = Time(time_series_str, format='isot', scale='utc', precision=5) 
+		return np.array((time_series_jst - timedelta(hours=+9)).unix)
+	else:
+		raise ValueError("time_mode must be 'numeric' or 'string': {}".format(time_mode))
+
 class HouseKeepingFile(object):
 	def __init__(self):
 		self.nlines = 0
@@ -397,7 +2570,11 @@ class HouseKeepingFile(object):
 		return dump
 
 class HousekeepingRawcsvFile():
-	def __init__(self,file_path):
+	"""Represents a raw csv-format house keeping file (DDD_YYYYMMDD.csv).
+	:param file_path: path to a file to be opened
+	:param backend: csv parser backend (see read_rawcsv_block)
+	"""
+	def __init__(self,file_path,backend='auto'):
 		self.file_path = file_path
 
 		self.basename = os.path.splitext(os.path.basename(self.file_path))[0]
@@ -405,9 +2582,7 @@ class HousekeepingRawcsvFile():
 		if not os.path.exists(self.file_path):
 			raise FileNotFoundError("{} not found".format(self.file_path))
 		try:
-			self.df = pd.read_csv(self.file_path, index_col=False, 
-				names=['yyyymmdd','hhmmss','interval','rate1','rate2','rate3','rate4','rate5','rate6','temperature','pressure','humidity','differential','lux','gps_status','longitude','latitude'],
-				dtype={'yyyymmdd':np.object,'hhmmss':np.object,'interval':np.int,'rate1':np.float64,'rate2':np.float64,'rate3':np.float64,'rate4':np.float64,'rate5':np.float64,'rate6':np.float64,'temperature':np.float64,'pressure':np.float64,'humidity':np.float64,'differential':np.float64,'lux':np.float64,'gps_status':np.int8,'longitude':np.float64,'latitude':np.float64})
+			self.df = read_rawcsv(self.file_path, hk_csv_layout, backend=backend)
 			self.detid, self.yyyymmdd= self.basename.split('_')
 		except OSError as e:
 			raise
@@ -423,16 +2598,16 @@ class HousekeepingRawcsvFile():
 	def set_config_file(self,config_file):
 		self.config = ConfigFile(config_file)
 
-	def set_time_series(self):
+	def set_time_series(self,time_mode='numeric'):
 		"""
-		the standard unix time does not have enough accuracy below 1 second.
-		Sub-second time stamp is handled by another column
+		Sets the unix time (UTC) of the JST date and time columns.
+		:param time_mode: 'numeric' (default) converts the columns with 
+			get_unixtime_jst; 'string' parses isot strings with astropy (slow, 
+			kept as a reference).
 		"""
-		self.time_series_str  = np.char.array(self.df['yyyymmdd'] + 'T' + self.df['hhmmss'])
-		time_series_jst = Time(self.time_series_str, format='isot', scale='utc', precision=5) 
-		self.time_series_utc = time_series_jst - timedelta(hours=+9)
+		self.unixtime = get_hk_unixtime(self.df,time_mode=time_mode)
 
-	def write_to_fitsfile(self,output_fitsfile=None,config_file=None):
+	def write_to_fitsfile(self,output_fitsfile=None,config_file=None,time_mode='numeric'):
 		"""
 		https://docs.astropy.org/en/stable/io/fits/usage/table.html
 		"""
@@ -443,11 +2618,16 @@ class HousekeepingRawcsvFile():
 		elif os.path.exists(output_fitsfile):
 			raise FileExistsError("{} has alaredy existed.".format(output_fitsfile))
 
-		self.set_time_series()
+		hdu = fits.BinTableHDU.from_columns(self.get_hk_coldefs(time_mode=time_mode),name='HK')
+		self.set_hk_header(hdu.header,config_file=config_file)
+		hdu.writeto(output_fitsfile)
+
+	def get_hk_coldefs(self,time_mode='numeric'):
+		self.set_time_series(time_mode=time_mode)
 
 		column_yyyymmdd = fits.Column(name='YYYYMMDD',format='10A', unit='JST', array=np.char.array(self.df['yyyymmdd']))
 		column_hhmmss = fits.Column(name='HHMMSS',format='8A', unit='JST', array=np.char.array(self.df['hhmmss']))
-		column_unixtime = fits.Column(name='Unixtime',format='D', unit='sec', array=self.time_series_utc.unix)
+		column_unixtime = fits.Column(name='Unixtime',format='D', unit='sec', array=self.unixtime)
 		column_interval = fits.Column(name='Interval',format='I', unit='sec', array=self.df['interval'])
 		column_rate1 = fits.Column(name='Rate1',format='D', unit='count/s', array=self.df['rate1'])
 		column_rate2 = fits.Column(name='Rate2',format='D', unit='count/s', array=self.df['rate2'])
@@ -464,42 +2644,68 @@ class HousekeepingRawcsvFile():
 		column_longitude = fits.Column(name='Longitude',format='D', unit='deg', array=self.df['longitude'])		
 		column_latitude = fits.Column(name='Latitude',format='D', unit='deg', array=self.df['latitude'])			
 
-		column_defs = fits.ColDefs([column_yyyymmdd,column_hhmmss,column_unixtime,column_interval,column_rate1,column_rate2,column_rate3,column_rate4,column_rate5,column_rate6,column_temperature,column_pressure,column_humidity,column_differential,column_lux,column_gps_status,column_longitude,column_latitude])
-		hdu = fits.BinTableHDU.from_columns(column_defs,name='HK')
+		return fits.ColDefs([column_yyyymmdd,column_hhmmss,column_unixtime,column_interval,column_rate1,column_rate2,column_rate3,column_rate4,column_rate5,column_rate6,column_temperature,column_pressure,column_humidity,column_differential,column_lux,column_gps_status,column_longitude,column_latitude])
 
+	def set_hk_header(self,header,config_file=None):
 		dict_keywords = {
 			'DET_ID':[self.detid_str,'Detector_ID'],
 			'YYYYMMDD':[self.yyyymmdd_jst,'Year, month, and day in JST of the file']}
 		for keyword in dict_keywords.keys():
-			hdu.header[keyword] = dict_keywords[keyword][0]
-			hdu.header.comments[keyword] = dict_keywords[keyword][1]
+			header[keyword] = dict_keywords[keyword][0]
+			header.comments[keyword] = dict_keywords[keyword][1]
 
 		if config_file != None:
 			self.set_config_file(config_file)
 			for keyword in self.config.dict_keywords.keys():
-				hdu.header[keyword] = self.config.dict_keywords[keyword]
+				header[keyword] = self.config.dict_keywords[keyword]
 
-		hdu.header['comment'] = 'unixtime is UTC, while yyyymmddTHH:MM:SS column and the file name are JST.'
-		hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
-		hdu.writeto(output_fitsfile)
+		header['comment'] = 'unixtime is UTC, while yyyymmddTHH:MM:SS column and the file name are JST.'
+		header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+
+	def write_to_parquet(self,root_dir,config_file=None):
+		"""
+		Writes the same columns and header keywords as the fits file to 
+		[root_dir]/hk/det_id=[DDD]/date=[YYYYMMDD]/[basename].parquet (see write_parquet).
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		column_defs = self.get_hk_coldefs()
+		header = fits.Header()
+		self.set_hk_header(header,config_file=config_file)
+		return write_parquet(get_arrow_table(column_defs,header),'%s/hk' % root_dir,
+			self.detid_str,'Unixtime',self.basename)
 
 class HousekeepingRemoteFile():
-	def __init__(self,file_path):
+	"""Represents a remote csv-format house keeping file downloaded from the server.
+	:param file_path: path to the file (cgmDDD_rhk_YYMMDDTHHMMSS_YYMMDDTHHMMSS.csv)
+	:param buffer: file-like object of the csv content (e.g., a downloaded 
+		response), which is parsed instead of the file. The file_path is 
+		then used only for the file name properties. 
+	"""
+	def __init__(self,file_path,buffer=None):
 		sys.stdout.write('----- HousekeepingRemoteFile -----\n')
 
 		self.file_path = file_path
 
 		self.basename = os.path.splitext(os.path.basename(self.file_path))[0]
 
-		if not os.path.exists(self.file_path):
+		if buffer is not None:
+			self.df = pd.read_csv(buffer, index_col=False)
+		elif not os.path.exists(self.file_path):
 			raise FileNotFoundError("{} not found".format(self.file_path))
-		try:
-			self.df = pd.read_csv(self.file_path, index_col=False)
-		except OSError as e:
-			raise
-		yyyymmdd_hhmmss = self.df['time'].str.split(" ",n=1,expand=True)
-		self.df['yyyymmdd'] = yyyymmdd_hhmmss[0]
-		self.df['hhmmss'] = yyyymmdd_hhmmss[1]
+		else:
+			try:
+				self.df = pd.read_csv(self.file_path, index_col=False)
+			except OSError as e:
+				raise
+		if len(self.df) > 0:
+			yyyymmdd_hhmmss = self.df['time'].str.split(" ",n=1,expand=True)
+			self.df['yyyymmdd'] = yyyymmdd_hhmmss[0]
+			self.df['hhmmss'] = yyyymmdd_hhmmss[1]
+		else:
+			# a response without rows (header only)
+			self.df['yyyymmdd'] = ''
+			self.df['hhmmss'] = ''
 
 		self.format = 'remotecsv'
 		self.nlines = len(self.df)
@@ -519,17 +2725,17 @@ class HousekeepingRemoteFile():
 
 		self.detid_str = os.path.basename(self.file_path)[3:6]
 
-	def set_time_series(self):
+	def set_time_series(self,time_mode='numeric'):
 		"""
-		the standard unix time does not have enough accuracy below 1 second.
-		Sub-second time stamp is handled by another column
+		Sets the unix time (UTC) of the JST date and time columns.
+		:param time_mode: 'numeric' (default) converts the columns with 
+			get_unixtime_jst; 'string' parses isot strings with astropy (slow, 
+			kept as a reference).
 		"""
-		self.time_series_str  = np.char.array(self.df['yyyymmdd'] + 'T' + self.df['hhmmss'])
-		time_series_jst = Time(self.time_series_str, format='isot', scale='utc', precision=5) 
-		self.time_series_utc = time_series_jst - timedelta(hours=+9)
-		self.df['interval'] = np.insert(np.diff(self.time_series_utc.unix),0,np.nan)
+		self.unixtime = get_hk_unixtime(self.df,time_mode=time_mode)
+		self.df['interval'] = np.insert(np.diff(self.unixtime.astype(np.float64)),0,np.nan)
 
-	def write_to_fitsfile(self,output_fitsfile=None):
+	def write_to_fitsfile(self,output_fitsfile=None,time_mode='numeric'):
 		"""
 		https://docs.astropy.org/en/stable/io/fits/usage/table.html
 		"""
@@ -540,11 +2746,16 @@ class HousekeepingRemoteFile():
 		elif os.path.exists(output_fitsfile):
 			raise FileExistsError("{} has alaredy existed.".format(output_fitsfile))
 
-		self.set_time_series()
+		hdu = fits.BinTableHDU.from_columns(self.get_hk_coldefs(time_mode=time_mode),name='HK')
+		self.set_hk_header(hdu.header)
+		hdu.writeto(output_fitsfile)
+
+	def get_hk_coldefs(self,time_mode='numeric'):
+		self.set_time_series(time_mode=time_mode)
 
 		column_yyyymmdd = fits.Column(name='YYYYMMDD',format='10A', unit='JST', array=np.char.array(self.df['yyyymmdd']))
 		column_hhmmss = fits.Column(name='HHMMSS',format='8A', unit='JST', array=np.char.array(self.df['hhmmss']))
-		column_unixtime = fits.Column(name='Unixtime',format='D', unit='sec', array=self.time_series_utc.unix)
+		column_unixtime = fits.Column(name='Unixtime',format='D', unit='sec', array=self.unixtime)
 		column_interval = fits.Column(name='Interval',format='I', unit='sec', array=self.df['interval'])
 		column_rate1 = fits.Column(name='Rate1',format='D', unit='count/s', array=self.df['area1'])
 		column_rate2 = fits.Column(name='Rate2',format='D', unit='count/s', array=self.df['area2'])
@@ -561,9 +2772,9 @@ class HousekeepingRemoteFile():
 		column_longitude = fits.Column(name='Longitude',format='D', unit='deg', array=self.df['longitude'])		
 		column_latitude = fits.Column(name='Latitude',format='D', unit='deg', array=self.df['latitude'])			
 
-		column_defs = fits.ColDefs([column_yyyymmdd,column_hhmmss,column_unixtime,column_interval,column_rate1,column_rate2,column_rate3,column_rate4,column_rate5,column_rate6,column_temperature,column_pressure,column_humidity,column_differential,column_lux,column_gps_status,column_longitude,column_latitude])
-		hdu = fits.BinTableHDU.from_columns(column_defs,name='HK')
+		return fits.ColDefs([column_yyyymmdd,column_hhmmss,column_unixtime,column_interval,column_rate1,column_rate2,column_rate3,column_rate4,column_rate5,column_rate6,column_temperature,column_pressure,column_humidity,column_differential,column_lux,column_gps_status,column_longitude,column_latitude])
 
+	def set_hk_header(self,header):
 		dict_keywords = {
 			'DET_ID':[self.detid_str,'Detector_ID'],
 			'INTERVAL':[int(np.mean(self.df['interval'][1:-1])),'Interval (sec)'],
@@ -574,17 +2785,29 @@ class HousekeepingRemoteFile():
 			'AREABD5':[0.0,'Not defined.'],									
 			'AREABD6':[0.0,'Not defined.']}
 		for keyword in dict_keywords.keys():
-			hdu.header[keyword] = dict_keywords[keyword][0]
-			hdu.header.comments[keyword] = dict_keywords[keyword][1]
+			header[keyword] = dict_keywords[keyword][0]
+			header.comments[keyword] = dict_keywords[keyword][1]
 
 		#if config_file != None:
 		#	self.set_config_file(config_file)
 		#	for keyword in self.config.dict_keywords.keys():
-		#		hdu.header[keyword] = self.config.dict_keywords[keyword]
+		#		header[keyword] = self.config.dict_keywords[keyword]
 
-		hdu.header['comment'] = 'unixtime is UTC, while yyyymmddTHH:MM:SS column and the file name are JST.'
-		hdu.header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
-		hdu.writeto(output_fitsfile)
+		header['comment'] = 'unixtime is UTC, while yyyymmddTHH:MM:SS column and the file name are JST.'
+		header['history'] = 'created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+
+	def write_to_parquet(self,root_dir):
+		"""
+		Writes the same columns and header keywords as the fits file to 
+		[root_dir]/hk/det_id=[DDD]/date=[YYYYMMDD]/[basename].parquet (see write_parquet).
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		column_defs = self.get_hk_coldefs()
+		header = fits.Header()
+		self.set_hk_header(header)
+		return write_parquet(get_arrow_table(column_defs,header),'%s/hk' % root_dir,
+			self.detid_str,'Unixtime',self.basename)
 
 class HousekeepingFitsFile():
 	def __init__(self,file_path):
@@ -600,7 +2823,14 @@ class HousekeepingFitsFile():
 			raise
 
 		self.format = 'fits'
-		self.nlines = len(self.hdu['HK'].data)
+		self.nlines = self.hdu['HK'].header['NAXIS2']
+
+	def read_time_range(self,tstart=None,tstop=None):
+		"""
+		Returns the rows with tstart <= Unixtime <= tstop as a record array 
+		(see EventFitsFile.read_time_range).
+		"""
+		return read_raw_time_range(self.file_path,'HK','Unixtime',tstart,tstop)
 
 	def plot(self):
 		data = self.hdu['HK'].data
@@ -667,15 +2897,1202 @@ class HousekeepingFitsFile():
 		plt.rcParams["mathtext.fontset"] = "dejavuserif"		
 		plt.savefig(outpdf)
 
+##########################
+# Live monitor
+##########################
+
+class LiveMonitor(object):
+	"""Follows the growing raw csv-format event files of a detector 
+	([data_dir]/[DDD]_[YYYYMMDD]_[HH].csv) in near real time. Each poll parses
+	only the bytes appended since the last poll, adds the selected events to
+	a running light curve in absolute time bins, and evaluates the bins 
+	completed since the last poll. When the file of the next hour appears, 
+	the rest of the current file is read and the monitor rolls over to it; 
+	as the bins are absolute, the light curve and the trigger continue across 
+	the hours. Unlike search_bursts, the background of a bin is taken only 
+	from the past (bkg_window before the bin, separated by bkg_gap), since 
+	the future bins are not known yet.
+	:param data_dir: directory of the raw csv-format event files
+	:param det_id: detector ID (e.g., '011')
+	:param tbin: bin width (sec)
+	:param threshold: significance threshold (sigma)
+	:param callback: function called with (kind, burst record) at the 
+		'start' and 'end' of a burst (e.g., to send an alert)
+	"""
+	def __init__(self, data_dir, det_id, tbin=1.0, pha_min=None, pha_max=None, 
+		threshold=5.0, bkg_window=60.0, bkg_gap=10.0, method='lima', callback=None):
+		self.data_dir = data_dir
+		self.det_id = '%03d' % int(det_id)
+		self.tbin = tbin
+		self.selection = EventSelection(pha_min=pha_min, pha_max=pha_max)
+		self.threshold = threshold
+		self.nwin = max(int(round(bkg_window / tbin)), 1)
+		self.ngap = int(round(bkg_gap / tbin))
+		self.method = method
+		self.callback = callback
+
+		self.file = None
+		self.offset = 0
+		self.nevents = 0
+		self.counts = np.zeros(0, dtype=np.float64) # running light curve
+		self.first_bin = None # absolute bin index (unixtime / tbin) of counts[0]
+		self.last_time = None # latest event time
+		self.nlate = 0 # late events dropped before first_bin
+		self.ncompleted = 0 # bins of counts already evaluated
+		self.burst = None # ongoing burst (burst_dtype record)
+		self.bursts = []
+
+	def get_file_paths(self):
+		pattern = r'%s_\d{8}_\d{2}.csv' % self.det_id
+		return ['%s/%s' % (self.data_dir, name) for name in sorted(os.listdir(self.data_dir))
+			if re.fullmatch(pattern, name)]
+
+	def poll(self):
+		"""
+		Reads the lines appended since the last poll (rolling over to the 
+		next hour files), and updates the light curve and the trigger.
+		:returns: number of new events
+		"""
+		file_paths = self.get_file_paths()
+		if len(file_paths) == 0:
+			return 0
+		if self.file == None:
+			self.open(file_paths[-1])
+		nevents = 0
+		while True:
+			next_files = [file_path for file_path in file_paths 
+				if os.path.basename(file_path) > os.path.basename(self.file.file_path)]
+			df, self.offset = self.file.read_appended(self.offset, final=len(next_files) > 0)
+			if df is not None:
+				nevents += len(df)
+				self.add_events(self.file.get_unixtime(df), np.array(df['pha']))
+			if len(next_files) == 0:
+				break
+			print("%s: %d events, roll over to %s" % (self.file.file_path, self.nevents, next_files[0]))
+			self.open(next_files[0])
+		if nevents > 0:
+			self.evaluate()
+		return nevents
+
+	def open(self, file_path):
+		self.file = EventRawcsvFile(file_path, chunksize=1)
+		self.offset = 0
+		self.nevents = 0
+
+	def add_events(self, time, pha):
+		"""
+		Adds events to the running light curve. Late events (e.g., reordered 
+		lines) before the first bin kept in memory cannot be added any more; 
+		they are dropped and counted in self.nlate.
+		"""
+		self.nevents += len(time)
+		if len(time) == 0:
+			return
+		self.last_time = max(np.max(time), self.last_time) if self.last_time != None else np.max(time)
+		time = time[self.selection.get_mask(time, pha)]
+		if len(time) == 0:
+			return
+		bins = np.floor(time / self.tbin).astype(np.int64)
+		if self.first_bin == None:
+			self.first_bin = np.min(bins)
+		is_late = bins < self.first_bin
+		if np.any(is_late):
+			self.nlate += np.count_nonzero(is_late)
+			print("%d late events before %.3f dropped (%d in total)" % (
+				np.count_nonzero(is_late), self.first_bin * self.tbin, self.nlate))
+			bins = bins[~is_late]
+			if len(bins) == 0:
+				return
+		nbins = np.max(bins) - self.first_bin + 1
+		if nbins > len(self.counts):
+			self.counts = np.concatenate([self.counts, np.zeros(nbins - len(self.counts))])
+		self.counts += np.bincount(bins - self.first_bin, minlength=len(self.counts))
+
+	def evaluate(self):
+		"""
+		Evaluates the bins completed since the last call (before the bin of 
+		the last event) against the past background, and updates the burst state.
+		"""
+		if self.first_bin == None:
+			return
+		ncompleted = int(np.floor(self.last_time / self.tbin)) - self.first_bin
+		ncompleted = min(max(ncompleted, 0), len(self.counts))
+		if ncompleted <= self.ncompleted:
+			return
+		index = np.arange(self.ncompleted, ncompleted)
+		cumsum = np.concatenate([[0.0], np.cumsum(self.counts)])
+		off_low = np.clip(index - self.ngap - self.nwin, 0, None)
+		off_high = np.clip(index - self.ngap, 0, None)
+		n_off = cumsum[off_high] - cumsum[off_low]
+		nbins_off = (off_high - off_low).astype(np.float64)
+		alpha = np.divide(1.0, nbins_off, out=np.zeros_like(nbins_off), where=nbins_off > 0)
+		n_on = self.counts[index]
+		significance = get_significance(n_on, n_off, alpha, method=self.method)
+		significance[nbins_off < self.nwin] = 0.0 # background not accumulated yet
+
+		starts, stops, peaks, maxima = get_run_maxima(significance, significance >= self.threshold)
+		if self.burst is not None and (len(starts) == 0 or starts[0] > 0):
+			self.end_burst()
+		for start, stop, peak, maximum in zip(starts, stops, peaks, maxima):
+			if start > 0 and self.burst is not None:
+				self.end_burst()
+			burst = np.zeros(1, dtype=burst_dtype)[0]
+			burst['TSTART'] = (self.first_bin + index[start]) * self.tbin
+			burst['TSTOP'] = (self.first_bin + index[stop - 1] + 1) * self.tbin
+			burst['PEAK_TIME'] = (self.first_bin + index[peak] + 0.5) * self.tbin
+			burst['PEAK_RATE'] = n_on[peak] / self.tbin
+			burst['BKG_RATE'] = alpha[peak] * n_off[peak] / self.tbin
+			burst['SIGNIFICANCE'] = maximum
+			burst['TBIN'] = self.tbin
+			if self.burst is None:
+				self.burst = burst
+				self.alert('start')
+			else: 
+				# the ongoing burst continues 
+				self.burst['TSTOP'] = burst['TSTOP']
+				if burst['SIGNIFICANCE'] > self.burst['SIGNIFICANCE']:
+					for name in ['PEAK_TIME','PEAK_RATE','BKG_RATE','SIGNIFICANCE']:
+						self.burst[name] = burst[name]
+			if stop < len(index):
+				self.end_burst()
+		self.ncompleted = ncompleted
+
+		# keep the bins needed for the background of the next bins
+		ndrop = self.ncompleted - self.ngap - self.nwin
+		if ndrop > 0:
+			self.counts = self.counts[ndrop:]
+			self.first_bin += ndrop
+			self.ncompleted -= ndrop
+
+	def end_burst(self):
+		self.bursts.append(self.burst)
+		self.alert('end')
+		self.burst = None
+
+	def alert(self, kind):
+		import time
+		burst = self.burst
+		print("[%s] DET_ID=%s burst %s: %.3f-%.3f peak %.1f cps (bkg %.1f cps) %.1f sigma (latency %.1f sec)" % (
+			Time(burst['TSTART'], format='unix').to_datetime(timezone=tz_tokyo).strftime('%Y-%m-%d %H:%M:%S'),
+			self.det_id, kind, burst['TSTART'], burst['TSTOP'], burst['PEAK_RATE'], burst['BKG_RATE'], 
+			burst['SIGNIFICANCE'], time.time() - burst['TSTOP']))
+		if self.callback is not None:
+			self.callback(kind, burst)
+
+	def get_curve(self):
+		"""
+		Returns (bin start times, counts) of the running light curve kept in memory.
+		"""
+		if self.first_bin == None:
+			return np.zeros(0), np.zeros(0)
+		return (self.first_bin + np.arange(len(self.counts))) * self.tbin, self.counts.copy()
+
+	def get_bursts(self):
+		if len(self.bursts) == 0:
+			return np.zeros(0, dtype=burst_dtype)
+		return np.array(self.bursts, dtype=burst_dtype)
+
+##########################
+# Remote house keeping download
+##########################
+
+remotehk_server_url = 'http://demo1.tacinc.jp/api/sensor/csv/'
+
+def get_remotehk_filename(cgm_id, start, end):
+	"""
+	Returns the file name cgmDDD_rhk_YYMMDDTHHMMSS_YYMMDDTHHMMSS.csv of a 
+	detector and a time range (JST, e.g., 2021-05-25T00:00:00).
+	"""
+	return 'cgm%03d_rhk_%s_%s.csv' % (int(cgm_id),
+		start.replace('-','').replace(':','')[2:15], end.replace('-','').replace(':','')[2:15])
+
+def get_day_ranges(start, end):
+	"""
+	Splits a time range (JST, e.g., 2021-05-25T00:00:00) into ranges per day,
+	[(start, 23:59:59), (00:00:00, 23:59:59), ..., (00:00:00, end)].
+	"""
+	import datetime
+	dt_start = datetime.datetime.fromisoformat(start)
+	dt_end = datetime.datetime.fromisoformat(end)
+	ranges = []
+	while dt_start <= dt_end:
+		dt_next = datetime.datetime.combine(dt_start.date() + timedelta(days=1), datetime.time())
+		dt_stop = min(dt_next - timedelta(seconds=1), dt_end)
+		ranges.append((dt_start.isoformat(), dt_stop.isoformat()))
+		dt_start = dt_next
+	return ranges
+
+def get_resume_start(body):
+	"""
+	Returns (complete part, resume start time) of a partially received csv
+	response: the complete rows are kept, and the remaining range starts 
+	one second after the last complete row. None if no row is complete.
+	"""
+	complete = bytes(body[:body.rfind(b'\n') + 1])
+	lines = complete.splitlines()
+	if len(lines) < 2:
+		return b'', None
+	import datetime
+	last_time = lines[-1].split(b',')[0].strip(b'"').decode()
+	dt_resume = datetime.datetime.fromisoformat(last_time) + timedelta(seconds=1)
+	return complete, dt_resume.isoformat()
+
+class RemoteHousekeepingDownloader(object):
+	"""Asynchronous downloader of the remote house keeping data of many 
+	detectors and days at once (asyncio, standard library only). The HTTP/1.1
+	connections are kept alive in a pool per server, and at most 
+	max_connections requests run concurrently. A failed request is retried 
+	with an exponential backoff, and a response broken in the middle is 
+	resumed after its last complete row. The responses are kept in memory 
+	and parsed without temporary files. The body of each response is read 
+	completely before it is parsed (the resumption needs the last complete
+	row), so that the csv contents of all the detectors and days are held in
+	memory until download() returns, about 31 kB per detector and day at
+	the 5-min interval, plus the DataFrame built from them.
+	:param server_url: url of the csv api
+	:param passcode: passcode of the server (COGAMO_SERVER_PASSCODE)
+	:param max_connections: maximum number of concurrent requests
+	:param retries: maximum number of retries of a request
+	:param backoff: wait (sec) before the first retry, doubled at each retry
+	:param timeout: timeout (sec) of a connection or a read
+	"""
+	def __init__(self, server_url=remotehk_server_url, passcode=None, 
+		max_connections=4, retries=3, backoff=1.0, timeout=60.0):
+		self.server_url = server_url
+		self.passcode = passcode
+		self.max_connections = max_connections
+		self.retries = retries
+		self.backoff = backoff
+		self.timeout = timeout
+		self.idle_connections = {}
+		self.nrequests = 0
+
+	def get_url(self, cgm_id, start, end):
+		import urllib.parse
+		query = urllib.parse.urlencode({'sname':cgm_id, 
+			'start_datetime':start.replace('T',' '), 'end_datetime':end.replace('T',' '),
+			'k':self.passcode}, quote_via=urllib.parse.quote)
+		return '%s?%s' % (self.server_url, query)
+
+	def get_connection_key(self, url):
+		"""
+		Returns the key (host, port, scheme) of the keep-alive connection pool, 
+		so that a connection is reused only for the same server.
+		"""
+		import urllib.parse
+		parsed = urllib.parse.urlsplit(url)
+		port = parsed.port
+		if port == None:
+			port = 443 if parsed.scheme == 'https' else 80
+		return (parsed.hostname, port, parsed.scheme)
+
+	async def open_connection(self, url):
+		import asyncio
+		host, port, scheme = key = self.get_connection_key(url)
+		idle = self.idle_connections.get(key, [])
+		while len(idle) > 0:
+			reader, writer = idle.pop()
+			if not reader.at_eof() and not writer.is_closing():
+				return reader, writer
+			writer.close()
+		return await asyncio.wait_for(asyncio.open_connection(host, port,
+			ssl=(scheme == 'https')), self.timeout)
+
+	async def get(self, url, body):
+		"""
+		Sends a GET request and appends the response body to body (bytearray),
+		so that the received part is kept if the connection breaks.
+		"""
+		import asyncio
+		import urllib.parse
+		parsed = urllib.parse.urlsplit(url)
+		reader, writer = await self.open_connection(url)
+		self.nrequests += 1
+		try:
+			writer.write(('GET %s?%s HTTP/1.1\r\nHost: %s\r\nConnection: keep-alive\r\n\r\n' % (
+				parsed.path, parsed.query, parsed.netloc)).encode('ascii'))
+			await writer.drain()
+			status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+			if len(status_line) == 0:
+				raise ConnectionError("connection closed by the server")
+			status = int(status_line.split()[1])
+			headers = {}
+			while True:
+				line = await asyncio.wait_for(reader.readline(), self.timeout)
+				if line in (b'\r\n', b'\n', b''):
+					break
+				key, value = line.decode('latin-1').split(':', 1)
+				headers[key.strip().lower()] = value.strip()
+			if status != 200:
+				# the error body is read to keep the connection usable
+				await self.read_body(reader, headers, bytearray())
+				raise ConnectionError("HTTP status %d: %s" % (status, url))
+			keep_alive = await self.read_body(reader, headers, body)
+		except BaseException:
+			writer.close()
+			raise
+		if keep_alive and headers.get('connection', '').lower() != 'close':
+			self.idle_connections.setdefault(self.get_connection_key(url), []).append((reader, writer))
+		else:
+			writer.close()
+
+	async def read_body(self, reader, headers, body):
+		"""
+		Reads the body (chunked, Content-Length, or until the end of the 
+		connection). Returns False if the connection cannot be reused.
+		"""
+		import asyncio
+		try:
+			if headers.get('transfer-encoding', '').lower() == 'chunked':
+				while True:
+					size = int((await asyncio.wait_for(reader.readline(), self.timeout)).split(b';')[0], 16)
+					if size == 0:
+						await reader.readline()
+						return True
+					body += await asyncio.wait_for(reader.readexactly(size), self.timeout)
+					await reader.readline()
+			elif 'content-length' in headers:
+				body += await asyncio.wait_for(reader.readexactly(int(headers['content-length'])), self.timeout)
+				return True
+			else:
+				while True:
+					data = await asyncio.wait_for(reader.read(65536), self.timeout)
+					if len(data) == 0:
+						return False
+					body += data
+		except asyncio.IncompleteReadError as e:
+			body += e.partial
+			raise
+
+	async def download_range(self, semaphore, cgm_id, start, end):
+		"""
+		Returns the csv content (bytes) of a detector and a time range, with 
+		retries and resumption after the last complete row.
+		"""
+		import asyncio
+		received = b''
+		for attempt in range(self.retries + 1):
+			body = bytearray()
+			try:
+				async with semaphore:
+					await self.get(self.get_url(cgm_id, start, end), body)
+				if len(received) > 0:
+					# skip the csv header of the resumed response
+					body = body[body.find(b'\n') + 1:]
+				return received + bytes(body)
+			except (OSError, ConnectionError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+				complete, resume_start = get_resume_start(body)
+				if resume_start != None:
+					if len(received) > 0:
+						complete = complete[complete.find(b'\n') + 1:]
+					received += complete
+					start = resume_start
+				if attempt == self.retries:
+					raise
+				wait = self.backoff * 2**attempt
+				print("cgm%03d %s--%s: %s, retry in %.1f sec" % (int(cgm_id), start, end, e, wait))
+				await asyncio.sleep(wait)
+
+	async def download_async(self, cgm_ids, start, end):
+		import asyncio
+		semaphore = asyncio.Semaphore(self.max_connections)
+		tasks = {}
+		for cgm_id in cgm_ids:
+			tasks[cgm_id] = [asyncio.ensure_future(self.download_range(semaphore, cgm_id, day_start, day_end))
+				for day_start, day_end in get_day_ranges(start, end)]
+		try:
+			contents = {}
+			for cgm_id in cgm_ids:
+				bodies = await asyncio.gather(*tasks[cgm_id])
+				contents[cgm_id] = bodies[0] + b''.join([body[body.find(b'\n') + 1:] for body in bodies[1:]])
+			return contents
+		finally:
+			for connections in self.idle_connections.values():
+				for reader, writer in connections:
+					writer.close()
+			self.idle_connections = {}
+
+	def download(self, cgm_ids, start, end):
+		"""
+		Downloads the csv contents of detectors for a time range (JST, e.g., 
+		2021-05-25T00:00:00), requested per day concurrently.
+		:returns: dictionary {cgm_id: csv content (bytes) with a header line}
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+		import asyncio
+		return asyncio.run(self.download_async(cgm_ids, start, end))
+
+##########################
+# Raw fits tables
+##########################
+
+def get_record_dtype(column_defs):
+	"""
+	Returns the big-endian record dtype of the binary table rows on disk.
+	"""
+	dtype = column_defs.dtype
+	return np.dtype([(name, dtype[name].newbyteorder('>')) for name in dtype.names])
+
+def open_raw_table(file_path, extname, mode='r'):
+	"""
+	Returns (header, header offset, data offset, memory-mapped records) of a 
+	binary table extension. The records are the raw big-endian rows on disk, so that a 
+	column is a strided view and a binary search (np.searchsorted) on a sorted 
+	column touches only O(log N) rows. A gzip-compressed file cannot be 
+	memory-mapped, and its records are read from the decompressed stream.
+	"""
+	with fits.open(file_path) as hdul:
+		hdu_index = hdul.index_of(extname)
+		header = hdul[hdu_index].header.copy()
+		fileinfo = hdul.fileinfo(hdu_index)
+		record_dtype = get_record_dtype(hdul[hdu_index].columns)
+	if header['NAXIS2'] == 0:
+		records = np.zeros(0, dtype=record_dtype)
+	elif file_path.endswith('.gz'):
+		import gzip
+		with gzip.open(file_path, 'rb') as fin:
+			fin.seek(fileinfo['datLoc'])
+			buffer = fin.read(header['NAXIS2'] * record_dtype.itemsize)
+		records = np.frombuffer(buffer, dtype=record_dtype)
+	else:
+		records = np.memmap(file_path, dtype=record_dtype, mode=mode, 
+			offset=fileinfo['datLoc'], shape=(header['NAXIS2'],))
+	return header, fileinfo['hdrLoc'], fileinfo['datLoc'], records
+
+def write_raw_table(file_path, header, records):
+	"""
+	Writes a primary header and a binary table of raw records. 
+	"""
+	header['NAXIS2'] = len(records)
+	with open(file_path + '.tmp', 'wb') as fout:
+		fout.write(fits.PrimaryHDU().header.tostring().encode('ascii'))
+		fout.write(header.tostring().encode('ascii'))
+		fout.write(records.tobytes())
+		fout.write(b'\0' * ((2880 - records.nbytes % 2880) % 2880)) # FITS block size
+	os.replace(file_path + '.tmp', file_path)
+
+def append_raw_table(file_path, extname, records, dict_keywords={}):
+	"""
+	Appends raw records to the end of the last binary table extension of a 
+	file in place, and updates NAXIS2 (and the keywords already in the header)
+	without changing the header size. Only the new rows are written.
+	"""
+	header, header_offset, data_offset, old_records = open_raw_table(file_path, extname)
+	nrows = len(old_records)
+	del old_records
+	header_size = data_offset - header_offset
+	with open(file_path, 'r+b') as fout:
+		fout.seek(data_offset + nrows * header['NAXIS1'])
+		fout.write(records.tobytes())
+		nbytes = (nrows + len(records)) * header['NAXIS1']
+		fout.write(b'\0' * ((2880 - nbytes % 2880) % 2880)) # FITS block size
+		fout.truncate()
+		header['NAXIS2'] = nrows + len(records)
+		for keyword in dict_keywords.keys():
+			header[keyword] = dict_keywords[keyword]
+		if len(header.tostring()) != header_size:
+			raise ValueError("header size of {} changed".format(file_path))
+		fout.seek(header_offset)
+		fout.write(header.tostring().encode('ascii'))
+
+def get_scaled_records(header, records):
+	"""
+	Returns the raw records of a binary table as a native-endian record array,
+	where the columns with the TSCALn or TZEROn keywords are scaled to the 
+	physical values (e.g., TIME ticks of the compact profile to unixtime).
+	"""
+	dtype_list = []
+	scales = {}
+	for i, name in enumerate(records.dtype.names):
+		dtype = records.dtype[name].newbyteorder('=')
+		tscal = header.get('TSCAL%d' % (i+1), 1.0)
+		tzero = header.get('TZERO%d' % (i+1), 0.0)
+		if tscal != 1.0 or tzero != 0.0:
+			scales[name] = (tscal, tzero)
+			if tscal == 1.0 and float(tzero).is_integer() and dtype.kind in 'iu':
+				dtype = np.dtype(np.int64)
+			else:
+				dtype = np.dtype(np.float64)
+		dtype_list.append((name, dtype))
+	scaled = np.empty(len(records), dtype=dtype_list)
+	for name in records.dtype.names:
+		if name in scales:
+			tscal, tzero = scales[name]
+			if scaled.dtype[name].kind == 'i':
+				scaled[name] = records[name].astype(np.int64) + int(tzero)
+			else:
+				scaled[name] = tzero + tscal * records[name].astype(np.float64)
+		else:
+			scaled[name] = records[name]
+	return scaled.view(np.recarray)
+
+def read_raw_time_range(file_path, extname, time_colname, tstart=None, tstop=None):
+	"""
+	Returns the rows with tstart <= time <= tstop of a binary table sorted by 
+	the time column, as a record array of the physical values. The row range 
+	is found by binary searches on the memory-mapped time column, so that 
+	only the matching rows are read from the disk.
+	"""
+	header, header_offset, data_offset, records = open_raw_table(file_path, extname)
+	i = records.dtype.names.index(time_colname) + 1
+	tscal = header.get('TSCAL%d' % i, 1.0)
+	tzero = header.get('TZERO%d' % i, 0.0)
+	time = records[time_colname]
+	if tstart != None:
+		tstart = (tstart - tzero) / tscal
+		if time.dtype.kind in 'iu':
+			# integer ticks (compact profile): a limit within the rounding errors of a
+			# float64 unix time (~2.4e-7 sec, i.e., ~2.4e-3 ticks of 100 microsec) is the tick
+			tstart = np.ceil(tstart - 1e-2)
+	if tstop != None:
+		tstop = (tstop - tzero) / tscal
+		if time.dtype.kind in 'iu':
+			tstop = np.floor(tstop + 1e-2)
+	istart = 0 if tstart == None else np.searchsorted(time, tstart, side='left')
+	istop = len(records) if tstop == None else np.searchsorted(time, tstop, side='right')
+	return get_scaled_records(header, records[istart:istop])
+
+##########################
+# House keeping archive
+##########################
+
+class HousekeepingArchive(object):
+	"""Append-only house keeping archive of a detector, partitioned by the JST
+	year of the rows: [archive_dir]/[DDD]_hk_[YYYY].fits (or a single file 
+	[archive_dir]/[DDD]_hk.fits without partitions). The rows are sorted by 
+	Unixtime without duplicates, so that the Unixtime column is the time 
+	index: appends and range reads are binary searches on the memory-mapped 
+	column, and appending rows newer than the archive writes only the new rows.
+	:param archive_dir: directory of the archive files
+	:param det_id: detector ID (e.g., '011')
+	:param partition: 'year' or None
+	"""
+	# keywords of a single source file, which do not apply to the archive
+	source_keywords = ['YYYYMMDD', 'HOUR', 'HISTORY']
+
+	def __init__(self, archive_dir, det_id, partition='year'):
+		self.archive_dir = archive_dir
+		self.det_id = '%03d' % int(det_id)
+		self.partition = partition
+
+	def get_file_path(self, year=None):
+		if self.partition == 'year':
+			return '%s/%s_hk_%s.fits' % (self.archive_dir, self.det_id, year)
+		return '%s/%s_hk.fits' % (self.archive_dir, self.det_id)
+
+	def get_file_paths(self):
+		"""
+		Returns the existing archive files in the time order.
+		"""
+		if not os.path.exists(self.archive_dir):
+			return []
+		if self.partition == 'year':
+			pattern = r'%s_hk_\d{4}.fits' % self.det_id
+		else:
+			pattern = r'%s_hk.fits' % self.det_id
+		return ['%s/%s' % (self.archive_dir, name) for name in sorted(os.listdir(self.archive_dir))
+			if re.fullmatch(pattern, name)]
+
+	def append(self, hkfile, config_file=None):
+		"""
+		Appends the rows of a HousekeepingRawcsvFile or HousekeepingRemoteFile
+		which are not in the archive yet (deduplicated on Unixtime).
+		:returns: number of appended rows
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		if len(hkfile.df) == 0:
+			print("%s: no rows" % hkfile.file_path)
+			return 0
+		hdu = fits.BinTableHDU.from_columns(hkfile.get_hk_coldefs(),name='HK')
+		if isinstance(hkfile, HousekeepingRawcsvFile):
+			hkfile.set_hk_header(hdu.header,config_file=config_file)
+		else:
+			hkfile.set_hk_header(hdu.header)
+		record_dtype = get_record_dtype(hdu.columns)
+		records = np.asarray(hdu.data).astype(record_dtype)
+		records = records[np.argsort(records['Unixtime'], kind='stable')]
+		records = records[np.concatenate([[True], np.diff(records['Unixtime']) > 0])]
+
+		if self.partition != 'year':
+			return self.append_records(self.get_file_path(), hdu.header, records)
+		years = get_jst_dates(records['Unixtime']).astype('U4')
+		nappended = 0
+		for year in np.unique(years):
+			nappended += self.append_records(self.get_file_path(year), hdu.header, records[years == year])
+		return nappended
+
+	def append_records(self, file_path, header, records):
+		if len(records) == 0:
+			print("%s: no new rows" % file_path)
+			return 0
+		if not os.path.exists(file_path):
+			os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+			header = header.copy()
+			for keyword in self.source_keywords:
+				header.remove(keyword, ignore_missing=True, remove_all=True)
+			header['DET_ID'] = self.det_id
+			header['TSTART'] = (records['Unixtime'][0], 'first Unixtime')
+			header['TSTOP'] = (records['Unixtime'][-1], 'last Unixtime')
+			header['history'] = 'archive created at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+			write_raw_table(file_path, header, records)
+			print("%s: %d rows (new)" % (file_path,len(records)))
+			return len(records)
+
+		old_header, header_offset, data_offset, old_records = open_raw_table(file_path, 'HK')
+		if old_records.dtype != records.dtype:
+			raise ValueError("columns of {} differ from the new rows".format(file_path))
+		unixtime = old_records['Unixtime']
+		index = np.searchsorted(unixtime, records['Unixtime'])
+		duplicated = (index < len(unixtime)) & (unixtime[np.minimum(index, len(unixtime) - 1)] == records['Unixtime'])
+		records = records[~duplicated]
+		if len(records) == 0:
+			print("%s: no new rows" % file_path)
+			return 0
+		if len(unixtime) == 0 or records['Unixtime'][0] > unixtime[-1]:
+			tstop = records['Unixtime'][-1]
+			del old_records
+			append_raw_table(file_path, 'HK', records, dict_keywords={'TSTOP':tstop})
+			print("%s: %d rows appended" % (file_path,len(records)))
+		else:
+			# rows older than the end of the archive: rewrite the file 
+			merged = np.concatenate([np.array(old_records), records])
+			del old_records
+			merged = merged[np.argsort(merged['Unixtime'], kind='stable')]
+			old_header['TSTART'] = merged['Unixtime'][0]
+			old_header['TSTOP'] = merged['Unixtime'][-1]
+			write_raw_table(file_path, old_header, merged)
+			print("%s: %d rows inserted" % (file_path,len(records)))
+		return len(records)
+
+	def read(self, tstart=None, tstop=None):
+		"""
+		Returns the rows with tstart <= Unixtime <= tstop as a record array, 
+		found by binary searches on the archive files.
+		"""
+		selected = []
+		for file_path in self.get_file_paths():
+			header = fits.getheader(file_path, 'HK')
+			if tstart != None and header['TSTOP'] < tstart:
+				continue
+			if tstop != None and header['TSTART'] > tstop:
+				continue
+			selected.append(read_raw_time_range(file_path, 'HK', 'Unixtime', tstart, tstop))
+		if len(selected) == 0:
+			return None
+		return np.concatenate(selected).view(np.recarray)
+
+##########################
+# House keeping trends
+##########################
+
+hk_trend_colnames = ['Rate1','Rate2','Rate3','Rate4','Rate5','Rate6',
+	'Temperature','Pressure','Humidity','Illumination']
+
+hk_trend_dtype = np.dtype([('TSTART',np.float64),('NROWS',np.int32),('GPS_VALID',np.float32)] 
+	+ [('%s_%s' % (colname, stat), np.float32) for colname in hk_trend_colnames 
+		for stat in ['MIN','MEAN','MAX','STD']])
+
+def get_hk_rollup(records, binsize, origin=0.0):
+	"""
+	Returns the rollup (hk_trend_dtype) of house keeping rows sorted by 
+	Unixtime in bins of binsize (sec) starting at origin + n * binsize: number
+	of rows, fraction of valid GPS (Gps_status > 0), and min, mean, max, and 
+	std of each column of hk_trend_colnames (NaN values are ignored). The 
+	rows are grouped on the integer bin numbers with reduceat, without a loop
+	over the bins.
+	"""
+	unixtime = np.asarray(records['Unixtime'], dtype=np.float64)
+	if len(unixtime) == 0:
+		return np.zeros(0, dtype=hk_trend_dtype)
+	buckets = np.floor((unixtime - origin) / binsize).astype(np.int64)
+	is_first = np.concatenate([[True], np.diff(buckets) != 0])
+	starts = np.flatnonzero(is_first)
+	groups = np.cumsum(is_first) - 1
+	nrows = np.diff(np.append(starts, len(buckets)))
+
+	rollup = np.zeros(len(starts), dtype=hk_trend_dtype)
+	rollup['TSTART'] = origin + buckets[starts] * binsize
+	rollup['NROWS'] = nrows
+	rollup['GPS_VALID'] = np.add.reduceat(np.asarray(records['Gps_status']) > 0, starts) / nrows
+	with np.errstate(invalid='ignore', divide='ignore'):
+		for colname in hk_trend_colnames:
+			values = np.asarray(records[colname], dtype=np.float64)
+			valid = ~np.isnan(values)
+			nvalid = np.add.reduceat(valid, starts)
+			mean = np.add.reduceat(np.where(valid, values, 0.0), starts) / nvalid
+			deviation = np.where(valid, values - mean[groups], 0.0)
+			rollup['%s_MIN' % colname] = np.fmin.reduceat(values, starts)
+			rollup['%s_MEAN' % colname] = mean
+			rollup['%s_MAX' % colname] = np.fmax.reduceat(values, starts)
+			rollup['%s_STD' % colname] = np.sqrt(np.add.reduceat(deviation**2, starts) / nvalid)
+	return rollup
+
+class HousekeepingTrend(object):
+	"""Long-term trends of the house keeping data of a detector: hourly, daily, 
+	and weekly rollups (see get_hk_rollup) in the extensions HOURLY, DAILY, 
+	and WEEKLY of [trend_dir]/[DDD]_hk_trend.fits. The bins are aligned to 
+	the JST hours, days, and weeks (from Monday). An update recomputes only 
+	the last bin of each level, which may have been incomplete, and the bins 
+	after it, so that only the rows since the start of the last week are 
+	read when new days arrive. Rows older than the last bin of a level are 
+	ignored by update; use rebuild after inserting older rows.
+	:param file_path: trend file (read if it exists)
+	"""
+	levels = [('HOURLY', 3600.0), ('DAILY', 86400.0), ('WEEKLY', 604800.0)]
+	origin = 4 * 86400.0 - 9 * 3600.0 # Monday 1970-01-05 00:00 JST (unixtime)
+
+	def __init__(self, file_path):
+		self.file_path = file_path
+		self.det_id = None
+		self.tables = {}
+		for extname, binsize in self.levels:
+			self.tables[extname] = np.zeros(0, dtype=hk_trend_dtype)
+		if os.path.exists(self.file_path):
+			with fits.open(self.file_path) as hdul:
+				for extname, binsize in self.levels:
+					self.tables[extname] = np.array(hdul[extname].data).astype(hk_trend_dtype)
+				self.det_id = hdul[self.levels[0][0]].header['DET_ID']
+
+	@staticmethod
+	def get_file_path(trend_dir, det_id):
+		return '%s/%03d_hk_trend.fits' % (trend_dir, int(det_id))
+
+	def get_update_start(self):
+		"""
+		Returns the Unixtime from which the rows are needed by update (None 
+		for all the rows).
+		"""
+		tstarts = []
+		for extname, binsize in self.levels:
+			if len(self.tables[extname]) == 0:
+				return None
+			tstarts.append(self.tables[extname]['TSTART'][-1])
+		return min(tstarts)
+
+	def update(self, records):
+		"""
+		Updates the rollups with house keeping rows sorted by Unixtime 
+		without duplicates, which should include all the rows since 
+		get_update_start().
+		:returns: number of rewritten bins of the finest level
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		nbins = None
+		for extname, binsize in self.levels:
+			table = self.tables[extname]
+			tlast = table['TSTART'][-1] if len(table) > 0 else -np.inf
+			rollup = get_hk_rollup(records[records['Unixtime'] >= tlast], binsize, origin=self.origin)
+			if len(rollup) > 0:
+				self.tables[extname] = np.concatenate([table[table['TSTART'] < tlast], rollup])
+			if nbins == None:
+				nbins = len(rollup)
+			print("%s: %d bins updated, %d bins in total" % (extname, len(rollup), len(self.tables[extname])))
+		return nbins
+
+	def update_from_files(self, hk_file_paths, rebuild=False):
+		"""
+		Updates the rollups with the rows since get_update_start() of house 
+		keeping fits files (daily files, remote files, or archive files), read
+		by binary searches on Unixtime.
+		:param rebuild: if True, the rollups are computed from all the rows
+		"""
+		if rebuild:
+			for extname, binsize in self.levels:
+				self.tables[extname] = np.zeros(0, dtype=hk_trend_dtype)
+		tstart = self.get_update_start()
+		selected = []
+		for file_path in hk_file_paths:
+			records = read_raw_time_range(file_path, 'HK', 'Unixtime', tstart, None)
+			self.det_id = '%03d' % int(fits.getval(file_path, 'DET_ID', extname='HK'))
+			selected.append(np.asarray(records)[['Unixtime','Gps_status'] + hk_trend_colnames])
+		if len(selected) == 0:
+			return 0
+		records = np.concatenate([numpy.lib.recfunctions.repack_fields(records) for records in selected])
+		if len(records) == 0:
+			return 0
+		records = records[np.argsort(records['Unixtime'], kind='stable')]
+		records = records[np.concatenate([[True], np.diff(records['Unixtime']) > 0])]
+		return self.update(records)
+
+	def read(self, extname='DAILY', tstart=None, tstop=None):
+		"""
+		Returns the bins of a level with tstart <= TSTART <= tstop.
+		"""
+		table = self.tables[extname.upper()]
+		istart = 0 if tstart == None else np.searchsorted(table['TSTART'], tstart, side='left')
+		istop = len(table) if tstop == None else np.searchsorted(table['TSTART'], tstop, side='right')
+		return table[istart:istop].view(np.recarray)
+
+	def writeto(self, dict_keywords={}):
+		hdus = [fits.PrimaryHDU()]
+		for extname, binsize in self.levels:
+			hdu = fits.BinTableHDU(data=self.tables[extname], name=extname)
+			hdu.header['DET_ID'] = (self.det_id, 'Detector_ID')
+			hdu.header['BINSIZE'] = (binsize, 'bin width (sec)')
+			hdu.header['TIMEZERO'] = (self.origin, 'TSTART of bin 0 (Monday 00:00 JST)')
+			for keyword in dict_keywords.keys():
+				hdu.header[keyword] = dict_keywords[keyword]
+			hdus.append(hdu)
+		hdus[-1].header['history'] = 'updated at {} JST'.format(Time.now().to_datetime(tz_tokyo))
+		os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+		fits.HDUList(hdus).writeto(self.file_path + '.tmp', overwrite=True)
+		os.replace(self.file_path + '.tmp', self.file_path)
+
+	def plot(self, extname='DAILY', outpdf=None):
+		"""
+		Plots the mean (line) and the min-max range (band) of the rollups of a
+		level.
+		"""
+		table = self.read(extname)
+		if outpdf == None:
+			outpdf = os.path.splitext(self.file_path)[0] + '_%s.pdf' % extname.lower()
+		binsize = dict(self.levels)[extname.upper()]
+		time_jst = Time(table['TSTART'] + 0.5 * binsize, format='unix', scale='utc').to_datetime(timezone=tz_tokyo)
+		matplotlib.rcParams['timezone'] = 'Asia/Tokyo'
+
+		panels = [(['Rate1','Rate2'], 'Rate 1,2 (cps)'), (['Rate3','Rate4'], 'Rate 3,4 (cps)'),
+			(['Rate5','Rate6'], 'Rate 5,6 (cps)'), (['Temperature'], 'Temp. (degC)'), 
+			(['Pressure'], 'Press. (hPa)'), (['Humidity'], 'Humid. (%)'), 
+			(['Illumination'], 'Illum. (lux)')]
+		fig, axs = plt.subplots(len(panels) + 1, 1, figsize=(8.27,11.69), 
+			sharex=True, gridspec_kw={'hspace': 0})
+		axs[0].set_title('DET_ID=%s %s trend (%s)' % (self.det_id, extname.lower(), os.path.basename(self.file_path)))
+		for ax, (colnames, ylabel) in zip(axs, panels):
+			for colname in colnames:
+				ax.fill_between(time_jst, table['%s_MIN' % colname], table['%s_MAX' % colname], 
+					step='mid', alpha=0.3)
+				ax.step(time_jst, table['%s_MEAN' % colname], where='mid', label=colname)
+			ax.set_ylabel(ylabel)
+			if len(colnames) > 1:
+				ax.legend(loc='upper right', fontsize=7)
+		axs[-1].step(time_jst, table['GPS_VALID'], where='mid')
+		axs[-1].set_ylabel('GPS valid')
+		axs[-1].set_ylim(-0.05,1.05)
+		axs[-1].set_xlabel('Time (JST)')
+		axs[-1].xaxis.set_major_formatter(dates.DateFormatter('%Y-%m-%d'))
+		for ax in axs:
+			ax.label_outer()
+			ax.minorticks_on()
+			ax.xaxis.grid(True)
+			ax.tick_params(axis="both", which='major', direction='in', length=5)
+			ax.tick_params(axis="both", which='minor', direction='in', length=3)
+		fig.align_ylabels(axs)
+		plt.tight_layout(pad=2)
+		plt.savefig(outpdf)
+		plt.close(fig)
+		print("%s is created." % outpdf)
+
+##########################
+# Time index
+##########################
+
+time_index_dtype = np.dtype([('DET_ID','U8'), ('KIND','U8'), ('FILE','U256'), 
+	('TSTART','f8'), ('TSTOP','f8'), ('NROWS','i8')])
+
+class TimeIndex(object):
+	"""Index of the fits-format event and house keeping files under a directory: 
+	detector ID, kind ('events' or 'hk'), file path, TSTART, TSTOP, and number 
+	of rows, taken from the headers (or the first and last rows of the sorted 
+	time column). The index picks the files overlapping a time range, and 
+	read_time_range reads only the matching rows of these files.
+	:param entries: record array of time_index_dtype
+	"""
+	file_patterns = {
+		'events':[r'\d{3}_\d{8}_\d{2}(_\d{8}_\d{2})?.evt(.gz)?'],
+		'hk':[r'\d{3}_\d{8}_hk.fits', r'\d{3}_hk(_\d{4})?.fits', 
+			r'cgm\d{3}_rhk_\d{6}T\d{6}_\d{6}T\d{6}.fits']}
+	extnames = {'events':'EVENTS', 'hk':'HK'}
+	time_colnames = {'events':'TIME', 'hk':'Unixtime'}
+
+	def __init__(self, entries=None):
+		if entries is None:
+			entries = np.zeros(0, dtype=time_index_dtype)
+		self.entries = entries
+
+	@staticmethod
+	def get_kind(file_path):
+		for kind in TimeIndex.file_patterns.keys():
+			for pattern in TimeIndex.file_patterns[kind]:
+				if re.fullmatch(pattern, os.path.basename(file_path)):
+					return kind
+		return None
+
+	@staticmethod
+	def get_entry(file_path, kind):
+		"""
+		Returns the index entry (DET_ID, KIND, FILE, TSTART, TSTOP, NROWS) of a file.
+		"""
+		extname = TimeIndex.extnames[kind]
+		header, header_offset, data_offset, records = open_raw_table(file_path, extname)
+		nrows = header['NAXIS2']
+		if kind == 'hk' or 'TSTART' not in header or 'TSTOP' not in header:
+			if nrows == 0:
+				return None
+			first_last = get_scaled_records(header, records[[0, nrows - 1]])
+			tstart = float(first_last[TimeIndex.time_colnames[kind]][0])
+			tstop = float(first_last[TimeIndex.time_colnames[kind]][-1])
+		else:
+			tstart = header['TSTART']
+			tstop = header['TSTOP']
+		return ('%03d' % int(header['DET_ID']), kind, file_path, tstart, tstop, nrows)
+
+	@staticmethod
+	def scan(data_dir):
+		"""
+		Returns the TimeIndex of the files under a directory (recursively).
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		entries = []
+		for dirpath, dirnames, filenames in os.walk(data_dir):
+			dirnames.sort()
+			for filename in sorted(filenames):
+				kind = TimeIndex.get_kind(filename)
+				if kind == None:
+					continue
+				entry = TimeIndex.get_entry(os.path.join(dirpath, filename), kind)
+				if entry != None:
+					entries.append(entry)
+		entries = np.array(entries, dtype=time_index_dtype)
+		entries = entries[np.lexsort((entries['TSTART'], entries['KIND'], entries['DET_ID']))]
+		print("%d files indexed in %s" % (len(entries), data_dir))
+		return TimeIndex(entries)
+
+	def get_hdu(self):
+		hdu = fits.BinTableHDU(data=self.entries, name='INDEX')
+		hdu.header['TIMEUNIT'] = ('s', 'TSTART and TSTOP are unixtime')
+		return hdu
+
+	def writeto(self, index_file, overwrite=True):
+		self.get_hdu().writeto(index_file, overwrite=overwrite)
+
+	@staticmethod
+	def read(index_file):
+		data = fits.getdata(index_file, 'INDEX')
+		return TimeIndex(np.array(data).astype(time_index_dtype))
+
+	@property
+	def det_ids(self):
+		return np.unique(self.entries['DET_ID']).tolist()
+
+	def find_files(self, tstart=None, tstop=None, kind='events', det_ids=None):
+		"""
+		Returns the entries of the files overlapping tstart--tstop. 
+		tstart or tstop of None is an open bound.
+		"""
+		mask = (self.entries['KIND'] == kind)
+		if tstart != None:
+			mask &= (self.entries['TSTOP'] >= tstart)
+		if tstop != None:
+			mask &= (self.entries['TSTART'] <= tstop)
+		if det_ids != None:
+			mask &= np.isin(self.entries['DET_ID'], ['%03d' % int(det_id) for det_id in det_ids])
+		return self.entries[mask]
+
+	def read_time_range(self, tstart=None, tstop=None, kind='events', det_ids=None):
+		"""
+		Returns a dictionary {detector ID: record array} of the rows with 
+		tstart <= time <= tstop of the files found in the index (tstart or 
+		tstop of None is an open bound).
+		"""
+		selected = {}
+		for entry in self.find_files(tstart, tstop, kind=kind, det_ids=det_ids):
+			records = read_raw_time_range(entry['FILE'], self.extnames[kind], 
+				self.time_colnames[kind], tstart, tstop)
+			selected.setdefault(str(entry['DET_ID']), []).append(records)
+		for det_id in selected.keys():
+			# files of different profiles: keep the common columns
+			names = [name for name in selected[det_id][0].dtype.names 
+				if all(name in records.dtype.names for records in selected[det_id])]
+			selected[det_id] = np.concatenate([np.lib.recfunctions.repack_fields(records[names]) 
+				for records in selected[det_id]]).view(np.recarray)
+		return selected
+
+##########################
+# File catalog
+##########################
+
+class FileCatalog(object):
+	"""SQLite catalog of the fits-format event and house keeping files: 
+	detector ID, JST date and hour, TSTART, TSTOP, number of events or 
+	house keeping rows, config keywords (INTERVAL, AREABD1-6), md5 checksum,
+	size, and mtime per file. The files are found without globbing and 
+	opening them (e.g., all the files of detector 019 between dates with 
+	nevents > N), and a rescan reads only the new or modified files.
+	:param db_file: path to the SQLite database file (created if not exists)
+	"""
+	columns = [('path','TEXT PRIMARY KEY'), ('det_id','TEXT'), ('kind','TEXT'), 
+		('yyyymmdd','TEXT'), ('hour','INTEGER'), ('tstart','REAL'), ('tstop','REAL'), 
+		('nevents','INTEGER'), ('nhk','INTEGER'), ('interval','INTEGER'),
+		('areabd1','REAL'), ('areabd2','REAL'), ('areabd3','REAL'), 
+		('areabd4','REAL'), ('areabd5','REAL'), ('areabd6','REAL'),
+		('checksum','TEXT'), ('size','INTEGER'), ('mtime','REAL')]
+
+	def __init__(self, db_file):
+		import sqlite3
+		self.db_file = db_file
+		self.connection = sqlite3.connect(self.db_file)
+		self.connection.execute('CREATE TABLE IF NOT EXISTS files (%s)' % 
+			', '.join(['%s %s' % column for column in self.columns]))
+		self.connection.execute('CREATE INDEX IF NOT EXISTS files_det_id_tstart ON files (det_id, tstart)')
+		self.connection.commit()
+
+	def close(self):
+		self.connection.close()
+
+	@staticmethod
+	def get_checksum(file_path, blocksize=1048576):
+		import hashlib
+		md5 = hashlib.md5()
+		with open(file_path, 'rb') as fin:
+			for block in iter(lambda: fin.read(blocksize), b''):
+				md5.update(block)
+		return md5.hexdigest()
+
+	@staticmethod
+	def get_file_info(file_path, kind):
+		"""
+		Returns the catalog row (dictionary) of a file, read from the headers.
+		"""
+		entry = TimeIndex.get_entry(file_path, kind)
+		if entry == None:
+			return None
+		det_id, kind, file_path, tstart, tstop, nrows = entry
+		header = fits.getheader(file_path, TimeIndex.extnames[kind])
+		stat = os.stat(file_path)
+		info = {'path':os.path.abspath(file_path), 'det_id':det_id, 'kind':kind,
+			'yyyymmdd':header.get('YYYYMMDD', str(get_jst_dates(np.array([tstart]))[0])),
+			'hour':header.get('HOUR', None), 'tstart':tstart, 'tstop':tstop,
+			'nevents':nrows if kind == 'events' else None, 
+			'nhk':nrows if kind == 'hk' else None,
+			'interval':header.get('INTERVAL', None),
+			'checksum':FileCatalog.get_checksum(file_path), 
+			'size':stat.st_size, 'mtime':stat.st_mtime}
+		for i in range(1,7):
+			info['areabd%d' % i] = header.get('AREABD%d' % i, None)
+		info['yyyymmdd'] = str(info['yyyymmdd'])
+		return info
+
+	def is_changed(self, file_path):
+		stat = os.stat(file_path)
+		row = self.connection.execute('SELECT size, mtime FROM files WHERE path = ?', 
+			(os.path.abspath(file_path),)).fetchone()
+		return row == None or row[0] != stat.st_size or row[1] != stat.st_mtime
+
+	def register(self, file_path, commit=True):
+		"""
+		Adds or updates the row of a file (e.g., after the conversion).
+		"""
+		kind = TimeIndex.get_kind(file_path)
+		if kind == None:
+			raise ValueError("unknown file type: {}".format(file_path))
+		info = self.get_file_info(file_path, kind)
+		if info == None:
+			return False
+		names = [column[0] for column in self.columns]
+		self.connection.execute('INSERT OR REPLACE INTO files (%s) VALUES (%s)' % 
+			(', '.join(names), ', '.join(['?'] * len(names))), [info[name] for name in names])
+		if commit:
+			self.connection.commit()
+		return True
+
+	def scan(self, data_dir):
+		"""
+		Registers the new or modified files under a directory (recursively), 
+		and removes the rows of the files deleted from the directory. The 
+		unchanged files (same size and mtime) are not opened.
+		:returns: dictionary of the numbers of added, updated, unchanged, and removed files
+		"""
+		sys.stdout.write('----- {} -----\n'.format(sys._getframe().f_code.co_name))
+
+		nfiles = {'added':0, 'updated':0, 'unchanged':0, 'removed':0}
+		root_dir = os.path.abspath(data_dir)
+		found = set()
+		for dirpath, dirnames, filenames in os.walk(root_dir):
+			dirnames.sort()
+			for filename in sorted(filenames):
+				if TimeIndex.get_kind(filename) == None:
+					continue
+				file_path = os.path.join(dirpath, filename)
+				found.add(file_path)
+				if not self.is_changed(file_path):
+					nfiles['unchanged'] += 1
+					continue
+				is_new = self.connection.execute('SELECT 1 FROM files WHERE path = ?', 
+					(file_path,)).fetchone() == None
+				if self.register(file_path, commit=False):
+					nfiles['added' if is_new else 'updated'] += 1
+		prefix = root_dir + '/'
+		for (file_path,) in self.connection.execute('SELECT path FROM files WHERE substr(path, 1, ?) = ?', 
+				(len(prefix), prefix)).fetchall():
+			if file_path not in found:
+				self.connection.execute('DELETE FROM files WHERE path = ?', (file_path,))
+				nfiles['removed'] += 1
+		self.connection.commit()
+		print("%s: %d added, %d updated, %d unchanged, %d removed" % (data_dir,
+			nfiles['added'],nfiles['updated'],nfiles['unchanged'],nfiles['removed']))
+		return nfiles
+
+	def query(self, det_id=None, kind=None, date_min=None, date_max=None, 
+		tstart=None, tstop=None, nevents_min=None, nevents_max=None):
+		"""
+		Returns the rows (pandas.DataFrame sorted by detector and TSTART) 
+		matching the conditions. The dates are JST 'YYYYMMDD' (inclusive), 
+		and tstart and tstop select the files overlapping the time range.
+		"""
+		conditions = []
+		values = []
+		if det_id != None:
+			conditions.append('det_id = ?')
+			values.append('%03d' % int(det_id))
+		if kind != None:
+			conditions.append('kind = ?')
+			values.append(kind)
+		if date_min != None:
+			conditions.append('yyyymmdd >= ?')
+			values.append(str(date_min))
+		if date_max != None:
+			conditions.append('yyyymmdd <= ?')
+			values.append(str(date_max))
+		if tstart != None:
+			conditions.append('tstop >= ?')
+			values.append(tstart)
+		if tstop != None:
+			conditions.append('tstart <= ?')
+			values.append(tstop)
+		if nevents_min != None:
+			conditions.append('nevents >= ?')
+			values.append(nevents_min)
+		if nevents_max != None:
+			conditions.append('nevents <= ?')
+			values.append(nevents_max)
+		sql = 'SELECT * FROM files'
+		if len(conditions) > 0:
+			sql += ' WHERE ' + ' AND '.join(conditions)
+		sql += ' ORDER BY det_id, tstart'
+		return pd.read_sql_query(sql, self.connection, params=values)
+
+	def get_file_paths(self, **kwargs):
+		"""
+		Returns the file paths of query(**kwargs).
+		"""
+		return self.query(**kwargs)['path'].tolist()
+
 def fopen(file_path):
 	if re.fullmatch(r'\d{3}_\d{8}_\d{2}.csv', os.path.basename(file_path)):
 		return EventRawcsvFile(file_path)
-	elif re.fullmatch(r'\d{3}_\d{8}_\d{2}.evt', os.path.basename(file_path)):
+	elif re.fullmatch(r'\d{3}_\d{8}_\d{2}.evt(.gz)?', os.path.basename(file_path)):
+		return EventFitsFile(file_path)
+	elif re.fullmatch(r'\d{3}_\d{8}_\d{2}_\d{8}_\d{2}.evt(.gz)?', os.path.basename(file_path)):
 		return EventFitsFile(file_path)
 	elif re.fullmatch(r'\d{3}_\d{8}.csv', os.path.basename(file_path)):
 		return HousekeepingRawcsvFile(file_path)	
 	elif re.fullmatch(r'\d{3}_\d{8}_hk.fits', os.path.basename(file_path)):
 		return HousekeepingFitsFile(file_path)	
+	elif re.fullmatch(r'\d{3}_hk(_\d{4})?.fits', os.path.basename(file_path)):
+		return HousekeepingFitsFile(file_path)
 	elif re.fullmatch(r'cgm\d{3}_rhk_\d{6}T\d{6}_\d{6}T\d{6}.csv',os.path.basename(file_path)):
 		return HousekeepingRemoteFile(file_path)
 	elif re.fullmatch(r'cgm\d{3}_rhk_\d{6}T\d{6}_\d{6}T\d{6}.fits',os.path.basename(file_path)):
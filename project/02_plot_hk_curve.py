@@ -1,10 +1,21 @@
 #!/usr/bin/env python
 
 import os
+import sys
 import glob 
 
+import cogamo.cogamo as cogamo
+
 OUTDIR = '/Users/enoto/Dropbox/01_enoto/research/growth/data/20200804_CoGaMo_data_sharing/out' 
 
+# files are looked up in the catalog written by 01_convert_csvfile_to_fitsfile.py
+catalog_file = '%s/catalog.db' % OUTDIR
+if not os.path.exists(catalog_file):
+	# FileCatalog would create an empty catalog
+	sys.exit('%s not found: run 01_convert_csvfile_to_fitsfile.py, or cogamo/cli/cgm_catalog.py %s --scan %s' % (
+		catalog_file,catalog_file,OUTDIR))
+catalog = cogamo.FileCatalog(catalog_file)
+
 #for det_id in ['011','019']:
 #for det_id in ['011']:
 for det_id in ['019']:
@@ -14,7 +25,7 @@ for det_id in ['019']:
 
 	file_config = '%s/%s/config.csv' % (OUTDIR,det_id)
 
-	for hkfile_path in glob.glob('%s/%s/hk/*.fits' % (OUTDIR,det_id)):
+	for hkfile_path in catalog.get_file_paths(det_id=det_id,kind='hk'):
 		print(hkfile_path)
 
 		cmd = 'cogamo/cli/cgm_plot_hkfile.py %s ' % hkfile_path
@@ -1,10 +1,21 @@
 #!/usr/bin/env python
 
 import os
+import sys
 import glob 
 
+import cogamo.cogamo as cogamo
+
 OUTDIR = '/Users/enoto/Dropbox/01_enoto/research/growth/data/20200804_CoGaMo_data_sharing/out' 
 
+# files are looked up in the catalog written by 01_convert_csvfile_to_fitsfile.py
+catalog_file = '%s/catalog.db' % OUTDIR
+if not os.path.exists(catalog_file):
+	# FileCatalog would create an empty catalog
+	sys.exit('%s not found: run 01_convert_csvfile_to_fitsfile.py, or cogamo/cli/cgm_catalog.py %s --scan %s' % (
+		catalog_file,catalog_file,OUTDIR))
+catalog = cogamo.FileCatalog(catalog_file)
+
 #for det_id in ['011','019']:
 #for det_id in ['019']:
 for det_id in ['011']:
@@ -15,7 +26,7 @@ for det_id in ['011']:
 	cmd = 'mkdir -p %s;' % outdir_sub
 	print(cmd);os.system(cmd)
 
-	for evtfile_path in glob.glob('%s/%s/evt/*.evt' % (OUTDIR,det_id)):
+	for evtfile_path in catalog.get_file_paths(det_id=det_id,kind='events',date_min=datestr,date_max=datestr):
 		print(evtfile_path)
 
 		cmd  = 'cogamo/cli/cgm_plot_curve.py '
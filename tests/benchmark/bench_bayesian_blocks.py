@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+import time
+import argparse
+import numpy as np
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('bench_bayesian_blocks.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Benchmark of the Bayesian blocks of a synthetic one-hour event list with a burst. The unbinned dynamic program is O(N^2), so that it is measured up to --max_unbinned events and extrapolated above; the pre-binned one is measured for 1e5 to 1e7 events.
+		"""
+		)
+	parser.add_argument('--max_unbinned', type=int, default=20000,
+		help='maximum number of events for the unbinned mode.')	
+	parser.add_argument('--max_cells', type=int, default=10000,
+		help='number of cells of the pre-binned mode.')
+	return parser
+
+def get_events(nevents, rng):
+	nburst = nevents // 20
+	events = np.concatenate([rng.uniform(0.0, 3600.0, nevents - nburst), 
+		rng.uniform(1800.0, 1830.0, nburst)])
+	return np.sort(np.round(events, 4))
+
+def run(events, tbin=None):
+	start = time.perf_counter()
+	cell_edges, cell_counts = cogamo.get_event_cells(events, tbin=tbin)
+	change_points = cogamo.bayesian_blocks(cell_edges, cell_counts)
+	return len(change_points) - 1, len(cell_counts), time.perf_counter() - start
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+	rng = np.random.default_rng(0)
+
+	print("%-10s %-10s %10s %8s %10s" % ('nevents','mode','ncells','nblocks','sec'))
+	scale = None
+	for nevents in [1000, 3000, 10000, 30000, 100000, 1000000, 10000000]:
+		events = get_events(nevents, rng)
+		if nevents <= args.max_unbinned:
+			nblocks, ncells, sec = run(events)
+			scale = sec / float(ncells)**2
+			print("%-10d %-10s %10d %8d %10.3f" % (nevents, 'unbinned', ncells, nblocks, sec))
+		elif scale != None:
+			print("%-10d %-10s %10d %8s %10.1f (extrapolated)" % (nevents, 'unbinned', nevents, '-', scale * float(nevents)**2))
+		if nevents >= args.max_cells:
+			tbin = 3600.0 / args.max_cells
+			nblocks, ncells, sec = run(events, tbin=tbin)
+			print("%-10d %-10s %10d %8d %10.3f (tbin=%g sec)" % (nevents, 'pre-binned', ncells, nblocks, sec, tbin))
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+import time
+import argparse
+import numpy as np
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('bench_coincidence.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Benchmark of the network coincidence search (sorted sweep) with synthetic burst candidates of many detectors over a year, including injected coincidences.
+		"""
+		)
+	parser.add_argument('--ndetectors', type=int, default=50,
+		help='number of detectors.')	
+	parser.add_argument('--ncandidates', type=int, default=20000,
+		help='number of random candidates per detector.')
+	parser.add_argument('--ninjected', type=int, default=100,
+		help='number of injected coincidences.')
+	parser.add_argument('--window', type=float, default=1.0,
+		help='coincidence window (sec).')
+	return parser
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	rng = np.random.default_rng(0)
+	duration = 365.0 * 86400.0
+	candidates = []
+	for i in range(args.ndetectors):
+		bursts = np.zeros(args.ncandidates, dtype=cogamo.burst_dtype)
+		bursts['TSTART'] = rng.uniform(0.0, duration, args.ncandidates)
+		bursts['TSTOP'] = bursts['TSTART'] + rng.exponential(2.0, args.ncandidates)
+		bursts['PEAK_TIME'] = 0.5 * (bursts['TSTART'] + bursts['TSTOP'])
+		bursts['SIGNIFICANCE'] = 5.0 + rng.exponential(1.0, args.ncandidates)
+		candidates.append(cogamo.get_candidates(bursts, i + 1))
+	# injected: 3 neighbouring detectors within 0.5 sec
+	injected_times = rng.uniform(0.0, duration, args.ninjected)
+	for i, t in enumerate(injected_times):
+		bursts = np.zeros(3, dtype=cogamo.burst_dtype)
+		bursts['TSTART'] = t + rng.uniform(0.0, 0.5, 3)
+		bursts['TSTOP'] = bursts['TSTART'] + 1.0
+		bursts['PEAK_TIME'] = bursts['TSTART'] + 0.5
+		bursts['SIGNIFICANCE'] = 10.0
+		for j in range(3):
+			candidates.append(cogamo.get_candidates(bursts[j:j+1], (i + j) % args.ndetectors + 1))
+	candidates = np.concatenate(candidates)
+	positions = {'%03d' % (i + 1):(139.7 + 0.01 * i, 35.7) for i in range(args.ndetectors)}
+
+	start = time.perf_counter()
+	coincidences = cogamo.find_coincidences(candidates, window=args.window, min_detectors=2, positions=positions)
+	elapsed = time.perf_counter() - start
+	found = np.count_nonzero([np.any((coincidences['TSTART'] <= t + 0.5) & (coincidences['TSTOP'] >= t)) 
+		for t in injected_times])
+	print("%d candidates, %d detectors: %d coincidences (%d of %d injected) in %.3f sec" % (
+		len(candidates), args.ndetectors, len(coincidences), found, args.ninjected, elapsed))
+
+if __name__=="__main__":
+	main()
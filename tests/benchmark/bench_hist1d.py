@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+import time
+import argparse
+import numpy as np
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.02'
+# v0.02 : 2026-10-18 : time the unsorted input, np.histogram is the default
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('bench_hist1d.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Benchmark of the light-curve binning of Hist1D (np.histogram and bincount on an unsorted time series, and the binary search on the sorted one).
+		"""
+		)
+	parser.add_argument('--nevents', type=int, default=10000000,
+		help='number of events.')	
+	parser.add_argument('--tbin', type=float, default=0.1,
+		help='time bin (sec).')
+	parser.add_argument('--nchunks', type=int, default=10,
+		help='number of chunks for the incremental fill.')
+	return parser
+
+def run(nbins, xhigh, time_series, method, is_sorted=False, nchunks=1):
+	start = time.perf_counter()
+	hist = cogamo.Hist1D(nbins, 0.0, xhigh, method=method)
+	for chunk in np.array_split(time_series, nchunks):
+		hist.fill(chunk, is_sorted=is_sorted)
+	return hist.hist, time.perf_counter() - start
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	xhigh = 3600.0
+	nbins = round(xhigh/args.tbin)
+	unsorted_series = np.random.default_rng(0).uniform(0.0, xhigh, args.nevents)
+	time_series = np.sort(unsorted_series)
+
+	print("nevents=%d nbins=%d" % (args.nevents, nbins))
+	reference, sec_ref = run(nbins, xhigh, unsorted_series, 'histogram')
+	print("%-24s %8.3f sec" % ('histogram (unsorted)', sec_ref))
+	for label, series, method, is_sorted, nchunks in [
+		('bincount (unsorted)', unsorted_series, 'bincount', False, 1),
+		('histogram (chunks)', unsorted_series, 'histogram', False, args.nchunks),
+		('bincount (chunks)', unsorted_series, 'bincount', False, args.nchunks),
+		('sorted', time_series, 'histogram', True, 1),
+		('sorted (chunks)', time_series, 'histogram', True, args.nchunks)]:
+		hist, sec = run(nbins, xhigh, series, method, is_sorted=is_sorted, nchunks=nchunks)
+		print("%-24s %8.3f sec (x%.1f) identical=%s" % (label, sec, sec_ref/sec,
+			np.array_equal(hist, reference)))
+
+	# values on the bin edges of a range with non-round limits
+	xlow, xhigh = 0.1234, 3600.5678
+	edges = np.linspace(xlow, xhigh, nbins + 1)
+	reference = np.histogram(edges, bins=nbins, range=(xlow, xhigh))[0]
+	for label, method, is_sorted in [('bincount (edges)', 'bincount', False), 
+		('sorted (edges)', 'histogram', True)]:
+		hist = cogamo.Hist1D(nbins, xlow, xhigh, method=method)
+		hist.fill(edges, is_sorted=is_sorted)
+		print("%-24s identical=%s" % (label, np.array_equal(hist.hist, reference)))
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+
+import cogamo.cogamo as cogamo
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('bench_rawcsv_parser.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Benchmark of the csv parser backends (pandas, pyarrow, numpy) of the raw event files with a synthetic hour file (minute,sec,decisec,pha).
+		"""
+		)
+	parser.add_argument('--nevents', type=int, default=1000000,
+		help='number of events (lines).')	
+	parser.add_argument('--chunksize', type=int, default=200000,
+		help='number of lines per chunk for the streaming read.')
+	return parser
+
+def write_synthetic_csv(file_path, nevents):
+	rng = np.random.default_rng(0)
+	ticks = np.sort(rng.integers(0, 36000000, nevents))
+	columns = np.column_stack([ticks // 600000, (ticks % 600000) // 10000, ticks % 10000, 
+		rng.integers(0, 4096, nevents)])
+	np.savetxt(file_path, columns, fmt='%d', delimiter=',')
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		file_path = '%s/011_20200305_13.csv' % tmpdir
+		write_synthetic_csv(file_path, args.nevents)
+		print("nevents=%d (%.1f MB)" % (args.nevents, os.path.getsize(file_path)/1e+6))
+
+		reference = None
+		for backend in ['pandas', 'pyarrow', 'numpy']:
+			if backend == 'pyarrow' and cogamo.get_csv_backend('auto') != 'pyarrow':
+				print("%-8s not installed" % backend)
+				continue
+			start = time.perf_counter()
+			df = cogamo.read_rawcsv(file_path, cogamo.event_csv_layout, backend=backend)
+			sec = time.perf_counter() - start
+			start = time.perf_counter()
+			nevents = sum([len(chunk) for chunk in cogamo.read_rawcsv(file_path, cogamo.event_csv_layout, 
+				backend=backend, chunksize=args.chunksize)])
+			sec_chunks = time.perf_counter() - start
+			if reference is None:
+				reference = df
+			print("%-8s %8.3f sec %12.0f events/s   chunks: %8.3f sec %12.0f events/s   identical=%s" % (
+				backend, sec, len(df)/sec, sec_chunks, nevents/sec_chunks, df.equals(reference)))
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+import argparse
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+__author__ = 'Teruaki Enoto'
+__version__ = '0.01'
+# v0.01 : 2026-10-18 : original version
+
+def get_parser():
+	"""
+	Creates a new argument parser.
+	"""
+	parser = argparse.ArgumentParser('remotehk_server.py',
+		formatter_class=argparse.RawDescriptionHelpFormatter,
+		description="""
+Local stand-in of the remote house keeping server for the tests of cgm_wget_remotehk.py. The rows of the csv files between start_datetime and end_datetime are returned for the sname detector. Failures can be injected: an error status for every N-th request, and responses cut in the middle.
+		"""
+		)
+	parser.add_argument('input_csv', type=str, nargs='+',
+		help='remote csv-format house keeping files served (cgmDDD_rhk_*.csv).')
+	parser.add_argument('--port', type=int, default=8765, help='port.')
+	parser.add_argument('--error_every', type=int, default=0,
+		help='return the status 503 for every N-th request (0: never).')
+	parser.add_argument('--cut_every', type=int, default=0,
+		help='close the connection in the middle of every N-th response (0: never).')
+	return parser
+
+class RemotehkHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+	lock = threading.Lock()
+	nrequests = 0
+
+	def do_GET(self):
+		with self.lock:
+			RemotehkHandler.nrequests += 1
+			nrequests = RemotehkHandler.nrequests
+		query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+		if query.get('k', [''])[0] != self.server.passcode:
+			self.send_error(403)
+			return
+		if self.server.error_every > 0 and nrequests % self.server.error_every == 0:
+			self.send_error(503)
+			return
+		start = query['start_datetime'][0]
+		end = query['end_datetime'][0]
+		lines = [self.server.header_line]
+		for line in self.server.rows.get(query['sname'][0], []):
+			time = line.split(',')[0].strip('"')
+			if start <= time <= end:
+				lines.append(line)
+		body = ''.join(lines).encode()
+		self.send_response(200)
+		self.send_header('Content-Type', 'text/csv')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		if self.server.cut_every > 0 and nrequests % self.server.cut_every == 0 and len(lines) > 2:
+			self.wfile.write(body[:len(body)//2])
+			self.close_connection = True
+			return
+		self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+def main(args=None):
+	parser = get_parser()
+	args = parser.parse_args(args)
+
+	server = ThreadingHTTPServer(('127.0.0.1', args.port), RemotehkHandler)
+	server.passcode = 'test'
+	server.error_every = args.error_every
+	server.cut_every = args.cut_every
+	server.rows = {}
+	for input_csv in args.input_csv:
+		with open(input_csv) as f:
+			server.header_line = f.readline()
+			for line in f:
+				server.rows.setdefault(line.split(',')[1], []).append(line)
+	print("serving on http://127.0.0.1:%d/api/sensor/csv/" % args.port)
+	server.serve_forever()
+
+if __name__=="__main__":
+	main()
@@ -0,0 +1,21 @@
+#!/bin/sh -f
+
+rm -rf tmp_archive
+cogamo/cli/cgm_archive_hkfile.py tests/remote/data/cgm038_rhk_210525T000000_210530T120000.csv -o tmp_archive
+# the second run appends no rows
+cogamo/cli/cgm_archive_hkfile.py tests/remote/data/cgm038_rhk_210525T000000_210530T120000.csv -o tmp_archive
+cogamo/cli/cgm_plot_hkfile.py tmp_archive/038_hk_2021.fits
+
+# a file without rows appends nothing, and the per-file keywords are not copied
+mkdir -p tmp_archive_empty
+head -1 tests/remote/data/cgm038_rhk_210525T000000_210530T120000.csv \
+	> tmp_archive_empty/cgm038_rhk_210601T000000_210601T120000.csv
+cogamo/cli/cgm_archive_hkfile.py tmp_archive_empty/cgm038_rhk_210601T000000_210601T120000.csv -o tmp_archive
+cogamo/cli/cgm_archive_hkfile.py tests/data/011_20200305.csv -o tmp_archive
+python -c "
+from astropy.io import fits
+header = fits.getheader('tmp_archive/011_hk_2020.fits', 'HK')
+assert 'YYYYMMDD' not in header
+assert header['DET_ID'] == '011' and header['NAXIS2'] == 288
+"
+rm -rf tmp_archive_empty
@@ -0,0 +1,18 @@
+#!/bin/sh -f
+
+# downloads from a local stand-in server: every 5th request fails (503) 
+# and every 3rd response is cut in the middle (resumed after the last row)
+tests/remote/remotehk_server.py tests/remote/data/cgm038_rhk_210525T000000_210530T120000.csv \
+	--port 8765 --error_every 5 --cut_every 3 &
+SERVER_PID=$!
+sleep 1
+
+export COGAMO_SERVER_PASSCODE=test
+cogamo/cli/cgm_wget_remotehk.py 38 37 \
+	-s 2021-05-25T00:00:00 -e 2021-05-30T12:00:00 \
+	--server_url http://127.0.0.1:8765/api/sensor/csv/ --backoff 0.1 -o tmp_remotehk
+cogamo/cli/cgm_wget_remotehk.py 38 \
+	-s 2021-05-25T00:00:00 -e 2021-05-30T12:00:00 --fits \
+	--server_url http://127.0.0.1:8765/api/sensor/csv/ --backoff 0.1 -o tmp_remotehk
+
+kill $SERVER_PID
@@ -0,0 +1,12 @@
+#!/bin/sh -f
+
+rm -rf tmp_batch
+mkdir -p tmp_batch/011/data tmp_batch/011/log
+cp tests/data/config.csv tmp_batch/011/
+cp tests/data/011_20200305_13.csv tmp_batch/011/data/
+cp tests/data/011_20200305.csv tmp_batch/011/log/
+
+cogamo/cli/cgm_batch_convert.py tmp_batch/011 -o tmp_batch/out -n 2
+
+# the second run skips the up-to-date files
+cogamo/cli/cgm_batch_convert.py tmp_batch/011 -o tmp_batch/out -n 2
@@ -0,0 +1,3 @@
+#!/bin/sh -f
+
+cogamo/cli/cgm_bayesian_blocks.py 011_20200305_13.evt --pha_min 300
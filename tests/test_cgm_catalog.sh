@@ -0,0 +1,16 @@
+#!/bin/sh -f
+
+rm -rf tmp_catalog tmp_catalog.db
+mkdir -p tmp_catalog/011/data tmp_catalog/011/log
+cp tests/data/config.csv tmp_catalog/011/
+cp tests/data/011_20200305_13.csv tmp_catalog/011/data/
+cp tests/data/011_20200305.csv tmp_catalog/011/log/
+
+# the converted files are registered in the catalog
+cogamo/cli/cgm_batch_convert.py tmp_catalog/011 -o tmp_catalog/out -n 2 --catalog tmp_catalog.db
+cp tests/remote/data/cgm038_rhk_210525T000000_210530T120000.fits tmp_catalog/out/
+
+# the rescan reads only the new file
+cogamo/cli/cgm_catalog.py tmp_catalog.db --scan tmp_catalog/out
+cogamo/cli/cgm_catalog.py tmp_catalog.db --det_id 11 --kind events \
+	--date_min 20200301 --date_max 20200331 --nevents_min 1000
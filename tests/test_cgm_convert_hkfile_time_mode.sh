@@ -0,0 +1,32 @@
+#!/bin/sh -f
+
+rm -f 011_20200305_hk_numeric.fits 011_20200305_hk_string.fits
+
+cogamo/cli/cgm_convert_hkfile_to_fitsfile.py tests/data/011_20200305.csv -c tests/data/config.csv \
+	-o 011_20200305_hk_numeric.fits --time_mode numeric
+
+cogamo/cli/cgm_convert_hkfile_to_fitsfile.py tests/data/011_20200305.csv -c tests/data/config.csv \
+	-o 011_20200305_hk_string.fits --time_mode string
+
+python -c "
+import sys
+import numpy as np
+from astropy.io import fits
+import cogamo.cogamo as cogamo
+numeric = fits.getdata('011_20200305_hk_numeric.fits','HK')
+string = fits.getdata('011_20200305_hk_string.fits','HK')
+diff = np.max(np.abs(numeric['Unixtime'] - string['Unixtime']))
+print('Unixtime: max difference %.3e sec' % diff)
+if diff > 0:
+	sys.exit(1)
+
+remote = cogamo.HousekeepingRemoteFile('tests/remote/data/cgm038_rhk_210525T000000_210530T120000.csv')
+unixtime = {}
+for time_mode in ['numeric','string']:
+	remote.set_time_series(time_mode=time_mode)
+	unixtime[time_mode] = remote.unixtime
+diff = np.max(np.abs(unixtime['numeric'] - unixtime['string']))
+print('remote Unixtime: max difference %.3e sec' % diff)
+if diff > 0:
+	sys.exit(1)
+"
@@ -0,0 +1,24 @@
+#!/bin/sh -f
+
+rm -f 011_20200305_13_all.evt 011_20200305_13_chunk.evt
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv -c tests/data/config.csv \
+	-o 011_20200305_13_all.evt
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv -c tests/data/config.csv \
+	-o 011_20200305_13_chunk.evt --chunksize 100000
+
+python -c "
+import sys
+import numpy as np
+from astropy.io import fits
+all = fits.getdata('011_20200305_13_all.evt','EVENTS')
+chunk = fits.getdata('011_20200305_13_chunk.evt','EVENTS')
+print('nevents: %d (all) %d (chunk)' % (len(all),len(chunk)))
+if len(all) != len(chunk):
+	sys.exit(1)
+for colname in all.columns.names:
+	if not np.array_equal(all[colname],chunk[colname]):
+		print('%s differs' % colname)
+		sys.exit(1)
+"
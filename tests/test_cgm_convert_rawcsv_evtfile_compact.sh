@@ -0,0 +1,48 @@
+#!/bin/sh -f
+
+rm -f 011_20200305_13_standard.evt 011_20200305_13_compact.evt 011_20200305_13_compact_gz.evt.gz
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py \
+	tests/data/011_20200305_13.csv \
+	-c tests/data/config.csv \
+	-o 011_20200305_13_standard.evt
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py \
+	tests/data/011_20200305_13.csv \
+	-c tests/data/config.csv \
+	-o 011_20200305_13_compact.evt \
+	--profile compact
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py \
+	tests/data/011_20200305_13.csv \
+	-c tests/data/config.csv \
+	-o 011_20200305_13_compact_gz.evt \
+	--profile compact --compress
+
+# the compact profile keeps the TIME and pha of the standard profile
+python -c "
+import sys
+import numpy as np
+from astropy.io import fits
+standard = fits.getdata('011_20200305_13_standard.evt','EVENTS')
+for evtfile in ['011_20200305_13_compact.evt','011_20200305_13_compact_gz.evt.gz']:
+	compact = fits.getdata(evtfile,'EVENTS')
+	same_time = np.array_equal(compact['TIME'], standard['TIME'])
+	same_pha = np.array_equal(compact['pha'], standard['pha'])
+	print('%s: TIME identical=%s, pha identical=%s' % (evtfile,same_time,same_pha))
+	if not (same_time and same_pha):
+		sys.exit(1)
+"
+
+# the .evt.gz file is read without memmap
+python -c "
+import numpy as np
+import cogamo.cogamo as cogamo
+evt = cogamo.EventFitsFile('011_20200305_13_compact_gz.evt.gz')
+standard = cogamo.EventFitsFile('011_20200305_13_standard.evt')
+assert not evt.memmap and standard.memmap
+assert np.array_equal(evt.time, standard.time)
+tstart = standard.time[1000]
+tstop = standard.time[2000]
+assert np.array_equal(evt.read_time_range(tstart,tstop)['TIME'], standard.read_time_range(tstart,tstop)['TIME'])
+"
@@ -0,0 +1,22 @@
+#!/bin/sh -f
+
+rm -f 011_20200305_13_time.evt 011_20200305_13_time_chunk.evt
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv -c tests/data/config.csv \
+	-o 011_20200305_13_time.evt
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv -c tests/data/config.csv \
+	-o 011_20200305_13_time_chunk.evt --chunksize 50000
+
+# TIME is the unixtime including the sub-second (decisec) part, sorted in time
+python -c "
+import sys
+import numpy as np
+from astropy.io import fits
+for evtfile in ['011_20200305_13_time.evt','011_20200305_13_time_chunk.evt']:
+	data = fits.getdata(evtfile,'EVENTS')
+	diff = np.max(np.abs(data['TIME'] - data['unixtime']))
+	print('%s: max |TIME - unixtime| %.3e sec, sorted=%s' % (evtfile,diff,np.all(np.diff(data['TIME']) >= 0)))
+	if diff > 0 or np.any(np.diff(data['TIME']) < 0):
+		sys.exit(1)
+"
@@ -0,0 +1,22 @@
+#!/bin/sh -f
+
+rm -f 011_20200305_13_numeric.evt 011_20200305_13_string.evt
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv -c tests/data/config.csv \
+	-o 011_20200305_13_numeric.evt --time_mode numeric
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv -c tests/data/config.csv \
+	-o 011_20200305_13_string.evt --time_mode string
+
+python -c "
+import sys
+import numpy as np
+from astropy.io import fits
+numeric = fits.getdata('011_20200305_13_numeric.evt','EVENTS')
+string = fits.getdata('011_20200305_13_string.evt','EVENTS')
+for colname in ['TIME','unixtime']:
+	diff = np.max(np.abs(numeric[colname] - string[colname]))
+	print('%s: max difference %.3e sec' % (colname,diff))
+	if diff > 1e-6:
+		sys.exit(1)
+"
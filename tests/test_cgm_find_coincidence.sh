@@ -0,0 +1,10 @@
+#!/bin/sh -f
+
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv \
+	-c tests/data/config.csv -o 011_20200305_13.evt
+cogamo/cli/cgm_find_burst.py 011_20200305_13.evt --pha_min 300 --threshold 5 -o 011_20200305_13_burst.fits
+
+# a single detector: all the bursts are listed with --min_detectors 1
+cogamo/cli/cgm_find_coincidence.py 011_20200305_13_burst.fits \
+	--hk tests/remote/data/cgm038_rhk_210525T000000_210530T120000.fits \
+	--min_detectors 1 --window 1.0 -o tmp_coincidences.fits
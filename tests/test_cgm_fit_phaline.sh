@@ -3,4 +3,17 @@
 export DATADIR="/Users/enoto/work/dropbox/01_enoto/research/growth/logbook/200926_CoGaMo_137Cs/"
 
 cogamo/cli/cgm_fit_phaline.py $DATADIR/030_20200917_30_Cs137_ut1600317300to1600320600.evt \
-	--xmin 35 --xmax 65
\ No newline at end of file
+	--xmin 35 --xmax 65
+
+cogamo/cli/cgm_fit_phaline.py $DATADIR/030_20200917_30_Cs137_ut1600317300to1600320600.evt \
+	--lines 35:65,100:140 --minos --output fit_phaline.fits
+
+# plot with xmax beyond the last channel (1023): the fit and the plot use the clipped range
+rm -f tmp_fit_phaline.evt tmp_fit_phaline_fit_pha_1000_1100.pdf
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv \
+	-c tests/data/config.csv -o tmp_fit_phaline.evt
+cogamo/cli/cgm_fit_phaline.py tmp_fit_phaline.evt --xmin 1000 --xmax 1100 --plot
+python -c "
+import os
+assert os.path.exists('tmp_fit_phaline_fit_pha_1000_1100.pdf')
+"
@@ -0,0 +1,29 @@
+#!/bin/sh -f
+
+rm -rf tmp_trend
+mkdir -p tmp_trend
+cogamo/cli/cgm_convert_hkfile_to_fitsfile.py tests/data/011_20200305.csv -c tests/data/config.csv \
+	-o tmp_trend/011_20200305_hk.fits
+
+cogamo/cli/cgm_hk_trend.py tmp_trend/011_20200305_hk.fits \
+	tests/remote/data/cgm038_rhk_210525T000000_210530T120000.fits -o tmp_trend --plot daily
+# the second run recomputes only the last bins
+cogamo/cli/cgm_hk_trend.py tests/remote/data/cgm038_rhk_210525T000000_210530T120000.fits -o tmp_trend
+
+# incremental updates by days give the same rollups as a rebuild
+python -c "
+import sys
+import numpy as np
+import cogamo.cogamo as cogamo
+records = np.asarray(cogamo.read_raw_time_range('tests/remote/data/cgm038_rhk_210525T000000_210530T120000.fits','HK','Unixtime'))
+rebuilt = cogamo.HousekeepingTrend('tmp_trend/038_hk_trend.fits')
+trend = cogamo.HousekeepingTrend('tmp_trend/038_hk_trend_incremental.fits')
+for tstop in np.arange(records['Unixtime'][0], records['Unixtime'][-1] + 86400.0, 86400.0):
+	tstart = trend.get_update_start()
+	selected = (records['Unixtime'] <= tstop) & (records['Unixtime'] >= (tstart if tstart != None else -np.inf))
+	trend.update(records[selected])
+for extname, binsize in cogamo.HousekeepingTrend.levels:
+	print('%s: %d bins, identical=%s' % (extname, len(trend.tables[extname]), np.array_equal(trend.tables[extname], rebuilt.tables[extname])))
+	if not np.array_equal(trend.tables[extname], rebuilt.tables[extname]):
+		sys.exit(1)
+"
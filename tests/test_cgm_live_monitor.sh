@@ -0,0 +1,15 @@
+#!/bin/sh -f
+
+# the hour file grows while the monitor is running, and the next hour starts
+rm -rf tmp_live
+mkdir -p tmp_live
+head -n 100000 tests/data/011_20200305_13.csv > tmp_live/011_20200305_13.csv
+
+cogamo/cli/cgm_live_monitor.py tmp_live 011 --pha_min 300 --poll_interval 1 --max_polls 5 \
+	--alert_file tmp_live_alerts.csv -o tmp_live_burst.fits &
+MONITOR_PID=$!
+sleep 2
+tail -n +100001 tests/data/011_20200305_13.csv >> tmp_live/011_20200305_13.csv
+sleep 1
+head -n 1000 tests/data/011_20200305_13.csv > tmp_live/011_20200305_14.csv
+wait $MONITOR_PID
@@ -0,0 +1,8 @@
+#!/bin/sh -f
+
+rm -f 011_20200305_13_lc.fits
+
+cogamo/cli/cgm_make_curve_pyramid.py 011_20200305_13.evt --kev_per_channel 10.0
+
+# the 1-s light curve is read from 011_20200305_13_lc.fits
+cogamo/cli/cgm_plot_curve.py 011_20200305_13.evt 
@@ -0,0 +1,4 @@
+#!/bin/sh -f
+
+cogamo/cli/cgm_merge_evtfiles.py 011_20200305_13.evt 011_20200305_14.evt 011_20200305_15.evt
+cogamo/cli/cgm_find_burst.py 011_20200305_13_20200305_15.evt --pha_min 300
@@ -0,0 +1,10 @@
+#!/bin/sh -f
+
+cogamo/cli/cgm_export_parquet.py tests/data/011_20200305_13.csv tests/data/011_20200305.csv \
+	-c tests/data/config.csv -o tmp_parquet
+cogamo/cli/cgm_export_parquet.py tests/remote/data/cgm038_rhk_210525T000000_210530T120000.csv -o tmp_parquet
+
+cogamo/cli/cgm_query_parquet.py tmp_parquet --det_id 11 --pha_min 300 \
+	--tstart 1583380800 --tstop 1583381400
+cogamo/cli/cgm_query_parquet.py tmp_parquet --kind hk --det_id 38 \
+	--tstart 1621954800 --tstop 1622041200
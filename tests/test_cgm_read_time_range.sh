@@ -0,0 +1,18 @@
+#!/bin/sh -f
+
+rm -rf tmp_time_range
+mkdir -p tmp_time_range/011
+cogamo/cli/cgm_convert_rawcsv_evtfile_to_fitsfile.py tests/data/011_20200305_13.csv \
+	-c tests/data/config.csv -o tmp_time_range/011/011_20200305_13.evt
+cp tests/remote/data/cgm038_rhk_210525T000000_210530T120000.fits tmp_time_range/
+
+cogamo/cli/cgm_read_time_range.py tmp_time_range --time 1583383000 --window 300 -o tmp_time_range.fits
+cogamo/cli/cgm_read_time_range.py tmp_time_range --kind hk --det_id 38 \
+	--tstart 1621954800 --tstop 1622041200
+
+# without a time range: all the rows of the detector
+cogamo/cli/cgm_read_time_range.py tmp_time_range --det_id 11 -o tmp_time_range_all.fits
+python -c "
+from astropy.io import fits
+assert fits.getval('tmp_time_range_all.fits','NAXIS2','EVENTS_011') == fits.getval('tmp_time_range/011/011_20200305_13.evt','NAXIS2','EVENTS')
+"
@@ -0,0 +1,4 @@
+#!/bin/sh -f
+
+cogamo/cli/cgm_stack_spectra.py 011_20200305_13.evt 011_20200305_14.evt -o 011_20200305_spec.fits
+cogamo/cli/cgm_stack_spectra.py 011_20200305_13.evt --tstart 1583380800 --tstop 1583381400 -o 011_20200305_13_spec.fits
@@ -0,0 +1,4 @@
+#!/bin/sh -f
+
+cogamo/cli/cgm_track_gain.py 011_20200305_*.evt --hkfits 011_20200305_hk.fits \
+	--xmin 35 --xmax 65 --tbin 600 --write_pi -o 011_20200305_gain.fits